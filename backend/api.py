@@ -1,23 +1,127 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any, Set, Tuple
+from collections import OrderedDict
 from pathlib import Path
 import json
+import logging
+import os
+import threading
+import time
 
 from .models import Person, Family, IdAllocator
 from .storage import write_gwb
 from .name_utils import crush_name
-from .gw_parser import parse_gw_text
-from .ged_parser import parse_ged_text
-from fastapi.responses import RedirectResponse
+from .gw_parser import parse_gw_file, parse_gw_text
+from .ged_parser import parse_ged_file, parse_ged_text
+from .catalog import BaseCatalog
+from .graph import PersonGraph
+from .relationship import find_relationship
+from .consang import read_consang, write_consang
+from .connex import DEFAULT_MAX_LISTED, summarize_components
+from .cousins import CousinFinder
+from .sosa import build_sosa, read_sosa, rebase_sosa, write_sosa, SOSA_FILENAME
+from .ged_writer import gzip_chunks, iter_chunks, iter_ged_lines
+from .storage import read_gwf, gwf_int, decode_family, decode_person, iter_gw_lines
+from .metadata import META_FILENAME, bump_generation, data_generation, read_meta, write_meta, rename_meta
+from .surname_tree import build_surname_forest, read_surname_tree, write_surname_tree
+from .search_index import SearchIndex, read_search_index, write_search_index
+from . import instrumentation
+from .jsonio import dumps, loads, read_json, write_json
+from .instrumentation import count, phase
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 import shutil
 from pydantic import BaseModel as PydanticBaseModel
 
 
+logger = logging.getLogger(__name__)
+
 BASES_DIR = Path(__file__).resolve().parent / "bases"
 BASES_DIR.mkdir(exist_ok=True)
 
-app = FastAPI(title="GeneWeb-like Python Backend", version="0.1")
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by jsonio (orjson when available), timed as the
+    `serialize` phase. Endpoints returning large node lists build it
+    themselves, which also skips FastAPI's jsonable_encoder pass."""
+
+    def render(self, content: Any) -> bytes:
+        with phase("serialize"):
+            return dumps(content)
+
+
+app = FastAPI(title="GeneWeb-like Python Backend", version="0.1", default_response_class=FastJSONResponse)
+
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Temps par phase de la requête (en-tête Server-Timing) et agrégats pour /metrics."""
+    if not instrumentation.enabled:
+        return await call_next(request)
+    timings = instrumentation.start_request()
+    started = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    response.headers["Server-Timing"] = instrumentation.server_timing_header(timings, elapsed)
+    route = request.scope.get("route")
+    instrumentation.metrics.observe_request(
+        request.method, route.path if route is not None else "unmatched", response.status_code, elapsed,
+    )
+    return response
+
+# Catalogue des bases servi par /dbs, invalidé à chaque import/renommage/suppression
+catalog = BaseCatalog()
+
+
+def _finalize_import(
+    db_dir: Path,
+    db_name: str,
+    persons: List[Person],
+    families: List[Family],
+    started: float,
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> Dict:
+    """Write the base manifest once every file of the import is on disk, and
+    the surname lineage forest and place/date index next to it, then queue
+    the consanguinity computation to run after the response is sent.
+    """
+    meta = write_meta(db_dir, db_name, persons, families, time.perf_counter() - started)
+    with phase("surname_tree"):
+        forest = build_surname_forest((p.__dict__ for p in persons), [f.__dict__ for f in families])
+        write_surname_tree(db_dir, forest, meta["generation"])
+    with phase("search_index"):
+        write_search_index(db_dir, SearchIndex.build(p.__dict__ for p in persons), meta["generation"])
+    catalog.invalidate()
+    if background_tasks is not None:
+        background_tasks.add_task(
+            _compute_consang,
+            db_dir,
+            [p.__dict__ for p in persons],
+            [f.__dict__ for f in families],
+            meta["generation"],
+        )
+        if (db_dir / SOSA_FILENAME).exists():
+            background_tasks.add_task(_refresh_sosa, db_dir, [p.__dict__ for p in persons], meta["generation"])
+    return meta
+
+
+def _compute_consang(db_dir: Path, persons: List[Dict], families: List[Dict], generation: int) -> None:
+    try:
+        write_consang(db_dir, PersonGraph(persons, families), generation)
+    except Exception:
+        # Tâche de fond : l'import a déjà réussi, on se contente de tracer l'échec
+        logger.exception("Consanguinity computation failed for %s", db_dir)
+
+
+def _refresh_sosa(db_dir: Path, persons: List[Dict], generation: int) -> None:
+    """Renumber the Sosa map of a re-imported base from its reference person,
+    or drop it if that person no longer exists."""
+    sidecar = read_sosa(db_dir)
+    graph = PersonGraph(persons)
+    if sidecar is None or sidecar["reference"] not in graph.index_of:
+        (db_dir / SOSA_FILENAME).unlink(missing_ok=True)
+        return
+    write_sosa(db_dir, sidecar["reference"], generation, build_sosa(graph, sidecar["reference"]))
+
 
 # ... (Les classes d'Input et les endpoints /import restent identiques) ...
 class PersonInput(BaseModel):
@@ -50,7 +154,8 @@ class ImportRequest(BaseModel):
 
 
 @app.post("/import")
-def import_database(req: ImportRequest):
+def import_database(req: ImportRequest, background_tasks: BackgroundTasks):
+    started = time.perf_counter()
     pid_alloc = IdAllocator()
     fid_alloc = IdAllocator()
 
@@ -82,11 +187,13 @@ def import_database(req: ImportRequest):
             marriage_place=f.marriage_place,
         ))
 
-    db_dir = write_gwb(BASES_DIR, req.db_name, persons, families, req.notes_origin_file)
     from .storage import write_gwb_classic, write_gw, write_gwf
-    write_gwb_classic(BASES_DIR, req.db_name, persons, families)
-    gw_path = write_gw(BASES_DIR, req.db_name, persons, families)
-    gwf_path = write_gwf(BASES_DIR, req.db_name)
+    with phase("write"):
+        db_dir = write_gwb(BASES_DIR, req.db_name, persons, families, req.notes_origin_file)
+        write_gwb_classic(BASES_DIR, req.db_name, persons, families)
+        gw_path = write_gw(BASES_DIR, req.db_name, persons, families)
+        gwf_path = write_gwf(BASES_DIR, req.db_name)
+    _finalize_import(db_dir, req.db_name, persons, families, started, background_tasks)
     return {"ok": True, "db_dir": str(db_dir), "gw_path": str(gw_path), "gwf_path": str(gwf_path)}
 
 
@@ -124,7 +231,20 @@ def parse_gw(req: GwParseRequest):
 
 
 @app.get("/db/{db_name}/stats")
-def stats(db_name: str):
+def stats(db_name: str, extended: bool = False):
+    # Chemin rapide : manifeste meta.json écrit à l'import, sans lire base.json
+    meta = catalog.meta(BASES_DIR, db_name)
+    if meta is not None:
+        result = dict(meta.get("counts", {}))
+        if extended:
+            result["extended"] = {
+                **meta.get("stats", {}),
+                "sizes": meta.get("sizes"),
+                "import_seconds": meta.get("import_seconds"),
+                "generation": meta.get("generation"),
+            }
+        return result
+
     db_dir = BASES_DIR / "json_bases" / db_name
     base_path = db_dir / "base.json"
     if not base_path.exists():
@@ -134,7 +254,7 @@ def stats(db_name: str):
             raise HTTPException(status_code=404, detail="Base not found")
 
     try:
-        base = json.loads(base_path.read_text(encoding="utf-8"))
+        base = loads(base_path.read_bytes())
         # Le fichier 'base' de galichet ne contient que les comptes
         if "persons_count" in base:
             return {"persons": base.get("persons_count"), "families": base.get("families_count")}
@@ -144,15 +264,20 @@ def stats(db_name: str):
 
 
 @app.post("/import_gw")
-def import_gw(req: GwImportGWRequest):
-    parsed = parse_gw_text(req.gw_text)
+def import_gw(req: GwImportGWRequest, background_tasks: BackgroundTasks):
+    started = time.perf_counter()
+    with phase("parse"):
+        parsed = parse_gw_text(req.gw_text)
     persons: List[Person] = parsed["persons"]
     families: List[Family] = parsed["families"]
+    count("records_parsed", len(persons) + len(families))
     from .storage import write_gwb_classic, write_gw, write_gwf, write_json_base
-    db_dir = write_gwb_classic(BASES_DIR, req.db_name, persons, families)
-    json_dir = write_json_base(BASES_DIR, req.db_name, persons, families, req.notes_origin_file)
-    gw_path = write_gw(BASES_DIR, req.db_name, persons, families)
-    gwf_path = write_gwf(BASES_DIR, req.db_name)
+    with phase("write"):
+        db_dir = write_gwb_classic(BASES_DIR, req.db_name, persons, families)
+        json_dir = write_json_base(BASES_DIR, req.db_name, persons, families, req.notes_origin_file)
+        gw_path = write_gw(BASES_DIR, req.db_name, persons, families)
+        gwf_path = write_gwf(BASES_DIR, req.db_name)
+    _finalize_import(json_dir, req.db_name, persons, families, started, background_tasks)
     return {
         "ok": True,
         "db_dir": str(db_dir),
@@ -170,15 +295,20 @@ def import_gw(req: GwImportGWRequest):
 
 
 @app.post("/import_ged")
-def import_ged(req: GwImportGEDRequest):
-    parsed = parse_ged_text(req.ged_text)
+def import_ged(req: GwImportGEDRequest, background_tasks: BackgroundTasks):
+    started = time.perf_counter()
+    with phase("parse"):
+        parsed = parse_ged_text(req.ged_text)
     persons: List[Person] = parsed["persons"]
     families: List[Family] = parsed["families"]
+    count("records_parsed", len(persons) + len(families))
     from .storage import write_gwb_classic, write_gw, write_gwf, write_json_base
-    db_dir = write_gwb_classic(BASES_DIR, req.db_name, persons, families)
-    json_dir = write_json_base(BASES_DIR, req.db_name, persons, families, req.notes_origin_file)
-    gw_path = write_gw(BASES_DIR, req.db_name, persons, families)
-    gwf_path = write_gwf(BASES_DIR, req.db_name)
+    with phase("write"):
+        db_dir = write_gwb_classic(BASES_DIR, req.db_name, persons, families)
+        json_dir = write_json_base(BASES_DIR, req.db_name, persons, families, req.notes_origin_file)
+        gw_path = write_gw(BASES_DIR, req.db_name, persons, families)
+        gwf_path = write_gwf(BASES_DIR, req.db_name)
+    _finalize_import(json_dir, req.db_name, persons, families, started, background_tasks)
     return {
         "ok": True,
         "db_dir": str(db_dir),
@@ -200,33 +330,44 @@ def root():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/health")
+def health():
+    # Sonde légère utilisée par les fronts pour la bascule entre backends
+    return {"ok": True}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Compteurs au format texte Prometheus (vides tant que GW_INSTRUMENTATION n'est pas activé)."""
+    return instrumentation.metrics.render_prometheus()
+
+
+# Durée maximale d'un échantillonnage /debug/profile
+MAX_PROFILE_SECONDS = 30.0
+
+
+@app.get("/debug/profile")
+def debug_profile(seconds: float = 5.0, interval_ms: float = 5.0, limit: int = 40):
+    """Profil statistique des threads du serveur pendant `seconds` (GW_PROFILING=1 requis)."""
+    if not instrumentation.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or interval_ms <= 0:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS:g}] and interval_ms > 0")
+    profile = instrumentation.sample_stacks(seconds, interval_ms / 1000, max(1, limit))
+    return {"ok": True, **profile}
+
+
 @app.get("/dbs")
 def list_dbs():
-    json_bases_dir = BASES_DIR / "json_bases"
-    dbs = []
+    # json_bases + dossiers .gwb classiques, servis depuis le catalogue en mémoire
+    return catalog.names(BASES_DIR)
 
-    if json_bases_dir.exists():
-        for p in sorted(json_bases_dir.iterdir()):
-            if not p.is_dir():
-                continue
-            base_file = p / "base.json"
-            if base_file.exists():
-                try:
-                    base = json.loads(base_file.read_text(encoding="utf-8"))
-                    dbs.append(base.get("name", p.name))
-                except Exception:
-                    dbs.append(p.name)
-            else:
-                dbs.append(p.name)
 
-    # Vérifie aussi les dossiers .gwb classiques qui n'ont pas de json_base
-    for p in sorted(BASES_DIR.iterdir()):
-        if p.is_dir() and p.suffix == ".gwb":
-            db_name = p.stem
-            if db_name not in dbs:
-                dbs.append(db_name)
+@app.get("/dbs/generations")
+def list_generations():
+    # Génération courante de chaque base : clé d'invalidation des caches des fronts
+    return catalog.generations(BASES_DIR)
 
-    return sorted(list(set(dbs))) # Retourne une liste unique triée
 
 @app.delete("/db/{db_name}")
 def delete_db(db_name: str):
@@ -247,6 +388,8 @@ def delete_db(db_name: str):
             deleted.append(str(p))
         except Exception as e:
             failed.append({"path": str(p), "error": str(e)})
+    catalog.invalidate()
+    forget_search_context(db_name)
 
     if failed:
         return {"ok": False, "deleted": deleted, "failed": failed}
@@ -283,19 +426,22 @@ def rename_db(old_name: str, req: RenameRequest):
         try:
             src.rename(target)
             renamed.append({"from": str(src), "to": str(target)})
+            rename_meta(target, new_name)
 
             # Met à jour le base.json si c'est le dossier json_bases
             if src.name == old_name: # C'est json_dir
                 base_json = target / "base.json"
                 if base_json.exists():
                     try:
-                        base = json.loads(base_json.read_text(encoding="utf-8"))
+                        base = read_json(base_json)
                         base["name"] = new_name
-                        base_json.write_text(json.dumps(base, ensure_ascii=False, indent=2), encoding="utf-8")
+                        write_json(base_json, base, indent=True)
                     except Exception:
                         failed.append({"path": str(base_json), "error": "failed to update base.json name"})
         except Exception as e:
             failed.append({"path": str(src), "error": str(e)})
+    catalog.invalidate()
+    forget_search_context(old_name)
 
     if failed:
         return {"ok": False, "renamed": renamed, "failed": failed}
@@ -319,27 +465,87 @@ def load_db_file(db_name: str, filename: str, is_json: bool = True):
 
              raise HTTPException(status_code=404, detail=f"{filename} not found for database {db_name}")
     try:
-        content = file_path.read_text(encoding="utf-8")
         if is_json:
-            return json.loads(content)
+            with phase("file_read"):
+                content = file_path.read_bytes()
+            with phase("json_decode"):
+                return loads(content)
         else:
+            content = file_path.read_text(encoding="utf-8")
             return [line for line in content.splitlines() if line.strip() and not line.startswith("#")]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse {filename}: {str(e)}")
 
 # --- LOGIQUE DE RECHERCHE ET DE PERSONNE ---
 
-class PersonNode(BaseModel):
-    id: int
-    surname: str
-    first_names: List[str]
-    birth_date: str = ""
-    death_date: str = ""
-    sex: Optional[str] = None
-    spouse: Optional['PersonNode'] = None
-    children: List['PersonNode'] = []
-
-PersonNode.model_rebuild()
+class PersonView:
+    """Person as returned by the API, as a lazy view over a record of a
+    loaded base: names, dates and the Sosa number are resolved through the
+    string table only when read, so code that only needs ids or counts never
+    pays for them. Encoded at the response boundary by jsonio (to_json),
+    without validation or an intermediate model.
+    """
+    __slots__ = ("_ctx", "_record", "spouse", "children", "truncated")
+
+    def __init__(self, ctx: "SearchContext", record: Dict):
+        self._ctx = ctx
+        self._record = record
+        self.spouse = None
+        self.children = ()
+        self.truncated = False
+
+    def _text(self, field_name: str, default: str) -> str:
+        if self._ctx.is_gedcom_format:
+            sid = self._record.get(f"{field_name}_id")
+            return self._ctx.string_table.get(sid, default) if sid is not None else ""
+        return self._record.get(field_name, default) or ""
+
+    @property
+    def id(self) -> int:
+        return self._record["id"]
+
+    @property
+    def surname(self) -> str:
+        if self._ctx.is_gedcom_format:
+            return self._ctx.string_table.get(self._record.get("surname_id"), "?")
+        return self._record.get("surname", "?")
+
+    @property
+    def first_names(self) -> List[str]:
+        if self._ctx.is_gedcom_format:
+            return [self._ctx.string_table.get(sid, "?") for sid in self._record.get("first_name_ids", [])]
+        return self._record.get("first_names", ["?"])
+
+    @property
+    def birth_date(self) -> str:
+        return self._text("birth_date", "")
+
+    @property
+    def death_date(self) -> str:
+        return self._text("death_date", "")
+
+    @property
+    def sex(self) -> Optional[str]:
+        return self._record.get("sex")
+
+    @property
+    def sosa(self) -> Optional[str]:
+        sosa = self._ctx.sosa_numbers.get(self.id)
+        return str(sosa) if sosa is not None else None
+
+    def to_json(self) -> Dict:
+        return {
+            "id": self.id,
+            "surname": self.surname,
+            "first_names": self.first_names,
+            "birth_date": self.birth_date,
+            "death_date": self.death_date,
+            "sex": self.sex,
+            "sosa": self.sosa,
+            "spouse": self.spouse,
+            "children": list(self.children),
+            "truncated": self.truncated,
+        }
 
 
 class SearchContext:
@@ -353,6 +559,13 @@ class SearchContext:
         self.snames_list: List[str] = []
         self.fnames_list: List[str] = []
         self.is_gedcom_format: bool = False
+        self._ids_by_name_key: Optional[Dict[Tuple[str, str], int]] = None
+        self._graph: Optional[PersonGraph] = None
+        self._cousin_finder: Optional[CousinFinder] = None
+        self._sosa: Optional[Dict[int, int]] = None
+        self._surname_forest: Optional[Dict] = None
+        self._search_index: Optional[SearchIndex] = None
+        self.sosa_reference: Optional[int] = None
         self._load_data()
 
     def _load_data(self):
@@ -379,15 +592,13 @@ class SearchContext:
             try:
                 self.snames_list = load_db_file(self.db_name, "snames.dat", is_json=False)
                 self.fnames_list = load_db_file(self.db_name, "fnames.dat", is_json=False)
-                gw_text = (BASES_DIR / f"{self.db_name}.gw").read_text(encoding="utf-8")
-                parsed = parse_gw_text(gw_text)
+                parsed = parse_gw_file(BASES_DIR / f"{self.db_name}.gw")
                 self.persons_list = [p.__dict__ for p in parsed["persons"]]
                 self.families_list = [f.__dict__ for f in parsed["families"]]
             except Exception as e:
                  try:
                     # Cas où seul le .ged existe (HarryPotter après suppression)
-                    ged_text = (BASES_DIR / f"{self.db_name}.ged").read_text(encoding="utf-8")
-                    parsed = parse_ged_text(ged_text) # Utilise le parser CORRIGÉ (V2)
+                    parsed = parse_ged_file(BASES_DIR / f"{self.db_name}.ged") # Utilise le parser CORRIGÉ (V2)
                     self.persons_list = [p.__dict__ for p in parsed["persons"]]
                     self.families_list = [f.__dict__ for f in parsed["families"]]
                     self.is_gedcom_format = False # Traiter comme GW pour les noms
@@ -405,6 +616,69 @@ class SearchContext:
             if f.get("wife_id") is not None:
                 self.families_by_person_id.setdefault(f["wife_id"], []).append(f)
 
+    @property
+    def graph(self) -> PersonGraph:
+        """Compact parent/family arrays, built on first use and kept with the context."""
+        if self._graph is None:
+            self._graph = PersonGraph(self.persons_list, self.families_list)
+        return self._graph
+
+    @property
+    def sosa_numbers(self) -> Dict[int, int]:
+        """Sosa map of the base's reference person, read once from sosa.json;
+        empty while the map predates the base (renumbering after an import)."""
+        if self._sosa is None:
+            self._sosa = {}
+            sidecar = self._current_sidecar(read_sosa)
+            if sidecar is not None:
+                self.sosa_reference = sidecar["reference"]
+                self._sosa = sidecar["numbers"]
+        return self._sosa
+
+    def _current_sidecar(self, read: Callable[[Path], Optional[Dict]]) -> Optional[Dict]:
+        """Sidecar written at import next to base.json, if it matches the base generation."""
+        signature = _base_signature(self.db_name)
+        if signature is None:
+            return None
+        db_dir = Path(signature[0]).parent
+        sidecar = read(db_dir)
+        meta = read_meta(db_dir) or {}
+        if sidecar is None or sidecar["generation"] != data_generation(meta):
+            return None
+        return sidecar
+
+    @property
+    def surname_forest(self) -> Dict:
+        """Surname lineage forest precomputed at import (surname_tree.json), or
+        built here for bases without an up-to-date sidecar."""
+        if self._surname_forest is None:
+            forest = self._current_sidecar(read_surname_tree)
+            if forest is None:
+                strings = self.snames_list if self.is_gedcom_format else None
+                forest = build_surname_forest(self.persons_list, self.families_list, strings)
+            self._surname_forest = forest
+        return self._surname_forest
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Place and birth-date index precomputed at import (search_index.json),
+        or built here for bases without an up-to-date sidecar."""
+        if self._search_index is None:
+            sidecar = self._current_sidecar(read_search_index)
+            if sidecar is not None:
+                self._search_index = sidecar["index"]
+            else:
+                strings = self.snames_list if self.is_gedcom_format else None
+                self._search_index = SearchIndex.build(self.persons_list, strings)
+        return self._search_index
+
+    @property
+    def cousin_finder(self) -> CousinFinder:
+        """Cousin queries sharing one ancestor-set cache for the life of the context."""
+        if self._cousin_finder is None:
+            self._cousin_finder = CousinFinder(self.graph)
+        return self._cousin_finder
+
     def _get_surname(self, person_dict: Dict) -> str:
         if not person_dict:
             return ""
@@ -413,66 +687,36 @@ class SearchContext:
             return self.string_table.get(surname_id, "")
         return person_dict.get("surname", "")
 
-    def _build_person_node(self, person_id: int) -> PersonNode:
+    def _person_view(self, person_id: int) -> Optional["PersonView"]:
         person = self.persons_by_id.get(person_id)
         if not person:
             return None
-
-        if self.is_gedcom_format:
-            surname_id = person.get("surname_id")
-            firstname_ids = person.get("first_name_ids", [])
-            surname = self.string_table.get(surname_id, "?")
-            first_names = [self.string_table.get(fn_id, "?") for fn_id in firstname_ids]
-            birth_date_id = person.get("birth_date_id")
-            death_date_id = person.get("death_date_id")
-            birth_date = self.string_table.get(birth_date_id, "") if birth_date_id is not None else ""
-            death_date = self.string_table.get(death_date_id, "") if death_date_id is not None else ""
-        else:
-            surname = person.get("surname", "?")
-            first_names = person.get("first_names", ["?"])
-            birth_date = person.get("birth_date", "") or ""
-            death_date = person.get("death_date", "") or ""
-
-        return PersonNode(
-            id=person_id,
-            surname=surname,
-            first_names=first_names,
-            sex=person.get("sex"),
-            birth_date=birth_date,
-            death_date=death_date,
-        )
-
-    def _build_branch(self, person_id: int, crushed_surname: str, processed_ids: set) -> Optional[PersonNode]:
-        if person_id in processed_ids:
-            return None 
-        person_dict = self.persons_by_id.get(person_id)
-        if not person_dict:
+        return PersonView(self, person)
+
+    def surname_branch(self, person_id: int, depth: Optional[int] = None) -> Optional["PersonView"]:
+        """Lineage of a person in its surname forest. Below `depth` levels the
+        children are not materialized and the node is marked `truncated`; the
+        client expands it by asking for that person's branch."""
+        person_view = self._person_view(person_id)
+        if not person_view:
             return None
-        person_node = self._build_person_node(person_id)
-        if not person_node:
-            return None
-        processed_ids.add(person_id)
-
-        families_as_parent = self.families_by_person_id.get(person_id, [])
-        if families_as_parent:
-            fam = families_as_parent[0]
-            spouse_id = fam.get("wife_id") if fam.get("husband_id") == person_id else fam.get("husband_id")
-
-            if spouse_id is not None:
-                person_node.spouse = self._build_person_node(spouse_id)
-
-            for child_id in fam.get("children_ids", []):
-                child_dict = self.persons_by_id.get(child_id)
-                if not child_dict:
-                    continue
-                child_surname = self._get_surname(child_dict)
-                if crush_name(child_surname) == crushed_surname:
-                    child_node = self._build_branch(child_id, crushed_surname, processed_ids)
-                    if child_node:
-                        person_node.children.append(child_node)
-        return person_node
-
-    def find_by_list(self, crushed_n: str, crushed_p: str) -> List[Dict]:
+        forest = self.surname_forest
+        spouse_id = forest["spouse"].get(person_id)
+        if spouse_id is not None:
+            person_view.spouse = self._person_view(spouse_id)
+        children_ids = forest["children"].get(person_id, [])
+        if depth is not None and depth <= 0:
+            person_view.truncated = bool(children_ids)
+            return person_view
+        children = []
+        for child_id in children_ids:
+            child_view = self.surname_branch(child_id, None if depth is None else depth - 1)
+            if child_view:
+                children.append(child_view)
+        person_view.children = children
+        return person_view
+
+    def find_by_list(self, crushed_n: str, crushed_p: str) -> List["PersonView"]:
         matching_surname_ids = set()
         matching_firstname_ids = set()
 
@@ -486,6 +730,7 @@ class SearchContext:
                     matching_firstname_ids.add(i)
 
         results = []
+        count("records_scanned", len(self.persons_list))
         for person in self.persons_list:
             found = False
             if self.is_gedcom_format:
@@ -506,83 +751,70 @@ class SearchContext:
                 found = True
 
             if found:
-                node = self._build_person_node(person.get("id"))
-                if node:
-                    results.append(node.model_dump())
+                results.append(PersonView(self, person))
         return results
 
-    def find_by_surname_tree(self, crushed_n: str) -> List[PersonNode]:
-        person_ids_with_surname = set()
-        for pid, p in self.persons_by_id.items():
-            surname = self._get_surname(p)
-            if crush_name(surname) == crushed_n:
-                person_ids_with_surname.add(pid)
-        if not person_ids_with_surname:
-            return []
-
-        root_ids = set()
-        for pid in person_ids_with_surname:
-            person_dict = self.persons_by_id.get(pid)
-            if not person_dict:
+    def find_by_index(
+        self,
+        place: Optional[str],
+        born_after: Optional[int],
+        born_before: Optional[int],
+        crushed_n: Optional[str] = None,
+        crushed_p: Optional[str] = None,
+    ) -> List["PersonView"]:
+        """Persons matching a place and/or a birth year range, read from the
+        search index, then narrowed by crushed surname / first name."""
+        person_ids = self.search_index.query(place, born_after, born_before)
+        count("records_scanned", len(person_ids))
+        results = []
+        for person_id in person_ids:
+            view = self._person_view(person_id)
+            if view is None:
                 continue
+            if crushed_n and crush_name(view.surname) != crushed_n:
+                continue
+            if crushed_p and not any(crush_name(fn) == crushed_p for fn in view.first_names):
+                continue
+            results.append(view)
+        return results
 
-            father_id = person_dict.get("father_id")
-            mother_id = person_dict.get("mother_id")
-
-            father_has_surname = False
-            if father_id is not None:
-                father_dict = self.persons_by_id.get(father_id)
-                if crush_name(self._get_surname(father_dict)) == crushed_n:
-                    father_has_surname = True
-
-            mother_has_surname = False
-            if mother_id is not None:
-                mother_dict = self.persons_by_id.get(mother_id)
-                if crush_name(self._get_surname(mother_dict)) == crushed_n:
-                    mother_has_surname = True
-
-            if not father_has_surname and not mother_has_surname:
-                root_ids.add(pid)
-
+    def find_by_surname_tree(self, crushed_n: str, depth: Optional[int] = None) -> List["PersonView"]:
+        """Branches of a surname, read from the precomputed forest."""
+        root_ids = self.surname_forest["roots"].get(crushed_n, [])
+        count("records_scanned", len(root_ids))
         branches = []
-        processed_ids = set()
         for rid in root_ids:
-            if rid not in processed_ids:
-                branch = self._build_branch(rid, crushed_n, processed_ids)
-                if branch:
-                    branches.append(branch)
-
-        def sort_key(node: PersonNode):
-            first_name_sort = " ".join(node.first_names)
-            if any(name.lower() in ["many", "mr.", "mrs."] for name in node.first_names):
-                return f"z_{first_name_sort}"
-            return f"a_{first_name_sort}"
-        branches.sort(key=sort_key)
-
+            branch = self.surname_branch(rid, depth)
+            if branch:
+                branches.append(branch)
         return branches
 
+    def find_person_id(self, crushed_n: str, crushed_p: str) -> Optional[int]:
+        """Id of the first person whose crushed surname and first names match."""
+        if self._ids_by_name_key is None:
+            index: Dict[Tuple[str, str], int] = {}
+            for p in self.persons_list:
+                surname = self._get_surname(p)
+                if self.is_gedcom_format:
+                    first_names = [self.string_table.get(fn_id, "?") for fn_id in p.get("first_name_ids", [])]
+                else:
+                    first_names = p.get("first_names", [])
+                index.setdefault((crush_name(surname), crush_name(" ".join(first_names))), p.get("id"))
+            self._ids_by_name_key = index
+        return self._ids_by_name_key.get((crushed_n, crushed_p))
+
     def find_person_details(self, crushed_n: str, crushed_p: str) -> Optional[Dict]:
         """Trouve une personne et renvoie ses détails (parents, grands-parents, familles)."""
-        person_id = None
-
         # 1. Trouver l'ID de la personne
-        for p in self.persons_list:
-            surname = self._get_surname(p)
-            first_names = []
-            if self.is_gedcom_format:
-                first_names = [self.string_table.get(fn_id, "?") for fn_id in p.get("first_name_ids", [])]
-            else:
-                first_names = p.get("first_names", [])
-
-            if crush_name(surname) == crushed_n and crush_name(" ".join(first_names)) == crushed_p:
-                person_id = p.get("id")
-                break
-
+        person_id = self.find_person_id(crushed_n, crushed_p)
         if person_id is None:
             return None
+        return self.person_details(person_id)
 
+    def person_details(self, person_id: int) -> Optional[Dict]:
+        """Détails d'une personne connue par son id."""
         # 2. Construire le nœud de la personne principale
-        person_node = self._build_person_node(person_id)
+        person_node = self._person_view(person_id)
         if not person_node:
             return None
         person_dict = self.persons_by_id.get(person_id)
@@ -594,28 +826,28 @@ class SearchContext:
 
         if person_dict.get("father_id") is not None:
             father_id = person_dict["father_id"]
-            father_node = self._build_person_node(father_id)
+            father_node = self._person_view(father_id)
             # Récupérer les grands-parents paternels
             father_dict = self.persons_by_id.get(father_id)
             if father_dict:
                 if father_dict.get("father_id") is not None:
-                    paternal_father_node = self._build_person_node(father_dict["father_id"])
+                    paternal_father_node = self._person_view(father_dict["father_id"])
                 if father_dict.get("mother_id") is not None:
-                    paternal_mother_node = self._build_person_node(father_dict["mother_id"])
+                    paternal_mother_node = self._person_view(father_dict["mother_id"])
 
         mother_node = None
         maternal_father_node = None
         maternal_mother_node = None
         if person_dict.get("mother_id") is not None:
             mother_id = person_dict["mother_id"]
-            mother_node = self._build_person_node(mother_id)
+            mother_node = self._person_view(mother_id)
             # Récupérer les grands-parents maternels
             mother_dict = self.persons_by_id.get(mother_id)
             if mother_dict:
                 if mother_dict.get("father_id") is not None:
-                    maternal_father_node = self._build_person_node(mother_dict["father_id"])
+                    maternal_father_node = self._person_view(mother_dict["father_id"])
                 if mother_dict.get("mother_id") is not None:
-                    maternal_mother_node = self._build_person_node(mother_dict["mother_id"])
+                    maternal_mother_node = self._person_view(mother_dict["mother_id"])
 
         # 4. Récupérer les familles (conjoints + enfants)
         families_data = []
@@ -624,31 +856,80 @@ class SearchContext:
             spouse_id = fam.get("wife_id") if fam.get("husband_id") == person_id else fam.get("husband_id")
             spouse_node = None
             if spouse_id is not None:
-                spouse_node = self._build_person_node(spouse_id)
+                spouse_node = self._person_view(spouse_id)
 
             children_nodes = []
             for child_id in fam.get("children_ids", []):
-                child_node = self._build_person_node(child_id)
+                child_node = self._person_view(child_id)
                 if child_node:
                     children_nodes.append(child_node)
 
             families_data.append({
-                "spouse": spouse_node.model_dump() if spouse_node else None,
-                "children": [c.model_dump() for c in children_nodes]
+                "spouse": spouse_node,
+                "children": children_nodes
             })
 
         # 5. Renvoyer toutes les données
         return {
-            "person": person_node.model_dump(),
-            "father": father_node.model_dump() if father_node else None,
-            "mother": mother_node.model_dump() if mother_node else None,
-            "paternal_father": paternal_father_node.model_dump() if paternal_father_node else None,
-            "paternal_mother": paternal_mother_node.model_dump() if paternal_mother_node else None,
-            "maternal_father": maternal_father_node.model_dump() if maternal_father_node else None,
-            "maternal_mother": maternal_mother_node.model_dump() if maternal_mother_node else None,
+            "person": person_node,
+            "father": father_node,
+            "mother": mother_node,
+            "paternal_father": paternal_father_node,
+            "paternal_mother": paternal_mother_node,
+            "maternal_father": maternal_father_node,
+            "maternal_mother": maternal_mother_node,
             "families": families_data
         }
 
+# Contextes chargés réutilisés entre requêtes tant que base.json ne change pas
+CONTEXT_CACHE_SIZE = int(os.environ.get("CONTEXT_CACHE_SIZE", "4"))
+_context_cache: "OrderedDict[str, Tuple[Tuple, SearchContext]]" = OrderedDict()
+_context_lock = threading.Lock()
+
+
+def _base_signature(db_name: str) -> Optional[Tuple]:
+    """(path, mtime, size) of the base.json a SearchContext would load, if
+    any, and the mtime of the meta.json next to it (a new generation)."""
+    for path in (BASES_DIR / "json_bases" / db_name / "base.json", BASES_DIR / f"{db_name}.gwb" / "base.json"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        try:
+            meta_mtime = (path.parent / META_FILENAME).stat().st_mtime_ns
+        except OSError:
+            meta_mtime = None
+        return (str(path), st.st_mtime_ns, st.st_size, meta_mtime)
+    return None
+
+
+def forget_search_context(db_name: str) -> None:
+    with _context_lock:
+        _context_cache.pop(db_name, None)
+
+
+def get_search_context(db_name: str) -> SearchContext:
+    """Return a loaded SearchContext, reusing the previous one while base.json is unchanged.
+    Bases served from .gw/.ged fallbacks are not cached.
+    """
+    signature = _base_signature(db_name)
+    if signature is None:
+        return SearchContext(db_name)
+    with _context_lock:
+        cached = _context_cache.get(db_name)
+        if cached is not None and cached[0] == signature:
+            _context_cache.move_to_end(db_name)
+            return cached[1]
+    with phase("context_build"):
+        ctx = SearchContext(db_name)
+    with _context_lock:
+        _context_cache[db_name] = (signature, ctx)
+        _context_cache.move_to_end(db_name)
+        while len(_context_cache) > CONTEXT_CACHE_SIZE:
+            _context_cache.popitem(last=False)
+    return ctx
+
+
 @app.get("/db/{db_name}/person")
 def get_person_details(db_name: str, n: str, p: str):
     """Récupère les détails complets pour une seule personne."""
@@ -656,16 +937,18 @@ def get_person_details(db_name: str, n: str, p: str):
         raise HTTPException(status_code=400, detail="Surname (n) and firstname (p) are required")
 
     try:
-        ctx = SearchContext(db_name)
-        crushed_n = crush_name(n)
-        crushed_p = crush_name(p)
+        ctx = get_search_context(db_name)
+        with phase("crush"):
+            crushed_n = crush_name(n)
+            crushed_p = crush_name(p)
 
-        details = ctx.find_person_details(crushed_n, crushed_p)
+        with phase("search"):
+            details = ctx.find_person_details(crushed_n, crushed_p)
 
         if not details:
             raise HTTPException(status_code=404, detail="Person not found")
 
-        return {"ok": True, "details": details}
+        return FastJSONResponse({"ok": True, "details": details})
 
     except HTTPException as e:
         return {"ok": False, "error": e.detail}
@@ -673,34 +956,479 @@ def get_person_details(db_name: str, n: str, p: str):
         return {"ok": False, "error": str(e)}
 
 @app.get("/db/{db_name}/search")
-def search_db(db_name: str, n: Optional[str] = None, p: Optional[str] = None):
-    if not n and not p:
-        raise HTTPException(status_code=400, detail="Search query (n or p) is required")
+def search_db(
+    db_name: str,
+    n: Optional[str] = None,
+    p: Optional[str] = None,
+    depth: Optional[int] = None,
+    place: Optional[str] = None,
+    born_after: Optional[int] = None,
+    born_before: Optional[int] = None,
+):
+    """Recherche par nom (vue arbre pour un patronyme seul), ou par lieu et
+    période de naissance (bornes incluses) via l'index, éventuellement
+    restreinte par n/p."""
+    by_index = bool(place) or born_after is not None or born_before is not None
+    if not n and not p and not by_index:
+        raise HTTPException(status_code=400, detail="Search query (n, p, place, born_after or born_before) is required")
 
     try:
-        ctx = SearchContext(db_name)
-        crushed_n = crush_name(n) if n else None
-        crushed_p = crush_name(p) if p else None
+        ctx = get_search_context(db_name)
+        with phase("crush"):
+            crushed_n = crush_name(n) if n else None
+            crushed_p = crush_name(p) if p else None
+
+        if by_index:
+            with phase("search"):
+                results_list = ctx.find_by_index(place, born_after, born_before, crushed_n, crushed_p)
+            return FastJSONResponse({
+                "ok": True,
+                "view_mode": "list",
+                "results": results_list
+            })
 
         results_tree = []
         if crushed_n and not crushed_p:
-            results_tree = ctx.find_by_surname_tree(crushed_n)
+            with phase("search"):
+                results_tree = ctx.find_by_surname_tree(crushed_n, depth)
 
         if results_tree:
-            return {
+            return FastJSONResponse({
                 "ok": True,
                 "view_mode": "tree",
-                "results": [branch.model_dump() for branch in results_tree]
-            }
+                "results": results_tree
+            })
         else:
-            results_list = ctx.find_by_list(crushed_n, crushed_p)
-            return {
+            with phase("search"):
+                results_list = ctx.find_by_list(crushed_n, crushed_p)
+            return FastJSONResponse({
                 "ok": True,
                 "view_mode": "list",
                 "results": results_list
-            }
+            })
 
     except HTTPException as e:
         return {"ok": False, "error": e.detail, "results": []}
     except Exception as e:
-        return {"ok": False, "error": str(e), "results": []}
\ No newline at end of file
+        return {"ok": False, "error": str(e), "results": []}
+
+
+MAX_BATCH_SIZE = 500
+
+
+class PersonKey(BaseModel):
+    n: str
+    p: str
+
+
+class BatchPersonsRequest(BaseModel):
+    ids: List[int] = []
+    keys: List[PersonKey] = []
+    details: bool = False
+
+
+@app.post("/db/{db_name}/persons:batch")
+def get_persons_batch(db_name: str, req: BatchPersonsRequest):
+    """Résout plusieurs personnes (ids puis clés n/p) avec un seul contexte chargé.
+    Les résultats suivent l'ordre de la requête ; None pour une personne introuvable.
+    """
+    if len(req.ids) + len(req.keys) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} persons per batch")
+
+    try:
+        ctx = get_search_context(db_name)
+        person_ids = list(req.ids) + [
+            ctx.find_person_id(crush_name(k.n), crush_name(k.p)) for k in req.keys
+        ]
+        results = []
+        for person_id in person_ids:
+            if person_id is None or person_id not in ctx.persons_by_id:
+                results.append(None)
+            elif req.details:
+                results.append(ctx.person_details(person_id))
+            else:
+                results.append(ctx._person_view(person_id))
+        return FastJSONResponse({
+            "ok": True,
+            "results": results,
+            "missing": sum(1 for r in results if r is None),
+        })
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail, "results": []}
+    except Exception as e:
+        return {"ok": False, "error": str(e), "results": []}
+
+
+DEFAULT_MAX_ANC_LEVEL = 8
+
+
+@app.get("/db/{db_name}/person/{person_id}/ancestors")
+def get_ancestors(db_name: str, person_id: int, depth: Optional[int] = None):
+    """Arbre d'ascendance numéroté Sosa, par parcours en largeur sur les tableaux de parents.
+    La profondeur est bornée par max_anc_level du .gwf.
+    """
+    max_level = gwf_int(read_gwf(BASES_DIR, db_name), "max_anc_level", DEFAULT_MAX_ANC_LEVEL)
+    depth = max_level if depth is None else max(0, min(depth, max_level))
+
+    try:
+        ctx = get_search_context(db_name)
+        if person_id not in ctx.persons_by_id:
+            raise HTTPException(status_code=404, detail="Person not found")
+        ancestors, implex = ctx.graph.ancestors(person_id, depth)
+        return FastJSONResponse({
+            "ok": True,
+            "depth": depth,
+            "ancestors": [
+                {
+                    "sosa": sosa,
+                    "generation": generation,
+                    "person": ctx._person_view(pid),
+                }
+                for sosa, generation, pid in ancestors
+            ],
+            "implex": [{"id": pid, "sosa": numbers} for pid, numbers in implex.items()],
+        })
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+@app.get("/db/{db_name}/person/{person_id}/branch")
+def get_surname_branch(db_name: str, person_id: int, depth: Optional[int] = None):
+    """Branche patronymique d'une personne, pour déplier un nœud tronqué de /search?depth=."""
+    try:
+        ctx = get_search_context(db_name)
+        branch = ctx.surname_branch(person_id, depth)
+        if branch is None:
+            raise HTTPException(status_code=404, detail="Person not found")
+        return FastJSONResponse({"ok": True, "branch": branch})
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+DEFAULT_MAX_DESC_LEVEL = 12
+DEFAULT_MAX_DESC_TREE = 4
+
+
+@app.get("/db/{db_name}/person/{person_id}/descendants")
+def get_descendants(
+    db_name: str,
+    person_id: int,
+    depth: Optional[int] = None,
+    view: str = "list",
+    stream: bool = False,
+):
+    """Descendance sur toutes les unions, génération par génération.
+    La profondeur est bornée par max_desc_level (view=list) ou max_desc_tree
+    (view=tree) du .gwf ; stream=true renvoie une ligne NDJSON par génération.
+    """
+    options = read_gwf(BASES_DIR, db_name)
+    if view == "tree":
+        max_level = gwf_int(options, "max_desc_tree", DEFAULT_MAX_DESC_TREE)
+    else:
+        max_level = gwf_int(options, "max_desc_level", DEFAULT_MAX_DESC_LEVEL)
+    depth = max_level if depth is None else max(0, min(depth, max_level))
+
+    try:
+        ctx = get_search_context(db_name)
+        if person_id not in ctx.persons_by_id:
+            raise HTTPException(status_code=404, detail="Person not found")
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+    def generation_rows():
+        for generation, rows in enumerate(ctx.graph.descendants(person_id, depth)):
+            yield {
+                "generation": generation,
+                "persons": [
+                    {
+                        "person": ctx._person_view(pid),
+                        "unions": [
+                            {
+                                "family_id": fid,
+                                "spouse": ctx._person_view(spouse_id)
+                                if spouse_id is not None else None,
+                                "children_ids": children,
+                            }
+                            for fid, spouse_id, children in unions
+                        ],
+                    }
+                    for pid, unions in rows
+                ],
+            }
+
+    if stream:
+        return StreamingResponse(
+            (dumps(row) + b"\n" for row in generation_rows()),
+            media_type="application/x-ndjson",
+        )
+    return FastJSONResponse({"ok": True, "depth": depth, "generations": list(generation_rows())})
+
+
+@app.get("/db/{db_name}/relationship")
+def get_relationship(db_name: str, a: int, b: int):
+    """Lien de parenté entre A et B : ancêtres communs les plus proches et
+    chemin depuis chacun, par BFS bidirectionnel sur les tableaux de parents.
+    """
+    try:
+        ctx = get_search_context(db_name)
+        result = find_relationship(ctx.graph, a, b)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Person not found")
+        involved = {a, b}
+        for ancestor in result["common_ancestors"]:
+            involved.update(ancestor["path_a"])
+            involved.update(ancestor["path_b"])
+        result["persons"] = [ctx._person_view(pid) for pid in sorted(involved)]
+        return FastJSONResponse({"ok": True, **result})
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def _base_dir(db_name: str) -> Path:
+    signature = _base_signature(db_name)
+    if signature is None:
+        raise HTTPException(status_code=404, detail="Base not found")
+    return Path(signature[0]).parent
+
+
+@app.get("/db/{db_name}/consang")
+def get_consang(db_name: str, limit: int = 50):
+    """Coefficients de consanguinité calculés en tâche de fond après l'import,
+    les plus élevés d'abord. `stale` signale un calcul antérieur à la base actuelle.
+    """
+    try:
+        sidecar = read_consang(_base_dir(db_name))
+        if sidecar is None:
+            return {"ok": True, "status": "pending", "coefficients": []}
+        meta = catalog.meta(BASES_DIR, db_name) or {}
+        coefficients = sorted(
+            ((int(pid), f) for pid, f in sidecar["coefficients"].items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+        ctx = get_search_context(db_name)
+        rows = []
+        for pid, f in coefficients[:max(0, limit)]:
+            node = ctx._person_view(pid)
+            rows.append({"person": node or {"id": pid}, "consang": f})
+        return FastJSONResponse({
+            "ok": True,
+            "status": "done",
+            "stale": data_generation(meta) != sidecar.get("generation"),
+            "generation": sidecar.get("generation"),
+            "computed_seconds": sidecar.get("computed_seconds"),
+            "count": len(coefficients),
+            "coefficients": rows,
+        })
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+@app.post("/db/{db_name}/consang")
+def recompute_consang(db_name: str):
+    """Relance le calcul (équivalent de bin/consang) sur la base chargée."""
+    try:
+        db_dir = _base_dir(db_name)
+        meta = catalog.meta(BASES_DIR, db_name) or {}
+        sidecar = write_consang(db_dir, get_search_context(db_name).graph, data_generation(meta))
+        return {"ok": True, "count": len(sidecar["coefficients"]), "computed_seconds": sidecar["computed_seconds"]}
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+@app.get("/db/{db_name}/components")
+def get_components(db_name: str, small: int = 0, max_listed: int = DEFAULT_MAX_LISTED):
+    """Composantes connexes (union-find sur parents et familles) : nombre,
+    histogramme des tailles, et membres des composantes d'au plus `small` personnes.
+    """
+    try:
+        ctx = get_search_context(db_name)
+        summary = summarize_components(ctx.graph, small, max_listed)
+        summary["small"] = [
+            [ctx._person_view(pid) for pid in component]
+            for component in summary["small"]
+        ]
+        return FastJSONResponse({"ok": True, **summary})
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+DEFAULT_MAX_COUSINS = 2000
+DEFAULT_MAX_COUSINS_LEVEL = 5
+
+
+@app.get("/db/{db_name}/person/{person_id}/cousins")
+def get_cousins(db_name: str, person_id: int, level: int = 2):
+    """Cousins de niveau `level` (1 : frères et sœurs, 2 : cousins germains...),
+    bornés par max_cousins_level et max_cousins du .gwf.
+    """
+    options = read_gwf(BASES_DIR, db_name)
+    max_level = gwf_int(options, "max_cousins_level", DEFAULT_MAX_COUSINS_LEVEL)
+    max_cousins = gwf_int(options, "max_cousins", DEFAULT_MAX_COUSINS)
+    level = max(1, min(level, max_level))
+
+    try:
+        ctx = get_search_context(db_name)
+        if person_id not in ctx.persons_by_id:
+            raise HTTPException(status_code=404, detail="Person not found")
+        cousins, truncated = ctx.cousin_finder.cousins(person_id, level, max_cousins)
+        return FastJSONResponse({
+            "ok": True,
+            "level": level,
+            "count": len(cousins),
+            "truncated": truncated,
+            "cousins": [
+                {"person": ctx._person_view(pid), "common_ancestors": common}
+                for pid, common in cousins
+            ],
+        })
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+class SosaRequest(BaseModel):
+    person_id: int
+
+
+@app.get("/db/{db_name}/sosa")
+def get_sosa(db_name: str):
+    """Personne de référence Sosa de la base et taille de la table précalculée."""
+    try:
+        ctx = get_search_context(db_name)
+        numbers = ctx.sosa_numbers
+        reference = ctx._person_view(ctx.sosa_reference) if ctx.sosa_reference is not None else None
+        return FastJSONResponse({"ok": True, "reference": reference, "count": len(numbers)})
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+@app.post("/db/{db_name}/sosa")
+def set_sosa_reference(db_name: str, req: SosaRequest):
+    """Change la personne de référence et recalcule la table Sosa persistée
+    (incrémentalement si la nouvelle référence est un enfant de l'ancienne).
+    """
+    try:
+        ctx = get_search_context(db_name)
+        if req.person_id not in ctx.persons_by_id:
+            raise HTTPException(status_code=404, detail="Person not found")
+        numbers = rebase_sosa(ctx.graph, ctx.sosa_reference, ctx.sosa_numbers, req.person_id)
+        incremental = numbers is not None
+        if numbers is None:
+            numbers = build_sosa(ctx.graph, req.person_id)
+        db_dir = _base_dir(db_name)
+        meta = catalog.meta(BASES_DIR, db_name) or {}
+        write_sosa(db_dir, req.person_id, data_generation(meta), numbers)
+        # Nouvelle génération : pages rendues et contextes des autres processus périmés
+        bump_generation(db_dir)
+        catalog.invalidate()
+        ctx._sosa = numbers
+        ctx.sosa_reference = req.person_id
+        with _context_lock:
+            cached = _context_cache.get(db_name)
+            if cached is not None and cached[1] is ctx:
+                _context_cache[db_name] = (_base_signature(db_name), ctx)
+        return FastJSONResponse({
+            "ok": True,
+            "reference": ctx._person_view(req.person_id),
+            "count": len(numbers),
+            "incremental": incremental,
+        })
+
+    except HTTPException as e:
+        return {"ok": False, "error": e.detail}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def _export_person_ids(ctx: SearchContext, descendants_of: Optional[int], surname: Optional[str]) -> Optional[Set[int]]:
+    """Persons of a subset export (descendants of a person with their spouses,
+    and/or a surname), or None to export the whole base."""
+    selected: Optional[Set[int]] = None
+    if descendants_of is not None:
+        if descendants_of not in ctx.persons_by_id:
+            raise HTTPException(status_code=404, detail="Person not found")
+        selected = set()
+        for rows in ctx.graph.descendants(descendants_of, len(ctx.graph)):
+            for pid, unions in rows:
+                selected.add(pid)
+                selected.update(spouse for _, spouse, _ in unions if spouse is not None)
+    if surname:
+        crushed = crush_name(surname)
+        matching = {p["id"] for p in ctx.persons_list if crush_name(ctx._get_surname(p)) == crushed}
+        selected = matching if selected is None else selected & matching
+    return selected
+
+
+@app.get("/db/{db_name}/export.ged")
+def export_ged(
+    db_name: str,
+    descendants_of: Optional[int] = None,
+    surname: Optional[str] = None,
+    gzip: bool = False,
+):
+    """Export GEDCOM généré enregistrement par enregistrement et envoyé en flux,
+    éventuellement compressé (gzip=true) ou restreint à un sous-ensemble.
+    """
+    _base_dir(db_name)
+    ctx = get_search_context(db_name)
+    person_ids = _export_person_ids(ctx, descendants_of, surname)
+    strings = ctx.snames_list if ctx.is_gedcom_format else None
+    chunks = iter_chunks(iter_ged_lines(ctx.persons_list, ctx.families_list, strings, person_ids))
+    filename = f"{db_name}.ged"
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else "text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/db/{db_name}/export.gw")
+def export_gw(db_name: str):
+    """Export .gw de la base chargée, écrit bloc par bloc dans la réponse."""
+    _base_dir(db_name)
+    ctx = get_search_context(db_name)
+    strings = ctx.snames_list if ctx.is_gedcom_format else None
+
+    def person_of(pid: int) -> Optional[Person]:
+        record = ctx.persons_by_id.get(pid)
+        return decode_person(record, strings) if record is not None else None
+
+    lines = iter_gw_lines(
+        (decode_person(p, strings) for p in ctx.persons_list),
+        (decode_family(f, strings) for f in ctx.families_list),
+        person_of,
+    )
+    return StreamingResponse(
+        iter_chunks(lines),
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{db_name}.gw"'},
+    )
@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from .metadata import META_FILENAME, read_meta
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class BaseCatalog:
+    """In-memory catalog of the available bases.
+
+    The listing is rebuilt only when the mtime of BASES_DIR or of
+    BASES_DIR/json_bases changes (a base was added, removed or renamed);
+    per-base manifests (meta.json) are re-read when their own mtime changes.
+    base.json is never parsed here.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        self._dirs: Dict[str, List[Path]] = {}
+        self._meta_cache: Dict[Path, Tuple[Optional[int], Optional[Dict]]] = {}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._signature = None
+            self._meta_cache.clear()
+
+    def _dir_signature(self, bases_dir: Path) -> Tuple:
+        return (bases_dir, _mtime(bases_dir), _mtime(bases_dir / "json_bases"))
+
+    def _scan(self, bases_dir: Path) -> Dict[str, List[Path]]:
+        """Map base name -> candidate directories holding its files (json first)."""
+        dirs: Dict[str, List[Path]] = {}
+        json_bases_dir = bases_dir / "json_bases"
+        if json_bases_dir.exists():
+            for p in sorted(json_bases_dir.iterdir()):
+                if p.is_dir():
+                    dirs.setdefault(p.name, []).append(p)
+
+        # Vérifie aussi les dossiers .gwb classiques qui n'ont pas de json_base
+        for p in sorted(bases_dir.iterdir()):
+            if p.is_dir() and p.suffix == ".gwb":
+                dirs.setdefault(p.stem, []).append(p)
+        return dirs
+
+    def _refresh(self, bases_dir: Path) -> None:
+        signature = self._dir_signature(bases_dir)
+        if signature != self._signature or signature[1] is None:
+            self._dirs = self._scan(bases_dir)
+            self._signature = signature
+            known = {d for dirs in self._dirs.values() for d in dirs}
+            for d in [d for d in self._meta_cache if d not in known]:
+                del self._meta_cache[d]
+
+    def _load_meta(self, db_dir: Path) -> Optional[Dict]:
+        mtime = _mtime(db_dir / META_FILENAME)
+        cached = self._meta_cache.get(db_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        meta = read_meta(db_dir) if mtime is not None else None
+        self._meta_cache[db_dir] = (mtime, meta)
+        return meta
+
+    def names(self, bases_dir: Path) -> List[str]:
+        with self._lock:
+            self._refresh(bases_dir)
+            names = set()
+            for name, dirs in self._dirs.items():
+                meta = None
+                for d in dirs:
+                    meta = self._load_meta(d)
+                    if meta is not None:
+                        break
+                names.add(meta.get("name", name) if meta else name)
+            return sorted(names)
+
+    def meta(self, bases_dir: Path, db_name: str) -> Optional[Dict]:
+        """Return the manifest of a base, or None if the base has no meta.json."""
+        with self._lock:
+            self._refresh(bases_dir)
+            for d in self._dirs.get(db_name, []):
+                meta = self._load_meta(d)
+                if meta is not None:
+                    return meta
+            return None
+
+    def generations(self, bases_dir: Path) -> Dict[str, int]:
+        """Map base name -> manifest generation, for bases that have a meta.json."""
+        with self._lock:
+            self._refresh(bases_dir)
+            result: Dict[str, int] = {}
+            for name, dirs in self._dirs.items():
+                for d in dirs:
+                    meta = self._load_meta(d)
+                    if meta is not None and meta.get("generation") is not None:
+                        result[name] = meta["generation"]
+                        break
+            return result
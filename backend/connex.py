@@ -0,0 +1,124 @@
+"""Connected components of a base (port of GeneWeb's bin/connex).
+
+Usage: python -m backend.connex DB_NAME [--bases-dir DIR] [--small N] [--max-listed N]
+"""
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import sys
+
+from .graph import NO_PERSON, PersonGraph
+from .storage import read_json_base
+
+
+DEFAULT_MAX_LISTED = 100
+
+
+def component_labels(graph: PersonGraph) -> array:
+    """Union-find over parent links and family members; returns, for every
+    person index, the index of its component's representative.
+
+    Union by size with path halving: linear in persons + links for all
+    practical purposes, iterative, and working on flat int arrays only.
+    """
+    n = len(graph)
+    root = array("i", range(n))
+    size = array("i", [1]) * n
+
+    def find(x: int) -> int:
+        while root[x] != x:
+            root[x] = root[root[x]]
+            x = root[x]
+        return x
+
+    def union(a: int, b: int) -> None:
+        a, b = find(a), find(b)
+        if a == b:
+            return
+        if size[a] < size[b]:
+            a, b = b, a
+        root[b] = a
+        size[a] += size[b]
+
+    father, mother = graph.father, graph.mother
+    for i in range(n):
+        if father[i] != NO_PERSON:
+            union(i, father[i])
+        if mother[i] != NO_PERSON:
+            union(i, mother[i])
+    for k in range(len(graph.family_ids)):
+        members = [p for p in (graph.husband[k], graph.wife[k]) if p != NO_PERSON]
+        members.extend(graph.family_children(k))
+        for p in members[1:]:
+            union(members[0], p)
+
+    for i in range(n):
+        root[i] = find(i)
+    return root
+
+
+def summarize_components(
+    graph: PersonGraph,
+    small_size: int = 0,
+    max_listed: int = DEFAULT_MAX_LISTED,
+) -> Dict:
+    """Component count and size histogram, plus the person ids of the
+    components of at most `small_size` persons (smallest first, at most
+    `max_listed` components), which are usually data-entry mistakes.
+    """
+    labels = component_labels(graph)
+    sizes = Counter(labels)
+    histogram = Counter(sizes.values())
+    small_roots = sorted(
+        (r for r, s in sizes.items() if s <= small_size),
+        key=lambda r: (sizes[r], r),
+    )[:max(0, max_listed)]
+    members: Dict[int, List[int]] = {r: [] for r in small_roots}
+    if members:
+        for i, r in enumerate(labels):
+            if r in members:
+                members[r].append(graph.ids[i])
+    return {
+        "persons": len(graph),
+        "count": len(sizes),
+        "largest": max(sizes.values(), default=0),
+        "sizes": [{"size": s, "components": c} for s, c in sorted(histogram.items(), reverse=True)],
+        "small": [members[r] for r in small_roots],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.connex", description="Connected components of a base.")
+    parser.add_argument("db_name")
+    parser.add_argument("--bases-dir", type=Path, default=Path(__file__).resolve().parent / "bases")
+    parser.add_argument("--small", type=int, default=0, help="list members of components up to this size")
+    parser.add_argument("--max-listed", type=int, default=DEFAULT_MAX_LISTED)
+    args = parser.parse_args(argv)
+
+    try:
+        base = read_json_base(args.bases_dir, args.db_name)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    persons = base.get("persons", [])
+    strings = base.get("strings", [])
+    by_id = {p["id"]: p for p in persons}
+    summary = summarize_components(PersonGraph(persons, base.get("families", [])), args.small, args.max_listed)
+
+    print(f"{args.db_name}: {summary['persons']} persons, {summary['count']} connected components")
+    for row in summary["sizes"]:
+        print(f"  {row['components']} component(s) of {row['size']} person(s)")
+    for component in summary["small"]:
+        print(f"--- {len(component)} person(s)")
+        for pid in component:
+            p = by_id[pid]
+            first_names = " ".join(strings[i] for i in p.get("first_name_ids", []) if i is not None)
+            surname = strings[p["surname_id"]] if p.get("surname_id") is not None else "?"
+            print(f"  {pid} {first_names} {surname}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
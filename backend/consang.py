@@ -0,0 +1,134 @@
+from array import array
+from pathlib import Path
+from typing import Dict, Optional
+import heapq
+import os
+import time
+
+from .graph import NO_PERSON, PersonGraph
+from .jsonio import read_json, write_json
+
+
+CONSANG_FILENAME = "consang.json"
+
+
+def topological_order(graph: PersonGraph) -> array:
+    """Person indexes ordered so that parents always come before their children.
+
+    Kahn's algorithm over the parent arrays; persons caught in a parent cycle
+    (data errors) and their descendants are appended at the end, in base order.
+    """
+    n = len(graph)
+    father, mother = graph.father, graph.mother
+    pending = array("b", [0]) * n
+    children_of: Dict[int, list] = {}
+    for i in range(n):
+        for parent in (father[i], mother[i]):
+            if parent != NO_PERSON and parent != i:
+                pending[i] += 1
+                children_of.setdefault(parent, []).append(i)
+    order = array("i", (i for i in range(n) if pending[i] == 0))
+    head = 0
+    while head < len(order):
+        for c in children_of.get(order[head], ()):
+            pending[c] -= 1
+            if pending[c] == 0:
+                order.append(c)
+        head += 1
+    if len(order) < n:
+        order.extend(i for i in range(n) if pending[i] > 0)
+    return order
+
+
+def inbreeding_coefficients(graph: PersonGraph) -> array:
+    """Inbreeding coefficient F of every person (indexed like graph.ids).
+
+    Path-tracing method of Meuwissen & Luo (1992): persons are processed in
+    topological order, and F(i) is obtained from the row of i in the Cholesky
+    factor of the relationship matrix, walked from i up through its ancestors
+    with a max-heap on topological position. Only the diagonal of the
+    relationship table is memoized (D, F), so memory stays linear; full
+    siblings reuse the coefficient of the first sibling computed.
+    """
+    n = len(graph)
+    order = topological_order(graph)
+    position = array("i", [0]) * n
+    for pos, i in enumerate(order):
+        position[i] = pos
+
+    # Parents exprimés en positions ; un parent placé après l'enfant (cycle) est coupé
+    sire = array("i", [NO_PERSON]) * n
+    dam = array("i", [NO_PERSON]) * n
+    for pos, i in enumerate(order):
+        for parents, parent in ((sire, graph.father[i]), (dam, graph.mother[i])):
+            if parent != NO_PERSON and position[parent] < pos:
+                parents[pos] = position[parent]
+
+    F = array("d", [0.0]) * n
+    D = array("d", [0.0]) * n
+    L = array("d", [0.0]) * n
+    by_couple: Dict[tuple, float] = {}
+    for pos in range(n):
+        s, d = sire[pos], dam[pos]
+        if s == NO_PERSON and d == NO_PERSON:
+            D[pos] = 1.0
+            continue
+        if s == NO_PERSON or d == NO_PERSON:
+            D[pos] = 0.75 - 0.25 * F[s if d == NO_PERSON else d]
+            continue
+        D[pos] = 0.5 - 0.25 * (F[s] + F[d])
+        couple = (s, d) if s < d else (d, s)
+        if couple in by_couple:
+            F[pos] = by_couple[couple]
+            continue
+        # Ligne pos de L : contributions de chaque ancêtre, du plus récent au plus ancien
+        L[pos] = 1.0
+        heap = [-pos]
+        queued = {pos}
+        diagonal = 0.0
+        while heap:
+            j = -heapq.heappop(heap)
+            lj = L[j]
+            L[j] = 0.0
+            diagonal += lj * lj * D[j]
+            for parent in (sire[j], dam[j]):
+                if parent != NO_PERSON:
+                    L[parent] += 0.5 * lj
+                    if parent not in queued:
+                        queued.add(parent)
+                        heapq.heappush(heap, -parent)
+        F[pos] = diagonal - 1.0
+        by_couple[couple] = F[pos]
+
+    result = array("d", [0.0]) * n
+    for pos, i in enumerate(order):
+        result[i] = F[pos]
+    return result
+
+
+def write_consang(db_dir: Path, graph: PersonGraph, generation: Optional[int]) -> Dict:
+    """Compute coefficients for a base and store the non-zero ones in a
+    sidecar file next to base.json, tagged with the base generation.
+    """
+    started = time.perf_counter()
+    F = inbreeding_coefficients(graph)
+    ids = graph.ids
+    sidecar = {
+        "generation": generation,
+        "computed_seconds": round(time.perf_counter() - started, 4),
+        "persons": len(graph),
+        "coefficients": {str(ids[i]): round(f, 10) for i, f in enumerate(F) if f > 1e-12},
+    }
+    path = db_dir / CONSANG_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    write_json(tmp_path, sidecar)
+    os.replace(tmp_path, path)
+    return sidecar
+
+
+def read_consang(db_dir: Path) -> Optional[Dict]:
+    """Read the consanguinity sidecar of a base directory, or None if absent/corrupt."""
+    try:
+        return read_json(db_dir / CONSANG_FILENAME)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,113 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Set, Tuple
+import threading
+
+from .graph import NO_PERSON, PersonGraph
+
+
+# Nombre total d'index gardés dans les ensembles d'ancêtres mis en cache
+DEFAULT_MAX_CACHED_ITEMS = 2_000_000
+
+
+class CousinFinder:
+    """Cousin queries over a PersonGraph with a bounded cache of ancestor sets.
+
+    ancestor_set(i, d) is built from the sets of i's parents at depth d-1, so
+    siblings, cousins and repeated queries in the same family cluster reuse
+    the sets already computed. The cache is an LRU bounded by the total number
+    of indexes stored, not by the number of sets.
+    """
+
+    def __init__(self, graph: PersonGraph, max_cached_items: int = DEFAULT_MAX_CACHED_ITEMS):
+        self.graph = graph
+        self.max_cached_items = max_cached_items
+        self._lock = threading.Lock()
+        self._sets: "OrderedDict[Tuple[int, int], FrozenSet[int]]" = OrderedDict()
+        self._cached_items = 0
+        self.hits = 0
+        self.misses = 0
+        self._index_children()
+
+    def _index_children(self) -> None:
+        """Children CSR built from the parent arrays (also covers persons
+        whose parents have no family record)."""
+        n = len(self.graph)
+        father, mother = self.graph.father, self.graph.mother
+        counts = [0] * (n + 1)
+        for i in range(n):
+            for parent in (father[i], mother[i]) if father[i] != mother[i] else (father[i],):
+                if parent != NO_PERSON:
+                    counts[parent + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.child_offsets: array = array("q", counts)
+        self.children: array = array("i", [0]) * counts[n]
+        fill = counts[:n]
+        for i in range(n):
+            for parent in (father[i], mother[i]) if father[i] != mother[i] else (father[i],):
+                if parent != NO_PERSON:
+                    self.children[fill[parent]] = i
+                    fill[parent] += 1
+
+    def ancestor_set(self, i: int, depth: int) -> FrozenSet[int]:
+        """Indexes of i and of its ancestors up to `depth` generations."""
+        key = (i, depth)
+        with self._lock:
+            cached = self._sets.get(key)
+            if cached is not None:
+                self._sets.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        result: Set[int] = {i}
+        if depth > 0:
+            for parent in (self.graph.father[i], self.graph.mother[i]):
+                if parent != NO_PERSON:
+                    result |= self.ancestor_set(parent, depth - 1)
+        frozen = frozenset(result)
+        with self._lock:
+            if key not in self._sets:
+                self._sets[key] = frozen
+                self._cached_items += len(frozen)
+                while self._cached_items > self.max_cached_items and self._sets:
+                    _, evicted = self._sets.popitem(last=False)
+                    self._cached_items -= len(evicted)
+        return frozen
+
+    def _up(self, layer: Set[int]) -> Set[int]:
+        father, mother = self.graph.father, self.graph.mother
+        return {p for i in layer for p in (father[i], mother[i]) if p != NO_PERSON}
+
+    def _down(self, layer: Set[int]) -> Set[int]:
+        offsets, children = self.child_offsets, self.children
+        return {c for i in layer for c in children[offsets[i]:offsets[i + 1]]}
+
+    def cousins(self, person_id: int, level: int, limit: int) -> Tuple[List[Tuple[int, List[int]]], bool]:
+        """Persons whose closest common ancestors with `person_id` are exactly
+        `level` generations above both (1: siblings, 2: first cousins, ...).
+
+        Returns ([(cousin_id, [common_ancestor_id, ...]), ...], truncated),
+        sorted by id and cut at `limit` cousins.
+        """
+        start = self.graph.index_of.get(person_id)
+        if start is None or level < 1:
+            return [], False
+        ids = self.graph.ids
+        ancestors_at_level: Set[int] = {start}
+        for _ in range(level):
+            ancestors_at_level = self._up(ancestors_at_level)
+        candidates = set(ancestors_at_level)
+        for _ in range(level):
+            candidates = self._down(candidates)
+        candidates.discard(start)
+
+        # Un ancêtre commun plus proche exclut le candidat de ce niveau
+        closer = self.ancestor_set(start, level - 1)
+        found: Dict[int, List[int]] = {}
+        for c in candidates:
+            if closer.isdisjoint(self.ancestor_set(c, level - 1)):
+                common = ancestors_at_level & self.ancestor_set(c, level)
+                found[ids[c]] = sorted(ids[a] for a in common)
+        ordered = sorted(found.items())
+        return ordered[:max(0, limit)], len(ordered) > limit
@@ -0,0 +1,144 @@
+"""GeneWeb (.gw) and GEDCOM date parsing, and the compact integer encoding
+stored next to the date strings at import.
+
+A date code is ``year * 100000 + month * 1000 + day * 10 + precision``
+(month and day 0 when unknown), so codes sort chronologically, fit in a
+32-bit int, and ``code // 100000`` is the year. 0 means no usable date.
+"""
+from dataclasses import dataclass
+from typing import Optional
+import re
+
+
+# Précisions, comme Adef.precision de GeneWeb
+SURE = 0
+ABOUT = 1
+MAYBE = 2
+BEFORE = 3
+AFTER = 4
+OR_YEAR = 5
+YEAR_INT = 6
+
+NO_DATE = 0
+MAX_YEAR = 9999
+
+GED_MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+GED_QUALIFIERS = {"ABT": ABOUT, "CAL": ABOUT, "EST": ABOUT, "BEF": BEFORE, "AFT": AFTER}
+GW_PREFIXES = {"~": ABOUT, "?": MAYBE, "<": BEFORE, ">": AFTER}
+
+# d/m/y, m/y ou y, suivi d'une éventuelle seconde année (|y ou ..y) et d'un calendrier
+_GW_DATE = re.compile(r"^(?:(\d{1,2})/)?(?:(\d{1,2})/)?(\d{1,4})(?:(\||\.\.)(\d{1,4}))?([GJFH])?$")
+# [jour] [mois] année, année double éventuelle ("1699/00")
+_GED_DATE = re.compile(r"^(?:(\d{1,2}) )?(?:([A-Z]{3}) )?(\d{1,4})(?:/\d{2})?$")
+
+
+@dataclass(frozen=True)
+class Date:
+    year: int
+    month: int = 0
+    day: int = 0
+    precision: int = SURE
+    # Seconde année des intervalles (OR_YEAR, YEAR_INT), non conservée dans le code
+    year2: Optional[int] = None
+
+
+def _valid(year: int, month: int, day: int) -> bool:
+    return 0 < year <= MAX_YEAR and 0 <= month <= 12 and 0 <= day <= 31 and (month or not day)
+
+
+def _parse_gw(text: str) -> Optional[Date]:
+    precision = GW_PREFIXES.get(text[0], SURE)
+    if precision != SURE:
+        text = text[1:]
+    m = _GW_DATE.match(text)
+    if not m:
+        return None
+    first, second, year, sep, year2, calendar = m.groups()
+    if calendar in ("F", "H"):
+        # Calendriers républicain et hébreu : pas de conversion
+        return None
+    if second is not None:
+        day, month = int(first), int(second)
+    else:
+        day, month = 0, int(first) if first is not None else 0
+    if year2 is not None and precision == SURE:
+        precision = OR_YEAR if sep == "|" else YEAR_INT
+    date = Date(int(year), month, day, precision, int(year2) if year2 is not None else None)
+    return date if _valid(date.year, date.month, date.day) else None
+
+
+def _parse_ged_simple(text: str, precision: int = SURE) -> Optional[Date]:
+    m = _GED_DATE.match(text)
+    if not m:
+        return None
+    day, month_name, year = m.groups()
+    month = GED_MONTHS.get(month_name, -1) if month_name else 0
+    if month < 0:
+        return None
+    date = Date(int(year), month, int(day) if day else 0, precision)
+    return date if _valid(date.year, date.month, date.day) else None
+
+
+def _parse_ged(text: str) -> Optional[Date]:
+    text = " ".join(text.upper().split())
+    if text.startswith("@#D"):
+        calendar, _, text = text.partition("@ ")
+        if calendar not in ("@#DGREGORIAN", "@#DJULIAN"):
+            return None
+    if text.startswith("INT "):
+        text = text[4:].split("(", 1)[0].strip()
+    word, _, rest = text.partition(" ")
+    if word in GED_QUALIFIERS:
+        return _parse_ged_simple(rest, GED_QUALIFIERS[word])
+    for start, end in (("BET", "AND"), ("FROM", "TO")):
+        if word == start:
+            first, _, second = rest.partition(f" {end} ")
+            lower = _parse_ged_simple(first)
+            if not second:
+                return Date(lower.year, lower.month, lower.day, AFTER) if lower else None
+            upper = _parse_ged_simple(second)
+            if lower is None or upper is None:
+                return None
+            return Date(lower.year, lower.month, lower.day, YEAR_INT, upper.year)
+    if word == "TO":
+        return _parse_ged_simple(rest, BEFORE)
+    return _parse_ged_simple(text)
+
+
+def parse_date(text: Optional[str]) -> Optional[Date]:
+    """Parse a .gw date ("7/9/1830", "~1820", "<1849", "1830..1840", "1/1/1700J")
+    or a GEDCOM one ("12 MAR 1901", "ABT 1820", "BET 1800 AND 1810").
+
+    Text-only dates, French republican and Hebrew calendars give None; Julian
+    dates are kept as written.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    if not text:
+        return None
+    if text[0] in GW_PREFIXES:
+        return _parse_gw(text)
+    if " " in text or not text[0].isdigit():
+        return _parse_ged(text)
+    # Forme .gw, sinon année double GEDCOM ("1699/00")
+    return _parse_gw(text) or _parse_ged_simple(text)
+
+
+def encode_date(date: Optional[Date]) -> int:
+    if date is None:
+        return NO_DATE
+    return date.year * 100000 + date.month * 1000 + date.day * 10 + date.precision
+
+
+def date_code(text: Optional[str]) -> int:
+    """Code of a date string, NO_DATE if it has no usable date."""
+    return encode_date(parse_date(text))
+
+
+def code_year(code: int) -> int:
+    """Year of a date code (0 for NO_DATE)."""
+    return code // 100000 if code > 0 else 0
@@ -0,0 +1,244 @@
+"""Compare two bases record by record (port of GeneWeb's gwdiff).
+
+Usage: python -m backend.diff OLD_DB NEW_DB [--bases-dir DIR] [--summary]
+"""
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import heapq
+import json
+import sys
+import tempfile
+
+from .jsonio import iter_json_array
+from .name_utils import crush_name
+from .storage import json_base_path
+
+
+# Enregistrements triés en mémoire avant d'être versés dans un fichier temporaire
+DEFAULT_CHUNK_RECORDS = 200_000
+
+# (key, position among the records sharing the key, content hash, id, fields)
+Record = Tuple[str, int, str, int, Dict]
+
+
+def _content_hash(fields: Dict) -> str:
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _decode_person(p: Dict, text: Callable[[Optional[int]], str]) -> Dict:
+    return {
+        "surname": text(p.get("surname_id")),
+        "first_names": " ".join(text(i) for i in p.get("first_name_ids", []) if i is not None),
+        "sex": p.get("sex") or "",
+        "birth_date": text(p.get("birth_date_id")),
+        "birth_place": text(p.get("birth_place_id")),
+        "death_date": text(p.get("death_date_id")),
+        "death_place": text(p.get("death_place_id")),
+    }
+
+
+def _person_key(d: Dict) -> str:
+    return f"{crush_name(d['surname'])}|{crush_name(d['first_names'])}|{d['birth_date']}"
+
+
+def _positioned(records: Iterable[Tuple[str, str, int, Dict]]) -> Iterator[Record]:
+    """Number the records sharing a key (homonyms born the same day) in
+    source order, so that editing one of them does not re-pair it."""
+    seen: Dict[str, int] = {}
+    for key, digest, rid, fields in records:
+        position = seen.get(key, 0)
+        seen[key] = position + 1
+        yield key, position, digest, rid, fields
+
+
+def _person_records(persons: Iterable[Dict], text, keys: Dict[int, str]) -> Iterator[Record]:
+    """Person records. Key: crushed surname, crushed first names and birth
+    date; parents are referred to by key, so that renumbered ids do not show
+    up as changes."""
+    def records():
+        for p in persons:
+            fields = _decode_person(p, text)
+            fields["father"] = keys.get(p.get("father_id"), "")
+            fields["mother"] = keys.get(p.get("mother_id"), "")
+            yield keys[p["id"]], _content_hash(fields), p["id"], fields
+    return _positioned(records())
+
+
+def _family_records(families: Iterable[Dict], text, keys: Dict[int, str]) -> Iterator[Record]:
+    """Family records. Key: both spouses' keys and the marriage date."""
+    def records():
+        for f in families:
+            fields = {
+                "marriage_date": text(f.get("marriage_date_id")),
+                "marriage_place": text(f.get("marriage_place_id")),
+                "children": sorted(keys[c] for c in f.get("children_ids") or [] if c in keys),
+            }
+            key = f"{keys.get(f.get('husband_id'), '')}+{keys.get(f.get('wife_id'), '')}|{fields['marriage_date']}"
+            yield key, _content_hash(fields), f["id"], fields
+    return _positioned(records())
+
+
+def _spill(chunk: List[Record]) -> IO[str]:
+    chunk.sort(key=lambda r: (r[0], r[1]))
+    f = tempfile.TemporaryFile("w+", encoding="utf-8")
+    for record in chunk:
+        f.write(json.dumps(record, ensure_ascii=False))
+        f.write("\n")
+    f.seek(0)
+    chunk.clear()
+    return f
+
+
+def _sorted_run(records: Iterable[Record], chunk_records: int) -> Iterator[Record]:
+    """Sort records by (key, position), consuming them at once: at most
+    `chunk_records` are held in memory, full chunks are sorted and spilled
+    to temporary files, which are then merged lazily.
+    """
+    chunk: List[Record] = []
+    files = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_records:
+            files.append(_spill(chunk))
+    if not files:
+        chunk.sort(key=lambda r: (r[0], r[1]))
+        return iter(chunk)
+    if chunk:
+        files.append(_spill(chunk))
+
+    def read(f) -> Iterator[Record]:
+        with f:
+            for line in f:
+                key, position, digest, rid, fields = json.loads(line)
+                yield key, position, digest, rid, fields
+
+    return heapq.merge(*(read(f) for f in files), key=lambda r: (r[0], r[1]))
+
+
+def _merge_join(kind: str, old: Iterable[Record], new: Iterable[Record]) -> Iterator[Dict]:
+    sentinel = object()
+    old_it, new_it = iter(old), iter(new)
+    a, b = next(old_it, sentinel), next(new_it, sentinel)
+    while a is not sentinel or b is not sentinel:
+        if b is sentinel or (a is not sentinel and a[:2] < b[:2]):
+            yield {"kind": kind, "change": "removed", "key": a[0], "old_id": a[3]}
+            a = next(old_it, sentinel)
+        elif a is sentinel or b[:2] < a[:2]:
+            yield {"kind": kind, "change": "added", "key": b[0], "new_id": b[3]}
+            b = next(new_it, sentinel)
+        else:
+            if a[2] != b[2]:
+                old_fields, new_fields = a[4], b[4]
+                yield {
+                    "kind": kind,
+                    "change": "changed",
+                    "key": a[0],
+                    "old_id": a[3],
+                    "new_id": b[3],
+                    "fields": {
+                        name: [old_fields.get(name), new_fields.get(name)]
+                        for name in sorted(set(old_fields) | set(new_fields))
+                        if old_fields.get(name) != new_fields.get(name)
+                    },
+                }
+            a, b = next(old_it, sentinel), next(new_it, sentinel)
+
+
+def _sorted_runs(
+    strings: List[str],
+    persons: Callable[[], Iterable[Dict]],
+    families: Iterable[Dict],
+    chunk_records: int,
+) -> Tuple[Iterator[Record], Iterator[Record]]:
+    """Sorted person and family runs of one base. `persons` is read twice:
+    once for the person keys (which parents and spouses refer to), once to
+    build the records; only the string table and the id -> key map stay in
+    memory besides the current chunk.
+    """
+    def text(sid: Optional[int]) -> str:
+        return strings[sid] if sid is not None else ""
+
+    keys = {p["id"]: _person_key(_decode_person(p, text)) for p in persons()}
+    return (
+        _sorted_run(_person_records(persons(), text, keys), chunk_records),
+        _sorted_run(_family_records(families, text, keys), chunk_records),
+    )
+
+
+def _base_runs(base: Dict, chunk_records: int) -> Tuple[Iterator[Record], Iterator[Record]]:
+    return _sorted_runs(base.get("strings", []), lambda: base.get("persons", []), base.get("families", []), chunk_records)
+
+
+def _stored_runs(path: Path, chunk_records: int) -> Tuple[Iterator[Record], Iterator[Record]]:
+    return _sorted_runs(
+        list(iter_json_array(path, "strings")),
+        lambda: iter_json_array(path, "persons"),
+        iter_json_array(path, "families"),
+        chunk_records,
+    )
+
+
+def _diff_runs(old_runs, new_runs) -> Iterator[Dict]:
+    yield from _merge_join("person", old_runs[0], new_runs[0])
+    yield from _merge_join("family", old_runs[1], new_runs[1])
+
+
+def diff_bases(old_base: Dict, new_base: Dict, chunk_records: int = DEFAULT_CHUNK_RECORDS) -> Iterator[Dict]:
+    """Yield added / removed / changed persons, then families, in key order.
+
+    Each side is reduced to (key, position, hash, id, fields) records,
+    sorted in chunks of at most `chunk_records` (spilled to temporary files
+    beyond that) and merge-joined, so the comparison itself holds only the
+    current records. Homonyms are paired by their order within the base.
+    """
+    return _diff_runs(_base_runs(old_base, chunk_records), _base_runs(new_base, chunk_records))
+
+
+def diff_stored_bases(
+    bases_dir: Path,
+    old_db: str,
+    new_db: str,
+    chunk_records: int = DEFAULT_CHUNK_RECORDS,
+) -> Iterator[Dict]:
+    """Same as diff_bases, streaming each base.json record by record into the
+    sorted runs instead of loading it: memory stays within the string table,
+    the person keys and one chunk per base.
+    """
+    old_runs = _stored_runs(json_base_path(bases_dir, old_db), chunk_records)
+    new_runs = _stored_runs(json_base_path(bases_dir, new_db), chunk_records)
+    return _diff_runs(old_runs, new_runs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.diff", description="Compare two bases.")
+    parser.add_argument("old_db")
+    parser.add_argument("new_db")
+    parser.add_argument("--bases-dir", type=Path, default=Path(__file__).resolve().parent / "bases")
+    parser.add_argument("--summary", action="store_true", help="only print counts")
+    parser.add_argument("--chunk-records", type=int, default=DEFAULT_CHUNK_RECORDS)
+    args = parser.parse_args(argv)
+
+    try:
+        entries = diff_stored_bases(args.bases_dir, args.old_db, args.new_db, args.chunk_records)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    marks = {"added": "+", "removed": "-", "changed": "~"}
+    counts: Dict[Tuple[str, str], int] = {}
+    for entry in entries:
+        counts[(entry["kind"], entry["change"])] = counts.get((entry["kind"], entry["change"]), 0) + 1
+        if args.summary:
+            continue
+        print(f"{marks[entry['change']]} {entry['kind']} {entry['key']}")
+        for name, (before, after) in entry.get("fields", {}).items():
+            print(f"    {name}: {before!r} -> {after!r}")
+    for kind in ("person", "family"):
+        print(f"{kind}s: " + ", ".join(f"{counts.get((kind, c), 0)} {c}" for c in ("added", "removed", "changed")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
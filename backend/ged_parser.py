@@ -1,7 +1,11 @@
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
+import mmap
+import os
 
 from .models import Person, Family, IdAllocator
 from .name_utils import crush_name
+from .parallel import CHUNKS_PER_WORKER, chunk_bounds, map_chunks, parse_workers
 
 
 GED_TAG_LEVEL = {
@@ -20,6 +24,15 @@ class GedRecord:
         self.lines.append((level, tag, data))
 
 
+# Tags lus par le parseur, et ceux dont la valeur sert : les autres valeurs ne sont pas décodées
+USED_TAGS = {
+    tag.encode("ascii"): tag
+    for tag in ("INDI", "FAM", "NAME", "SEX", "BIRT", "DEAT", "FAMC", "DATE", "PLAC", "HUSB", "WIFE", "CHIL", "MARR")
+}
+VALUE_TAGS = {"NAME", "SEX", "FAMC", "DATE", "PLAC", "HUSB", "WIFE", "CHIL"}
+_LEVELS = {str(level).encode("ascii"): level for level in range(100)}
+
+
 def _tokenize(ged_text: str) -> List[Tuple[int, Optional[str], str, Optional[str]]]:
     tokens: List[Tuple[int, Optional[str], str, Optional[str]]] = []
     for raw in ged_text.splitlines():
@@ -51,98 +64,224 @@ def _tokenize(ged_text: str) -> List[Tuple[int, Optional[str], str, Optional[str
     return tokens
 
 
-def parse_ged_text(ged_text: str) -> Dict[str, List]:
-    tokens = _tokenize(ged_text)
-
-    indi_records: Dict[str, GedRecord] = {}
-    fam_records: Dict[str, GedRecord] = {}
-
-    current: Optional[GedRecord] = None
-    current_level = -1
-
+def _add_tokens(tokens: List[Tuple[int, Optional[str], str, Optional[str]]], current: Optional[GedRecord], indi_records: List[GedRecord], fam_records: List[GedRecord]) -> Optional[GedRecord]:
     for level, xref, tag, data in tokens:
         if level == 0:
             # Start new record
+            current = None
             if tag == "INDI" or tag == "FAM":
                 current = GedRecord(tag, xref)
-                current_level = 0
                 if tag == "INDI" and xref:
-                    indi_records[xref] = current
+                    indi_records.append(current)
                 elif tag == "FAM" and xref:
-                    fam_records[xref] = current
-            else:
-                current = None
-                current_level = -1
+                    fam_records.append(current)
+            continue
+        if current is not None:
+            current.add(level, tag, data)
+    return current
+
+
+def _read_lines(lines: List[bytes], current: Optional[GedRecord], indi_records: List[GedRecord], fam_records: List[GedRecord]) -> Optional[GedRecord]:
+    """Add the lines to their INDI/FAM record (level-0 lines open a new one)
+    and return the record still open after the last line."""
+    for line in lines:
+        line = line.rstrip()
+        if not line:
+            continue
+        if line[-1] >= 0x80:
+            # Espaces Unicode possibles en fin de ligne : découpage exact sur le texte
+            current = _add_tokens(_tokenize(line.decode("utf-8", "surrogatepass")), current, indi_records, fam_records)
             continue
-        if current is None:
+        parts = line.split(b" ", 2)
+        if len(parts) < 2:
             continue
-        current.add(level, tag, data)
+        level = _LEVELS.get(parts[0])
+        if level is None:
+            try:
+                level = int(parts[0])
+            except ValueError:
+                continue
+        xref = None
+        tag = parts[1]
+        data = parts[2] if len(parts) > 2 else None
+        if tag and tag[0] == 64 and tag[-1] == 64:  # @xref@
+            if data is None:
+                continue
+            xref = tag
+            tag, sep, data = data.partition(b" ")
+            if not sep:
+                data = None
+        tag = USED_TAGS.get(tag, "")
+
+        if level == 0:
+            # Start new record
+            current = None
+            if tag == "INDI" or tag == "FAM":
+                current = GedRecord(tag, xref.decode("utf-8", "surrogatepass") if xref is not None else None)
+                if tag == "INDI" and xref:
+                    indi_records.append(current)
+                elif tag == "FAM" and xref:
+                    fam_records.append(current)
+            continue
+        if current is not None:
+            current.add(level, tag, data.decode("utf-8", "surrogatepass") if data is not None and tag in VALUE_TAGS else None)
+    return current
+
+
+def _records(buf, start: int = 0, end: Optional[int] = None) -> Tuple[List[GedRecord], List[GedRecord]]:
+    """INDI and FAM records with an xref, in file order, read from a UTF-8
+    GEDCOM buffer (bytes or mmap) between `start` and `end`.
+
+    Level-0 records are found with find() on the buffer; the ones other than
+    INDI/FAM are skipped without being copied or decoded. Only xrefs and the
+    values of VALUE_TAGS are decoded; other tags are kept as "" with no data,
+    for their level only.
+    """
+    end = len(buf) if end is None else end
+    # Fins de ligne LF ou CRLF, CR seul pour les anciens fichiers Mac
+    newline = b"\n" if buf.find(b"\n", start, end) >= 0 or buf.find(b"\r", start, end) < 0 else b"\r"
+    record_start = newline + b"0 "
+    indi_records: List[GedRecord] = []
+    fam_records: List[GedRecord] = []
+    current: Optional[GedRecord] = None
+    pos = start
+    while pos < end:
+        found = buf.find(record_start, pos, end)
+        record_end = found + 1 if found >= 0 else end
+        header_end = buf.find(newline, pos, record_end)
+        if header_end < 0:
+            header_end = record_end
+        current = _read_lines([buf[pos:header_end]], current, indi_records, fam_records)
+        # Enregistrement ignoré (HEAD, SOUR, NOTE...) : sous-lignes non lues
+        if current is not None or pos == start:
+            if header_end < record_end:
+                current = _read_lines(buf[header_end + 1:record_end].split(newline), current, indi_records, fam_records)
+        pos = record_end
+    return indi_records, fam_records
+
+
+def _event(rec: GedRecord, i: int) -> Tuple[Optional[str], Optional[str], int]:
+    """DATE and PLAC under the event line i, and the index of its last sub-line."""
+    level = rec.lines[i][0]
+    date: Optional[str] = None
+    place: Optional[str] = None
+    j = i + 1
+    while j < len(rec.lines) and rec.lines[j][0] > level:
+        l2, t2, d2 = rec.lines[j]
+        if t2 == "DATE" and d2:
+            date = d2.strip()
+        elif t2 == "PLAC" and d2:
+            place = d2.strip()
+        j += 1
+    return date, place, j - 1
+
+
+def _parse_indi(rec: GedRecord) -> Tuple:
+    # xref, first_names, surname, sex, birth_date, birth_place, death_date, death_place, famc_xref
+    first_names: List[str] = []
+    surname: str = ""
+    sex: Optional[str] = None
+    birth_date: Optional[str] = None
+    birth_place: Optional[str] = None
+    death_date: Optional[str] = None
+    death_place: Optional[str] = None
+    famc_xref: Optional[str] = None
+
+    i = 0
+    while i < len(rec.lines):
+        level, tag, data = rec.lines[i]
+        if tag == "NAME" and data:
+            name = data.strip()
+            parts = name.split("/")
+            if len(parts) >= 2:
+                before = parts[0].strip()
+                surname = parts[1].strip()
+                if before:
+                    first_names = [x for x in before.split(" ") if x]
+            else:
+                first_names = [name]
+        elif tag == "SEX" and data:
+            s = data.strip().upper()
+            if s in ("M", "F", "U"):
+                sex = s
+        elif tag == "BIRT":
+            birth_date, birth_place, i = _event(rec, i)
+        elif tag == "DEAT":
+            death_date, death_place, i = _event(rec, i)
+        i += 1 # Avancer dans tous les cas
+
+    # Première famille d'origine, à n'importe quel niveau
+    for level, tag, data in rec.lines:
+        if tag == "FAMC" and data:
+            famc_xref = data.strip()
+            break
+    return (rec.xref, first_names, surname, sex, birth_date, birth_place, death_date, death_place, famc_xref)
+
+
+def _parse_fam(rec: GedRecord) -> Tuple:
+    # xref, husband_xref, wife_xref, children_xrefs, marriage_date, marriage_place
+    husband_xref: Optional[str] = None
+    wife_xref: Optional[str] = None
+    children_xrefs: List[str] = []
+    marriage_date: Optional[str] = None
+    marriage_place: Optional[str] = None
+
+    i = 0
+    while i < len(rec.lines):
+        level, tag, data = rec.lines[i]
+        if tag == "HUSB" and data:
+            husband_xref = data.strip()
+        elif tag == "WIFE" and data:
+            wife_xref = data.strip()
+        elif tag == "CHIL" and data:
+            children_xrefs.append(data.strip())
+        elif tag == "MARR":
+            marriage_date, marriage_place, i = _event(rec, i)
+        i += 1
+    return (rec.xref, husband_xref, wife_xref, children_xrefs, marriage_date, marriage_place)
+
+
+def _parse_chunk(chunk) -> Tuple[List[Tuple], List[Tuple]]:
+    """Parsed INDI and FAM records of a chunk starting on a level-0 line,
+    given as bytes or as (path, start, end) of a file, mapped by the worker.
+    Runs in the worker processes: xrefs are left unresolved."""
+    if isinstance(chunk, tuple):
+        path, start, end = chunk
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            indi_records, fam_records = _records(buf, start, end)
+    else:
+        indi_records, fam_records = _records(chunk)
+    return [_parse_indi(rec) for rec in indi_records], [_parse_fam(rec) for rec in fam_records]
+
+
+def _link(chunks: List[Tuple[List[Tuple], List[Tuple]]]) -> Dict[str, List]:
+    """Allocate ids and resolve the xrefs of the chunks' records, in file order."""
+    # Xref en double : le dernier enregistrement l'emporte, à la place du premier
+    indis: Dict[str, Tuple] = {}
+    fams: Dict[str, Tuple] = {}
+    for chunk_indis, chunk_fams in chunks:
+        for indi in chunk_indis:
+            indis[indi[0]] = indi
+        for fam in chunk_fams:
+            fams[fam[0]] = fam
 
     pid_alloc = IdAllocator()
     fid_alloc = IdAllocator()
 
     # Map xref -> Person/Family ids
     person_id_by_xref: Dict[str, int] = {}
-    family_id_by_xref: Dict[str, int] = {}
 
     persons: List[Person] = []
     families: List[Family] = []
 
     persons_by_id: Dict[int, Person] = {}
+    famc_by_child: Dict[int, str] = {}
 
     # Pass 1: create Person entries
-    for xref, rec in indi_records.items():
-        first_names: List[str] = []
-        surname: str = ""
-        sex: Optional[str] = None
-        birth_date: Optional[str] = None
-        birth_place: Optional[str] = None
-        death_date: Optional[str] = None
-        death_place: Optional[str] = None
-        # ... (famc, fams etc. non utilisés ici) ...
-
-        i = 0
-        while i < len(rec.lines):
-            level, tag, data = rec.lines[i]
-            if tag == "NAME" and data:
-                name = data.strip()
-                parts = name.split("/")
-                if len(parts) >= 2:
-                    before = parts[0].strip()
-                    surname = parts[1].strip()
-                    if before:
-                        first_names = [x for x in before.split(" ") if x]
-                else:
-                    first_names = [name]
-            elif tag == "SEX" and data:
-                s = data.strip().upper()
-                if s in ("M", "F", "U"):
-                    sex = s
-            elif tag == "BIRT":
-                j = i + 1
-                while j < len(rec.lines) and rec.lines[j][0] > level:
-                    l2, t2, d2 = rec.lines[j]
-                    if t2 == "DATE" and d2:
-                        birth_date = d2.strip()
-                    elif t2 == "PLAC" and d2:
-                        birth_place = d2.strip()
-                    j += 1
-                i = j - 1
-            elif tag == "DEAT":
-                j = i + 1
-                while j < len(rec.lines) and rec.lines[j][0] > level:
-                    l2, t2, d2 = rec.lines[j]
-                    if t2 == "DATE" and d2:
-                        death_date = d2.strip()
-                    elif t2 == "PLAC" and d2:
-                        death_place = d2.strip()
-                    j += 1
-                i = j - 1
-            i += 1 # Avancer dans tous les cas
-
+    for xref, first_names, surname, sex, birth_date, birth_place, death_date, death_place, famc_xref in indis.values():
         pid = pid_alloc.alloc()
         person_id_by_xref[xref] = pid
-        
+
         person_obj = Person(
             id=pid,
             first_names=first_names or [],
@@ -157,40 +296,13 @@ def parse_ged_text(ged_text: str) -> Dict[str, List]:
         )
         persons.append(person_obj)
         persons_by_id[pid] = person_obj
+        if famc_xref:
+            famc_by_child[pid] = famc_xref
 
     # Pass 2: create Family entries
-    for xref, rec in fam_records.items():
-        husband_xref: Optional[str] = None
-        wife_xref: Optional[str] = None
-        children_xrefs: List[str] = []
-        marriage_date: Optional[str] = None
-        marriage_place: Optional[str] = None
-
-        i = 0
-        while i < len(rec.lines):
-            level, tag, data = rec.lines[i]
-            if tag == "HUSB" and data:
-                husband_xref = data.strip()
-            elif tag == "WIFE" and data:
-                wife_xref = data.strip()
-            elif tag == "CHIL" and data:
-                children_xrefs.append(data.strip())
-            elif tag == "MARR":
-                j = i + 1
-                while j < len(rec.lines) and rec.lines[j][0] > level:
-                    l2, t2, d2 = rec.lines[j]
-                    if t2 == "DATE" and d2:
-                        marriage_date = d2.strip()
-                    elif t2 == "PLAC" and d2:
-                        marriage_place = d2.strip()
-                    j += 1
-                i = j - 1
-            i += 1
-
-        fid = fid_alloc.alloc()
-        family_id_by_xref[xref] = fid
+    for xref, husband_xref, wife_xref, children_xrefs, marriage_date, marriage_place in fams.values():
         families.append(Family(
-            id=fid,
+            id=fid_alloc.alloc(),
             husband_id=person_id_by_xref.get(husband_xref) if husband_xref else None,
             wife_id=person_id_by_xref.get(wife_xref) if wife_xref else None,
             children_ids=[person_id_by_xref[c] for c in children_xrefs if c in person_id_by_xref],
@@ -198,21 +310,8 @@ def parse_ged_text(ged_text: str) -> Dict[str, List]:
             marriage_place=marriage_place,
         ))
 
-    famc_by_child: Dict[int, str] = {}
-    for xref, rec in indi_records.items():
-        child_pid = person_id_by_xref.get(xref)
-        famc_xref: Optional[str] = None
-        for level, tag, data in rec.lines:
-            if tag == "FAMC" and data:
-                famc_xref = data.strip()
-                break
-        if child_pid is not None and famc_xref:
-            famc_by_child[child_pid] = famc_xref
-
-    for fam_xref, fid in family_id_by_xref.items():
-        fam = next((f for f in families if f.id == fid), None)
-        if fam is None:
-            continue
+    # Pass 3: parents of the children whose FAMC is the family
+    for fam_xref, fam in zip(fams, families):
         for child_id in fam.children_ids:
             famc_xref = famc_by_child.get(child_id)
             if famc_xref == fam_xref:
@@ -220,9 +319,36 @@ def parse_ged_text(ged_text: str) -> Dict[str, List]:
                 if child:
                     child.father_id = fam.husband_id
                     child.mother_id = fam.wife_id
-    
+
     return {
-        "persons": persons, 
+        "persons": persons,
         "families": families,
         "notes": {},
-    }
\ No newline at end of file
+    }
+
+
+def parse_ged_text(ged_text: str, workers: Optional[int] = None) -> Dict[str, List]:
+    """Parse a GEDCOM text into persons and families.
+
+    Large texts (or any text when `workers` > 1) are cut at level-0 lines
+    and the chunks parsed in a process pool; the result is the same as a
+    sequential parse.
+    """
+    buf = ged_text.encode("utf-8", "surrogatepass")
+    workers = parse_workers(buf, workers)
+    chunks = [buf[a:b] for a, b in chunk_bounds(buf, (b"0 ",), workers * CHUNKS_PER_WORKER if workers > 1 else 1)]
+    return _link(map_chunks(_parse_chunk, chunks, workers))
+
+
+def parse_ged_file(path: Path, workers: Optional[int] = None) -> Dict[str, List]:
+    """parse_ged_text for a UTF-8 GEDCOM file, read through mmap without
+    loading it; in parallel, each worker maps its own range of the file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _link([])
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            workers = parse_workers(buf, workers)
+            if workers <= 1:
+                return _link([_parse_chunk(buf)])
+            bounds = chunk_bounds(buf, (b"0 ",), workers * CHUNKS_PER_WORKER)
+    return _link(map_chunks(_parse_chunk, [(str(path), a, b) for a, b in bounds], workers))
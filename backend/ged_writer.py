@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+import zlib
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _text(record: Dict, field: str, strings: Optional[List[str]]) -> Optional[str]:
+    """Read a field from a string-table record (`<field>_id`) or a plain one."""
+    if strings is None:
+        return record.get(field) or None
+    sid = record.get(f"{field}_id")
+    return strings[sid] if sid is not None else None
+
+
+def _first_names(record: Dict, strings: Optional[List[str]]) -> List[str]:
+    if strings is None:
+        return [fn for fn in record.get("first_names") or [] if fn]
+    return [strings[sid] for sid in record.get("first_name_ids") or [] if sid is not None]
+
+
+def _event(tag: str, date: Optional[str], place: Optional[str]) -> Iterator[str]:
+    if date or place:
+        yield f"1 {tag}"
+        if date:
+            yield f"2 DATE {date}"
+        if place:
+            yield f"2 PLAC {place}"
+
+
+def iter_ged_lines(
+    persons: Iterable[Dict],
+    families: List[Dict],
+    strings: Optional[List[str]] = None,
+    person_ids: Optional[Set[int]] = None,
+) -> Iterator[str]:
+    """Generate a GEDCOM 5.5.1 file line by line (port of gwb2ged).
+
+    Records are read from the loaded base (string-table or plain dicts) and
+    emitted one at a time; only the family links of each person are indexed
+    beforehand. With `person_ids`, only those persons are exported, with the
+    families having at least one exported parent, and links to persons
+    outside the subset are left out.
+    """
+    def kept(pid: Optional[int]) -> bool:
+        return pid is not None and (person_ids is None or pid in person_ids)
+
+    fams: Dict[int, List[int]] = {}
+    famc: Dict[int, List[int]] = {}
+    exported_families = []
+    for f in families:
+        if not (kept(f.get("husband_id")) or kept(f.get("wife_id"))):
+            continue
+        exported_families.append(f)
+        for pid in (f.get("husband_id"), f.get("wife_id")):
+            if kept(pid):
+                fams.setdefault(pid, []).append(f["id"])
+        for cid in f.get("children_ids") or []:
+            if kept(cid):
+                famc.setdefault(cid, []).append(f["id"])
+
+    yield "0 HEAD"
+    yield "1 SOUR GENEWEB_PY"
+    yield "1 GEDC"
+    yield "2 VERS 5.5.1"
+    yield "2 FORM LINEAGE-LINKED"
+    yield "1 CHAR UTF-8"
+
+    for p in persons:
+        pid = p["id"]
+        if not kept(pid):
+            continue
+        yield f"0 @I{pid}@ INDI"
+        given = " ".join(_first_names(p, strings))
+        surname = _text(p, "surname", strings) or ""
+        yield f"1 NAME {given} /{surname}/" if given else f"1 NAME /{surname}/"
+        sex = (p.get("sex") or "").upper()
+        if sex in ("M", "F", "U"):
+            yield f"1 SEX {sex}"
+        yield from _event("BIRT", _text(p, "birth_date", strings), _text(p, "birth_place", strings))
+        yield from _event("DEAT", _text(p, "death_date", strings), _text(p, "death_place", strings))
+        for fid in famc.get(pid, ()):
+            yield f"1 FAMC @F{fid}@"
+        for fid in fams.get(pid, ()):
+            yield f"1 FAMS @F{fid}@"
+
+    for f in exported_families:
+        yield f"0 @F{f['id']}@ FAM"
+        if kept(f.get("husband_id")):
+            yield f"1 HUSB @I{f['husband_id']}@"
+        if kept(f.get("wife_id")):
+            yield f"1 WIFE @I{f['wife_id']}@"
+        for cid in f.get("children_ids") or []:
+            if kept(cid):
+                yield f"1 CHIL @I{cid}@"
+        yield from _event("MARR", _text(f, "marriage_date", strings), _text(f, "marriage_place", strings))
+
+    yield "0 TRLR"
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Group lines into UTF-8 chunks of about `chunk_size` bytes."""
+    buffer: List[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            buffer.append("")
+            yield "\n".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        buffer.append("")
+        yield "\n".join(buffer).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream on the fly into a gzip member."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
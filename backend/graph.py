@@ -0,0 +1,163 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+NO_PERSON = -1
+
+
+class PersonGraph:
+    """Compact parent arrays and family CSR index over a loaded base.
+
+    Persons are renumbered densely (index 0..n-1, in base order); father and
+    mother links are stored as signed int arrays with NO_PERSON for unknown
+    parents, so traversals touch flat arrays instead of nested dicts.
+
+    Families are stored the same way (husband/wife arrays) with two CSR
+    (offsets + flat values) indexes: children of each family, and unions
+    (families as a parent) of each person, in base order.
+    """
+
+    def __init__(self, persons: Iterable[Dict], families: Iterable[Dict] = ()):
+        self.ids: array = array("q")
+        self.index_of: Dict[int, int] = {}
+        parent_ids: List[Tuple[Optional[int], Optional[int]]] = []
+        for p in persons:
+            pid = p["id"]
+            if pid in self.index_of:
+                continue
+            self.index_of[pid] = len(self.ids)
+            self.ids.append(pid)
+            parent_ids.append((p.get("father_id"), p.get("mother_id")))
+
+        n = len(self.ids)
+        self.father: array = array("i", [NO_PERSON]) * n
+        self.mother: array = array("i", [NO_PERSON]) * n
+        index_of = self.index_of
+        for i, (fid, mid) in enumerate(parent_ids):
+            if fid is not None:
+                self.father[i] = index_of.get(fid, NO_PERSON)
+            if mid is not None:
+                self.mother[i] = index_of.get(mid, NO_PERSON)
+        self._index_families(families)
+
+    def _index_families(self, families: Iterable[Dict]) -> None:
+        index_of = self.index_of
+        self.family_ids: array = array("q")
+        self.husband: array = array("i")
+        self.wife: array = array("i")
+        self.child_offsets: array = array("q", [0])
+        self.children: array = array("i")
+        for f in families:
+            hid, wid = f.get("husband_id"), f.get("wife_id")
+            self.family_ids.append(f["id"])
+            self.husband.append(index_of.get(hid, NO_PERSON) if hid is not None else NO_PERSON)
+            self.wife.append(index_of.get(wid, NO_PERSON) if wid is not None else NO_PERSON)
+            for cid in f.get("children_ids") or []:
+                c = index_of.get(cid)
+                if c is not None:
+                    self.children.append(c)
+            self.child_offsets.append(len(self.children))
+
+        # Unions par personne : comptage puis remplissage (CSR)
+        n = len(self.ids)
+        counts = [0] * (n + 1)
+        for k in range(len(self.family_ids)):
+            for parent in (self.husband[k], self.wife[k]):
+                if parent != NO_PERSON:
+                    counts[parent + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.union_offsets: array = array("q", counts)
+        self.unions: array = array("i", [0]) * counts[n]
+        fill = counts[:n]
+        for k in range(len(self.family_ids)):
+            h, w = self.husband[k], self.wife[k]
+            for parent in ((h, w) if h != w else (h,)):
+                if parent != NO_PERSON:
+                    self.unions[fill[parent]] = k
+                    fill[parent] += 1
+
+    def family_children(self, k: int) -> array:
+        return self.children[self.child_offsets[k]:self.child_offsets[k + 1]]
+
+    def person_unions(self, i: int) -> array:
+        return self.unions[self.union_offsets[i]:self.union_offsets[i + 1]]
+
+    def spouse(self, k: int, i: int) -> int:
+        return self.wife[k] if self.husband[k] == i else self.husband[k]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def ancestors(self, person_id: int, depth: int) -> Tuple[List[Tuple[int, int, int]], Dict[int, List[int]]]:
+        """Breadth-first ancestor walk up to `depth` generations.
+
+        Returns (ancestors, implex):
+        - ancestors: (sosa, generation, person_id) in BFS order, root first
+          with Sosa number 1; father of n is 2n, mother 2n+1;
+        - implex: person_id -> every Sosa number of an ancestor reached through
+          several lines. Such ancestors are listed (and expanded) only once,
+          under their smallest Sosa number.
+        """
+        start = self.index_of.get(person_id)
+        if start is None:
+            return [], {}
+        father, mother, ids = self.father, self.mother, self.ids
+        sosa_of: Dict[int, int] = {start: 1}
+        result: List[Tuple[int, int, int]] = [(1, 0, person_id)]
+        implex: Dict[int, List[int]] = {}
+        frontier: List[Tuple[int, int]] = [(1, start)]
+        generation = 0
+        while frontier and generation < depth:
+            generation += 1
+            next_frontier: List[Tuple[int, int]] = []
+            for sosa, i in frontier:
+                for parent, parent_sosa in ((father[i], 2 * sosa), (mother[i], 2 * sosa + 1)):
+                    if parent == NO_PERSON:
+                        continue
+                    if parent in sosa_of:
+                        implex.setdefault(ids[parent], [sosa_of[parent]]).append(parent_sosa)
+                        continue
+                    sosa_of[parent] = parent_sosa
+                    result.append((parent_sosa, generation, ids[parent]))
+                    next_frontier.append((parent_sosa, parent))
+            frontier = next_frontier
+        return result, implex
+
+    def descendants(self, person_id: int, depth: int) -> Iterator[List[Tuple[int, List[Tuple[int, Optional[int], List[int]]]]]]:
+        """Iterative descendant walk over every union, one generation at a time.
+
+        Yields, for generation 0..depth, a list of
+        (person_id, [(family_id, spouse_id, [child_id, ...]), ...]).
+        Children listed in the last generation are not expanded. A person
+        reached through several lines is expanded only once.
+        """
+        start = self.index_of.get(person_id)
+        if start is None:
+            return
+        ids = self.ids
+        seen = {start}
+        frontier = [start]
+        generation = 0
+        while frontier:
+            rows = []
+            next_frontier = []
+            for i in frontier:
+                unions = []
+                for k in self.person_unions(i):
+                    spouse = self.spouse(k, i)
+                    kids = self.family_children(k)
+                    unions.append((
+                        self.family_ids[k],
+                        ids[spouse] if spouse != NO_PERSON else None,
+                        [ids[c] for c in kids],
+                    ))
+                    if generation < depth:
+                        for c in kids:
+                            if c not in seen:
+                                seen.add(c)
+                                next_frontier.append(c)
+                rows.append((ids[i], unions))
+            yield rows
+            generation += 1
+            frontier = next_frontier
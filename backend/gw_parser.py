@@ -1,7 +1,20 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Optional
+import mmap
+import os
 import re
-from typing import Dict, List, Tuple, Optional
 
 from .models import Person, Family, IdAllocator
+from .parallel import CHUNKS_PER_WORKER, FILE_CHUNK_BYTES, chunk_bounds, map_chunks, parse_workers
+
+
+_DISAMBIGUATION = re.compile(r"\.\d+$")
+_PLACE_BRACKETS = re.compile(r"_\[(.*?)\]_")
+_DATE_DMY = re.compile(r"^[<~]?\d{1,2}/\d{1,2}/\d{2,4}$")
+_DATE_YEAR = re.compile(r"^[<~]?\d{3,4}$")
+# Fins de ligne et espaces que str.splitlines()/strip() connaissent et pas bytes
+_UNICODE_SPACES = (b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\x1f", b"\xc2\x85", b"\xc2\xa0", b"\xe1\x9a\x80", b"\xe2\x81\x9f", b"\xe3\x80\x80")
+_PUNCTUATION_SPACE = re.compile(rb"\xe2\x80[\x80-\x8a\xa8\xa9\xaf]")
 
 
 def _clean_token(tok: str) -> str:
@@ -11,7 +24,7 @@ def _clean_token(tok: str) -> str:
     tok = tok.replace("\\_", "_")
     tok = tok.replace("_", " ")
     # Remove trailing disambiguation like .1234
-    tok = re.sub(r"\.\d+$", "", tok)
+    tok = _DISAMBIGUATION.sub("", tok)
     return tok.strip()
 
 
@@ -19,7 +32,7 @@ def _normalize_place(text: str) -> str:
     text = text.replace("\\_", "_")
     text = text.replace("_", " ")
     # Remove bracket wrappers like _[Saint-Jacques]_
-    text = re.sub(r"_\[(.*?)\]_", r"\1", text)
+    text = _PLACE_BRACKETS.sub(r"\1", text)
     return text.strip()
 
 
@@ -41,130 +54,319 @@ def _looks_date(tok: str) -> bool:
     if not tok:
         return False
     return bool(
-        re.match(r"^[<~]?\d{1,2}/\d{1,2}/\d{2,4}$", tok)
-        or re.match(r"^[<~]?\d{3,4}$", tok)
+        _DATE_DMY.match(tok)
+        or _DATE_YEAR.match(tok)
     )
 
 
-def parse_gw_text(gw_text: str) -> Dict[str, object]:
-    """Parse a GW/GWPlus-like text and produce persons, families and notes.
-    - Recognizes fam blocks with children (beg/end) and marriage events (fevt)
-    - Recognizes pevt blocks for person events (#birt/#deat/#p/#bp/#dp)
-    - Recognizes notes blocks for person notes (notes <Name> ... beg ... end notes)
-    Returns dict: {persons: List[Person], families: List[Family], notes: Dict[name_key, str]}
-    """
-    lines = [ln.strip() for ln in gw_text.splitlines()]
-    # State
-    persons_map: Dict[str, Dict[str, Optional[str]]] = {}
-    sex_map: Dict[str, str] = {}
-    notes_map: Dict[str, str] = {}
+def _new_person(surname: str, first_names: List[str], per_id: Optional[str] = None) -> Dict[str, Optional[str]]:
+    return {
+        "surname": surname,
+        "first_names": first_names,
+        "birth_date": None,
+        "birth_place": None,
+        "death_date": None,
+        "death_place": None,
+        "father_key": None,
+        "mother_key": None,
+        "per_id": per_id,  # Store original per ID if available
+    }
 
-    families_raw: List[Dict] = []
-    # husband_key, wife_key, children_keys, marriage_date, marriage_place
 
-    # Helpers to get or create person
-    def ensure_person(surname: str, first_names: List[str]) -> str:
-        key = _name_key(surname, first_names)
-        if key not in persons_map:
-            persons_map[key] = {
-                "surname": surname,
-                "first_names": first_names,
-                "birth_date": None,
-                "birth_place": None,
-                "death_date": None,
-                "death_place": None,
-                "father_key": None,
-                "mother_key": None,
-                "per_id": None,  # Store original per ID if available
-            }
-        return key
+def _parse_fam(tokens: List[str]) -> Tuple:
+    # fam line -> ((hus_surname, hus_first), (wife_surname, wife_first) | None, chil refs)
+
+    # --- PARSE HUSBAND ---
+    # Parse husband: first two tokens after 'fam'
+    _, hus_surname, hus_first = _parse_name_pair(tokens, 1)
+
+    # --- PARSE WIFE (Corrected Logic) ---
+    wife = None
+
+    # Find the '+' separator
+    try:
+        plus_index = tokens.index('+')
+
+        # Scan tokens after '+' to find the start of the wife's name,
+        # skipping control tokens (dates, '0', etc.)
+        wife_start_idx = plus_index + 1
+        while wife_start_idx < len(tokens):
+            tok = tokens[wife_start_idx]
+            if tok.startswith('#') or _looks_date(tok) or tok == '0':
+                wife_start_idx += 1
+            else:
+                # Found the start of the name
+                break
+
+        # Ensure we have at least two tokens (surname + firstname)
+        if wife_start_idx < len(tokens) - 1:
+            _, wife_surname, wife_first = _parse_name_pair(tokens, wife_start_idx)
+            if wife_surname: # Only create person if a name was found
+                wife = (wife_surname, wife_first)
+
+    except ValueError:
+        # No '+' found, so no wife in this fam record (or single parent)
+        pass
+
+    # --- PARSE CHILDREN ---
+    # Look for 'chil' keywords followed by references to a per_id
+    chil_refs = [
+        tokens[idx + 1]
+        for idx, token in enumerate(tokens)
+        if token == "chil" and idx + 1 < len(tokens) and tokens[idx + 1].isdigit()
+    ]
+    return (hus_surname, hus_first), wife, chil_refs
+
+
+def _parse_fevt(evt_toks: List[str], fam_rec: Dict, last_event: Optional[str]) -> Optional[str]:
+    j = 0
+    while j < len(evt_toks):
+        tok = evt_toks[j]
+        if tok == "#marr":
+            last_event = "marr"
+            j += 1
+            if j < len(evt_toks) and not evt_toks[j].startswith('#'):
+                fam_rec["marriage_date"] = _clean_token(evt_toks[j])
+                j += 1
+            continue
+        if tok in {"#p", "#mp"}:
+            j += 1
+            place_tokens = []
+            while j < len(evt_toks) and not evt_toks[j].startswith('#'):
+                place_tokens.append(evt_toks[j])
+                j += 1
+            place = _normalize_place(" ".join(place_tokens))
+            if last_event == "marr":
+                fam_rec["marriage_place"] = place
+            continue
+        j += 1
+    return last_event
+
+
+def _parse_child(child_toks: List[str]) -> Optional[Tuple]:
+    # '- h|f [Surname] First [date...]' -> (surname or None if inherited, first_names, sex, birth_date)
+    if not (
+        len(child_toks) >= 3
+        and child_toks[0] == '-'
+        and child_toks[1] in {'h', 'f'}
+    ):
+        return None
+    gender = child_toks[1]
+
+    csurname = None
+    cfirst = []
+    date_token_start_index = 3 # Default if only 1 name token
+
+    # Check if token 3 looks like a date, 'od', or '#...'
+    # If so, token 2 is firstname, surname is inherited.
+    token_3 = child_toks[3] if len(child_toks) > 3 else "od" # Assume 'od' if line ends
+
+    if _looks_date(token_3) or token_3.startswith('#') or token_3 == 'od':
+        # Format: - sex firstname [date/comment...]
+        cfirst_token = _clean_token(child_toks[2])
+        cfirst = [x for x in cfirst_token.split(" ") if x]
+        date_token_start_index = 3
+    else:
+        # Format: - sex surname firstname [date/comment...]
+        csurname = _clean_token(child_toks[2])
+        cfirst_token = _clean_token(child_toks[3])
+        cfirst = [x for x in cfirst_token.split(" ") if x]
+        date_token_start_index = 4
+
+    # try to pick a date token following name for birth
+    birth_date = None
+    for t in child_toks[date_token_start_index:]:
+        if _looks_date(t):
+            birth_date = _clean_token(t)
+            break
+    return csurname, cfirst, 'M' if gender == 'h' else 'F', birth_date
+
+
+def _parse_pevt(evt_toks: List[str], updates: List[Tuple[str, str]], last_evt: Optional[str]) -> Optional[str]:
+    j = 0
+    while j < len(evt_toks):
+        tok = evt_toks[j]
+        if tok in {"#birt", "#bapt", "#deat"}:
+            last_evt = tok
+            j += 1
+            if j < len(evt_toks) and not evt_toks[j].startswith('#'):
+                val = _clean_token(evt_toks[j])
+                if tok == "#birt":
+                    updates.append(("birth_date", val))
+                elif tok == "#deat":
+                    updates.append(("death_date", val))
+                j += 1
+            continue
+        if tok in {"#p", "#bp", "#dp"}:
+            j += 1
+            place_tokens = []
+            while j < len(evt_toks) and not evt_toks[j].startswith('#'):
+                place_tokens.append(evt_toks[j])
+                j += 1
+            place = _normalize_place(" ".join(place_tokens))
+            if last_evt in {"#birt", "#bapt"} or tok in {"#bp"}:
+                updates.append(("birth_place", place))
+            elif last_evt == "#deat" or tok == "#dp":
+                updates.append(("death_place", place))
+            continue
+        j += 1
+    return last_evt
+
+
+def _parse_per(ptoks: List[str]) -> Optional[Tuple]:
+    # 'per <id> <First_Names> /<Surname>/ <sex> [birth_info] [death_info] [parent_info]'
+    # -> (surname, first_names, per_id, sex, updates)
+    if len(ptoks) < 4:
+        return None
+
+    # Extract person ID
+    person_id = ptoks[1]
+
+    # Find surname in /.../ format
+    surname_start = -1
+    surname_end = -1
+    for idx, tok in enumerate(ptoks):
+        if tok.startswith('/') and tok.endswith('/'):
+            surname_start = idx
+            surname_end = idx
+            break
+        elif tok.startswith('/'):
+            surname_start = idx
+        elif tok.endswith('/') and surname_start != -1:
+            surname_end = idx
+            break
+
+    if surname_start == -1:
+        return None
+
+    # Extract first names (between person_id and surname)
+    first_names = []
+    for idx in range(2, surname_start):
+        if idx < len(ptoks):
+            first_names.append(ptoks[idx])
+
+    # Extract surname
+    if surname_start == surname_end:
+        surname = ptoks[surname_start][1:-1]  # Remove / /
+    else:
+        surname_parts = []
+        for idx in range(surname_start, surname_end + 1):
+            if idx < len(ptoks):
+                part = ptoks[idx]
+                if idx == surname_start:
+                    part = part[1:]  # Remove leading /
+                if idx == surname_end:
+                    part = part[:-1]  # Remove trailing /
+                surname_parts.append(part)
+        surname = " ".join(surname_parts)
+
+    # Extract sex (token after surname)
+    sex = None
+    sex_idx = surname_end + 1
+    if sex_idx < len(ptoks) and ptoks[sex_idx] in {'m', 'f', 'M', 'F'}:
+        sex = ptoks[sex_idx].upper()
+
+    # Parse remaining tokens for birth/death/parent info
+    updates: List[Tuple[str, str]] = []
+    idx = sex_idx + 1
+    while idx < len(ptoks):
+        tok = ptoks[idx]
+
+        # Birth date
+        if _looks_date(tok):
+            updates.append(("birth_date", _clean_token(tok)))
+            idx += 1
+            # Check for 'in' keyword followed by place
+            if idx < len(ptoks) and ptoks[idx] == "in":
+                idx += 1
+                place_parts = []
+                while idx < len(ptoks) and not ptoks[idx].startswith('+') and ptoks[idx] not in {'fath', 'moth'}:
+                    place_parts.append(ptoks[idx])
+                    idx += 1
+                if place_parts:
+                    updates.append(("birth_place", _normalize_place(" ".join(place_parts))))
+            continue
+
+        # Death date (starts with +)
+        elif tok.startswith('+'):
+            death_date = tok[1:]  # Remove +
+            updates.append(("death_date", _clean_token(death_date)))
+            idx += 1
+            # Check for 'in' keyword followed by place
+            if idx < len(ptoks) and ptoks[idx] == "in":
+                idx += 1
+                place_parts = []
+                while idx < len(ptoks) and ptoks[idx] not in {'fath', 'moth'}:
+                    place_parts.append(ptoks[idx])
+                    idx += 1
+                if place_parts:
+                    updates.append(("death_place", _normalize_place(" ".join(place_parts))))
+            continue
+
+        # Father reference
+        elif tok == "fath":
+            idx += 1
+            if idx < len(ptoks):
+                # For now, store as string - will be resolved later
+                updates.append(("father_key", f"per_{ptoks[idx]}"))
+                idx += 1
+            continue
+
+        # Mother reference
+        elif tok == "moth":
+            idx += 1
+            if idx < len(ptoks):
+                # For now, store as string - will be resolved later
+                updates.append(("mother_key", f"per_{ptoks[idx]}"))
+                idx += 1
+            continue
+
+        else:
+            idx += 1
+
+    return surname, first_names, person_id, sex, updates
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", "surrogatepass")
+
+
+def _lines(buf: bytes) -> List[bytes]:
+    """Stripped lines of a UTF-8 buffer, still encoded."""
+    if any(space in buf for space in _UNICODE_SPACES) or _PUNCTUATION_SPACE.search(buf):
+        # Séparateurs ou espaces hors ASCII : découpage exact sur le texte
+        return [ln.strip().encode("utf-8", "surrogatepass") for ln in _decode(buf).splitlines()]
+    return [ln.strip() for ln in buf.splitlines()]
+
+
+def _parse_blocks(buf: bytes) -> Tuple[List[Tuple], bool]:
+    """Blocks of a UTF-8 .gw buffer (or of a chunk starting on a 'fam ' line)
+    as a list of operations for _GwMerge, with every name, date and place
+    already cleaned. Runs in the worker processes: name keys and per ids are
+    only resolved by the merge.
+
+    Lines are matched on their bytes; only the ones whose content is used
+    are decoded, so the lines a fam block skips are never decoded.
+
+    The flag is True when the text ends inside a block still waiting for its
+    end line: a chunk cut there would have read on into the next one.
+    """
+    lines = _lines(buf)
+    ops: List[Tuple] = []
+    cut = False
 
     i = 0
     while i < len(lines):
         line = lines[i]
-        if not line or line.startswith("encoding:") or line.startswith("gwplus"):
+        if not line or line.startswith(b"encoding:") or line.startswith(b"gwplus"):
             i += 1
             continue
 
         # fam line
-        if line.startswith("fam "):
-            # Tokenize
-            tokens = line.split()
-            
-            # --- PARSE HUSBAND ---
-            # Parse husband: first two tokens after 'fam'
-            _, hus_surname, hus_first = _parse_name_pair(tokens, 1)
-            husband_key = ensure_person(hus_surname, hus_first)
-            sex_map[husband_key] = "M"
-
-            # --- PARSE WIFE (Corrected Logic) ---
-            wife_surname = ""
-            wife_first = []
-            wife_key = None
-            
-            # Find the '+' separator
-            try:
-                plus_index = tokens.index('+')
-                
-                # Scan tokens after '+' to find the start of the wife's name,
-                # skipping control tokens (dates, '0', etc.)
-                wife_start_idx = plus_index + 1
-                while wife_start_idx < len(tokens):
-                    tok = tokens[wife_start_idx]
-                    if tok.startswith('#') or _looks_date(tok) or tok == '0':
-                        wife_start_idx += 1
-                    else:
-                        # Found the start of the name
-                        break
-                
-                # Ensure we have at least two tokens (surname + firstname)
-                if wife_start_idx < len(tokens) - 1:
-                    _, wife_surname, wife_first = _parse_name_pair(tokens, wife_start_idx)
-                    if wife_surname: # Only create person if a name was found
-                        wife_key = ensure_person(wife_surname, wife_first)
-                        sex_map[wife_key] = "F"
-                        
-            except ValueError:
-                # No '+' found, so no wife in this fam record (or single parent)
-                pass 
-
-            # --- PARSE CHILDREN ---
-            children_keys = []
-            
-            # Look for 'chil' keywords followed by references
-            for idx, token in enumerate(tokens):
-                if token == "chil" and idx + 1 < len(tokens):
-                    child_ref = tokens[idx + 1]
-                    if child_ref.isdigit():
-                        # This is a reference to person with per_id
-                        child_key = None
-                        for key, data in persons_map.items():
-                            if data.get("per_id") == child_ref:
-                                child_key = key
-                                break
-                        
-                        # If person doesn't exist, create a placeholder
-                        if child_key is None:
-                            child_key = f"per_{child_ref}"
-                            persons_map[child_key] = {
-                                "surname": "",
-                                "first_names": [],
-                                "birth_date": None,
-                                "birth_place": None,
-                                "death_date": None,
-                                "death_place": None,
-                                "father_key": None,
-                                "mother_key": None,
-                                "per_id": child_ref,
-                            }
-                        
-                        children_keys.append(child_key)
-            
-            # Initialize current family raw record
+        if line.startswith(b"fam "):
+            husband, wife, chil_refs = _parse_fam(_decode(line).split())
             fam_rec = {
-                "husband_key": husband_key,
-                "wife_key": wife_key,
-                "children_keys": children_keys,
+                "children": [],
                 "marriage_date": None,
                 "marriage_place": None,
             }
@@ -177,368 +379,315 @@ def parse_gw_text(gw_text: str) -> Dict[str, object]:
                 if not ln:
                     i += 1
                     continue
-                if ln.startswith("fam "):
+                if ln.startswith(b"fam "):
                     break
-                if ln.startswith("fevt"):
+                if ln.startswith(b"fevt"):
                     # Read events until 'end fevt'
                     i += 1
                     last_event = None
-                    while i < len(lines) and not lines[i].startswith("end fevt"):
-                        evt_line = lines[i]
-                        evt_toks = evt_line.split()
-                        j = 0
-                        while j < len(evt_toks):
-                            tok = evt_toks[j]
-                            if tok == "#marr":
-                                last_event = "marr"
-                                j += 1
-                                if j < len(evt_toks) and not evt_toks[j].startswith('#'):
-                                    fam_rec["marriage_date"] = _clean_token(evt_toks[j])
-                                    j += 1
-                                continue
-                            if tok in {"#p", "#mp"}:
-                                j += 1
-                                place_tokens = []
-                                while j < len(evt_toks) and not evt_toks[j].startswith('#'):
-                                    place_tokens.append(evt_toks[j])
-                                    j += 1
-                                place = _normalize_place(" ".join(place_tokens))
-                                if last_event == "marr":
-                                    fam_rec["marriage_place"] = place
-                                continue
-                            j += 1
+                    while i < len(lines) and not lines[i].startswith(b"end fevt"):
+                        last_event = _parse_fevt(_decode(lines[i]).split(), fam_rec, last_event)
                         i += 1
                     # consume 'end fevt'
-                    if i < len(lines) and lines[i].startswith("end fevt"):
+                    if i < len(lines) and lines[i].startswith(b"end fevt"):
                         i += 1
+                    else:
+                        cut = True
                     continue
-                if ln.startswith("beg"):
+                if ln.startswith(b"beg"):
                     # Children list until 'end'
                     i += 1
-                    while i < len(lines) and not lines[i].startswith("end"):
-                        child_line = lines[i]
-                        child_toks = child_line.split()
-                        if (
-                            len(child_toks) >= 3
-                            and child_toks[0] == '-'
-                            and child_toks[1] in {'h', 'f'}
-                        ):
-                            gender = child_toks[1]
-                            
-                            # --- START MODIFIED CHILD LOGIC ---
-                            csurname = ""
-                            cfirst = []
-                            date_token_start_index = 3 # Default if only 1 name token
-                            
-                            # Check if token 3 looks like a date, 'od', or '#...'
-                            # If so, token 2 is firstname, surname is inherited.
-                            token_3 = child_toks[3] if len(child_toks) > 3 else "od" # Assume 'od' if line ends
-                            
-                            if _looks_date(token_3) or token_3.startswith('#') or token_3 == 'od':
-                                # Format: - sex firstname [date/comment...]
-                                cfirst_token = _clean_token(child_toks[2])
-                                cfirst = [x for x in cfirst_token.split(" ") if x]
-                                # Inherit father's surname
-                                if fam_rec['husband_key'] in persons_map:
-                                    csurname = persons_map[fam_rec['husband_key']].get("surname")
-                                date_token_start_index = 3
-                            else:
-                                # Format: - sex surname firstname [date/comment...]
-                                csurname = _clean_token(child_toks[2])
-                                cfirst_token = _clean_token(child_toks[3])
-                                cfirst = [x for x in cfirst_token.split(" ") if x]
-                                date_token_start_index = 4
-
-                            if not csurname and not cfirst:
-                                i += 1 # Skip invalid line
-                                continue
-                                
-                            ckey = ensure_person(csurname, cfirst)
-                            sex_map[ckey] = 'M' if gender == 'h' else 'F'
-                            
-                            # try to pick a date token following name for birth
-                            for t in child_toks[date_token_start_index:]:
-                                if _looks_date(t):
-                                    persons_map[ckey]['birth_date'] = _clean_token(t)
-                                    break
-                            # set parental links
-                            # --- END MODIFIED CHILD LOGIC ---
-                            
-                            persons_map[ckey]['father_key'] = fam_rec['husband_key']
-                            persons_map[ckey]['mother_key'] = fam_rec['wife_key']
-                            fam_rec['children_keys'].append(ckey)
+                    while i < len(lines) and not lines[i].startswith(b"end"):
+                        child = _parse_child(_decode(lines[i]).split())
+                        if child is not None:
+                            fam_rec["children"].append(child)
                         i += 1
-                    if i < len(lines) and lines[i].startswith("end"):
+                    if i < len(lines) and lines[i].startswith(b"end"):
                         i += 1
+                    else:
+                        cut = True
                     continue
                 # Other lines within fam block we ignore
                 i += 1
-            families_raw.append(fam_rec)
+            ops.append(("fam", husband, wife, chil_refs, fam_rec["children"], fam_rec["marriage_date"], fam_rec["marriage_place"]))
             continue
 
         # notes block for a person: 'notes <Surname> <First_Names>'
-        if line.startswith("notes "):
-            ntoks = line.split()
+        if line.startswith(b"notes "):
+            ntoks = _decode(line).split()
             _, nsurname, nfirst = _parse_name_pair(ntoks, 1)
-            nkey = _name_key(nsurname, nfirst)
             # Read until 'end notes'
             i += 1
-            buf: List[str] = []
-            while i < len(lines) and not lines[i].startswith("end notes"):
-                buf.append(lines[i])
+            text: List[bytes] = []
+            while i < len(lines) and not lines[i].startswith(b"end notes"):
+                text.append(lines[i])
                 i += 1
-            notes_map[nkey] = "\n".join(buf).strip()
-            if i < len(lines) and lines[i].startswith("end notes"):
+            ops.append(("notes", _name_key(nsurname, nfirst), _decode(b"\n".join(text)).strip()))
+            if i < len(lines) and lines[i].startswith(b"end notes"):
                 i += 1
+            else:
+                cut = True
             continue
 
         # person events 'pevt <Surname> <First_Names>'
-        if line.startswith("pevt "):
-            ptoks = line.split()
+        if line.startswith(b"pevt "):
+            ptoks = _decode(line).split()
             _, psurname, pfirst = _parse_name_pair(ptoks, 1)
-            pkey = ensure_person(psurname, pfirst)
+            updates: List[Tuple[str, str]] = []
             # Read until 'end pevt'
             i += 1
             last_evt = None
-            while i < len(lines) and not lines[i].startswith("end pevt"):
-                evt_line = lines[i]
-                evt_toks = evt_line.split()
-                j = 0
-                while j < len(evt_toks):
-                    tok = evt_toks[j]
-                    if tok in {"#birt", "#bapt", "#deat"}:
-                        last_evt = tok
-                        j += 1
-                        if j < len(evt_toks) and not evt_toks[j].startswith('#'):
-                            val = _clean_token(evt_toks[j])
-                            if tok == "#birt":
-                                persons_map[pkey]["birth_date"] = val
-                            elif tok == "#deat":
-                                persons_map[pkey]["death_date"] = val
-                            j += 1
-                        continue
-                    if tok in {"#p", "#bp", "#dp"}:
-                        j += 1
-                        place_tokens = []
-                        while j < len(evt_toks) and not evt_toks[j].startswith('#'):
-                            place_tokens.append(evt_toks[j])
-                            j += 1
-                        place = _normalize_place(" ".join(place_tokens))
-                        if last_evt in {"#birt", "#bapt"} or tok in {"#bp"}:
-                            persons_map[pkey]["birth_place"] = place
-                        elif last_evt == "#deat" or tok == "#dp":
-                            persons_map[pkey]["death_place"] = place
-                        continue
-                    j += 1
+            while i < len(lines) and not lines[i].startswith(b"end pevt"):
+                last_evt = _parse_pevt(_decode(lines[i]).split(), updates, last_evt)
                 i += 1
-            if i < len(lines) and lines[i].startswith("end pevt"):
+            ops.append(("pevt", psurname, pfirst, updates))
+            if i < len(lines) and lines[i].startswith(b"end pevt"):
                 i += 1
+            else:
+                cut = True
             continue
 
-        # per line: 'per <id> <First_Names> /<Surname>/ <sex> [birth_info] [death_info] [parent_info]'
-        if line.startswith("per "):
-            ptoks = line.split()
-            if len(ptoks) < 4:
-                i += 1
-                continue
-            
-            # Extract person ID
-            person_id = ptoks[1]
-            
-            # Find surname in /.../ format
-            surname_start = -1
-            surname_end = -1
-            for idx, tok in enumerate(ptoks):
-                if tok.startswith('/') and tok.endswith('/'):
-                    surname_start = idx
-                    surname_end = idx
-                    break
-                elif tok.startswith('/'):
-                    surname_start = idx
-                elif tok.endswith('/') and surname_start != -1:
-                    surname_end = idx
-                    break
-            
-            if surname_start == -1:
-                i += 1
-                continue
-            
-            # Extract first names (between person_id and surname)
-            first_names = []
-            for idx in range(2, surname_start):
-                if idx < len(ptoks):
-                    first_names.append(ptoks[idx])
-            
-            # Extract surname
-            if surname_start == surname_end:
-                surname = ptoks[surname_start][1:-1]  # Remove / /
-            else:
-                surname_parts = []
-                for idx in range(surname_start, surname_end + 1):
-                    if idx < len(ptoks):
-                        part = ptoks[idx]
-                        if idx == surname_start:
-                            part = part[1:]  # Remove leading /
-                        if idx == surname_end:
-                            part = part[:-1]  # Remove trailing /
-                        surname_parts.append(part)
-                surname = " ".join(surname_parts)
-            
-            # Create person
-            pkey = ensure_person(surname, first_names)
-            
-            # Store the original per ID
-            persons_map[pkey]["per_id"] = person_id
-            
-            # Extract sex (token after surname)
-            sex_idx = surname_end + 1
-            if sex_idx < len(ptoks):
-                sex = ptoks[sex_idx]
-                if sex in {'m', 'f', 'M', 'F'}:
-                    sex_map[pkey] = sex.upper()
-            
-            # Parse remaining tokens for birth/death/parent info
-            idx = sex_idx + 1
-            while idx < len(ptoks):
-                tok = ptoks[idx]
-                
-                # Birth date
-                if _looks_date(tok):
-                    persons_map[pkey]["birth_date"] = _clean_token(tok)
-                    idx += 1
-                    # Check for 'in' keyword followed by place
-                    if idx < len(ptoks) and ptoks[idx] == "in":
-                        idx += 1
-                        place_parts = []
-                        while idx < len(ptoks) and not ptoks[idx].startswith('+') and ptoks[idx] not in {'fath', 'moth'}:
-                            place_parts.append(ptoks[idx])
-                            idx += 1
-                        if place_parts:
-                            persons_map[pkey]["birth_place"] = _normalize_place(" ".join(place_parts))
-                    continue
-                
-                # Death date (starts with +)
-                elif tok.startswith('+'):
-                    death_date = tok[1:]  # Remove +
-                    persons_map[pkey]["death_date"] = _clean_token(death_date)
-                    idx += 1
-                    # Check for 'in' keyword followed by place
-                    if idx < len(ptoks) and ptoks[idx] == "in":
-                        idx += 1
-                        place_parts = []
-                        while idx < len(ptoks) and ptoks[idx] not in {'fath', 'moth'}:
-                            place_parts.append(ptoks[idx])
-                            idx += 1
-                        if place_parts:
-                            persons_map[pkey]["death_place"] = _normalize_place(" ".join(place_parts))
-                    continue
-                
-                # Father reference
-                elif tok == "fath":
-                    idx += 1
-                    if idx < len(ptoks):
-                        father_id = ptoks[idx]
-                        # For now, store as string - will be resolved later
-                        persons_map[pkey]["father_key"] = f"per_{father_id}"
-                        idx += 1
-                    continue
-                
-                # Mother reference
-                elif tok == "moth":
-                    idx += 1
-                    if idx < len(ptoks):
-                        mother_id = ptoks[idx]
-                        # For now, store as string - will be resolved later
-                        persons_map[pkey]["mother_key"] = f"per_{mother_id}"
-                        idx += 1
-                    continue
-                
-                else:
-                    idx += 1
-            
+        # per line
+        if line.startswith(b"per "):
+            per = _parse_per(_decode(line).split())
+            if per is not None:
+                ops.append(("per",) + per)
             i += 1
             continue
 
         # skip other lines
         i += 1
 
-    # Create mapping from per_id to person key for resolving parent references
-    per_id_to_key: Dict[str, str] = {}
-    for key, data in persons_map.items():
-        if data.get("per_id"):
-            per_id_to_key[data["per_id"]] = key
-    
-    # Assign ids and build Person/Family objects
-    alloc = IdAllocator(start=1)  # Start IDs from 1 to match test expectations
-    key_to_id: Dict[str, int] = {}
-    persons_out: List[Person] = []
-    for key, data in persons_map.items():
-        # Use per_id if available, otherwise allocate sequentially
-        if data.get("per_id") and data["per_id"].isdigit():
-            pid = int(data["per_id"])
-        else:
-            pid = alloc.alloc()
-        key_to_id[key] = pid
-        # Determine sex
-        sex = sex_map.get(key)
-        persons_out.append(Person(
-            id=pid,
-            first_names=data["first_names"],
-            surname=data["surname"],
-            sex=sex,
-            father_id=None,  # set after building families
-            mother_id=None,
-            birth_date=data["birth_date"],
-            birth_place=data["birth_place"],
-            death_date=data["death_date"],
-            death_place=data["death_place"],
-        ))
-
-    # Map for quick update of parent ids
-    persons_by_key = {pkey: p for pkey, p in zip(key_to_id.keys(), persons_out)}
-
-    families_out: List[Family] = []
-    f_alloc = IdAllocator(start=1)  # Start family IDs from 1 to match test expectations
-    for fr in families_raw:
-        hid = key_to_id.get(fr["husband_key"]) if fr["husband_key"] else None
-        wid = key_to_id.get(fr["wife_key"]) if fr["wife_key"] else None
-        child_ids = [key_to_id[c] for c in fr["children_keys"]]
-        fam = Family(
-            id=f_alloc.alloc(),
-            husband_id=hid,
-            wife_id=wid,
-            children_ids=child_ids,
-            marriage_date=fr["marriage_date"],
-            marriage_place=fr["marriage_place"],
-        )
-        families_out.append(fam)
-        # assign parents to children
-        for ck in fr["children_keys"]:
-            p = persons_by_key.get(ck)
-            if p:
-                p.father_id = hid
-                p.mother_id = wid
-    
-    # Second pass to link parents from pevt blocks (if not set by fam)
-    # This ensures pevt data is merged with fam data
-    for pkey, pdata in persons_map.items():
-        person = persons_by_key.get(pkey)
-        if not person: continue
-
-        if person.father_id is None and pdata["father_key"]:
-            person.father_id = key_to_id.get(pdata["father_key"])
-        if person.mother_id is None and pdata["mother_key"]:
-            person.mother_id = key_to_id.get(pdata["mother_key"])
-        
-        # Merge event data (pevt data overrides fam child data if present)
-        if pdata["birth_date"]:
-             person.birth_date = pdata["birth_date"]
-        if pdata["birth_place"]:
-             person.birth_place = pdata["birth_place"]
-        if pdata["death_date"]:
-             person.death_date = pdata["death_date"]
-        if pdata["death_place"]:
-             person.death_place = pdata["death_place"]
-
-
-    return {"persons": persons_out, "families": families_out, "notes": notes_map}
+    return ops, cut
+
+
+class _GwMerge:
+    """Applies the operations of _parse_blocks in source order, with the
+    person-merging semantics of the sequential parser: persons are keyed by
+    surname|first names, created on first sight, and later blocks overwrite
+    their fields.
+    """
+
+    def __init__(self):
+        self.persons_map: Dict[str, Dict[str, Optional[str]]] = {}
+        self.sex_map: Dict[str, str] = {}
+        self.notes_map: Dict[str, str] = {}
+        self.families_raw: List[Dict] = []
+        # husband_key, wife_key, children_keys, marriage_date, marriage_place
+
+    # Helpers to get or create person
+    def ensure_person(self, surname: str, first_names: List[str]) -> str:
+        key = _name_key(surname, first_names)
+        if key not in self.persons_map:
+            self.persons_map[key] = _new_person(surname, first_names)
+        return key
+
+    def apply(self, ops: List[Tuple]) -> None:
+        persons_map = self.persons_map
+        for op in ops:
+            kind = op[0]
+            if kind == "fam":
+                _, (hus_surname, hus_first), wife, chil_refs, children, marriage_date, marriage_place = op
+                husband_key = self.ensure_person(hus_surname, hus_first)
+                self.sex_map[husband_key] = "M"
+                wife_key = None
+                if wife is not None:
+                    wife_key = self.ensure_person(*wife)
+                    self.sex_map[wife_key] = "F"
+
+                children_keys = []
+                for child_ref in chil_refs:
+                    # This is a reference to person with per_id
+                    child_key = None
+                    for key, data in persons_map.items():
+                        if data.get("per_id") == child_ref:
+                            child_key = key
+                            break
+
+                    # If person doesn't exist, create a placeholder
+                    if child_key is None:
+                        child_key = f"per_{child_ref}"
+                        persons_map[child_key] = _new_person("", [], child_ref)
+
+                    children_keys.append(child_key)
+
+                for csurname, cfirst, sex, birth_date in children:
+                    if csurname is None:
+                        # Inherit father's surname
+                        csurname = persons_map[husband_key].get("surname")
+                    if not csurname and not cfirst:
+                        continue # Skip invalid line
+                    ckey = self.ensure_person(csurname, cfirst)
+                    self.sex_map[ckey] = sex
+                    if birth_date is not None:
+                        persons_map[ckey]["birth_date"] = birth_date
+                    # set parental links
+                    persons_map[ckey]["father_key"] = husband_key
+                    persons_map[ckey]["mother_key"] = wife_key
+                    children_keys.append(ckey)
+
+                self.families_raw.append({
+                    "husband_key": husband_key,
+                    "wife_key": wife_key,
+                    "children_keys": children_keys,
+                    "marriage_date": marriage_date,
+                    "marriage_place": marriage_place,
+                })
+            elif kind == "notes":
+                self.notes_map[op[1]] = op[2]
+            elif kind == "pevt":
+                _, psurname, pfirst, updates = op
+                person = persons_map[self.ensure_person(psurname, pfirst)]
+                for field, value in updates:
+                    person[field] = value
+            elif kind == "per":
+                _, surname, first_names, person_id, sex, updates = op
+                pkey = self.ensure_person(surname, first_names)
+                person = persons_map[pkey]
+                # Store the original per ID
+                person["per_id"] = person_id
+                if sex is not None:
+                    self.sex_map[pkey] = sex
+                for field, value in updates:
+                    person[field] = value
+
+    def result(self) -> Dict[str, object]:
+        persons_map = self.persons_map
+        sex_map = self.sex_map
+        families_raw = self.families_raw
+
+        # Assign ids and build Person/Family objects
+        alloc = IdAllocator(start=1)  # Start IDs from 1 to match test expectations
+        key_to_id: Dict[str, int] = {}
+        persons_out: List[Person] = []
+        for key, data in persons_map.items():
+            # Use per_id if available, otherwise allocate sequentially
+            if data.get("per_id") and data["per_id"].isdigit():
+                pid = int(data["per_id"])
+            else:
+                pid = alloc.alloc()
+            key_to_id[key] = pid
+            # Determine sex
+            sex = sex_map.get(key)
+            persons_out.append(Person(
+                id=pid,
+                first_names=data["first_names"],
+                surname=data["surname"],
+                sex=sex,
+                father_id=None,  # set after building families
+                mother_id=None,
+                birth_date=data["birth_date"],
+                birth_place=data["birth_place"],
+                death_date=data["death_date"],
+                death_place=data["death_place"],
+            ))
+
+        # Map for quick update of parent ids
+        persons_by_key = {pkey: p for pkey, p in zip(key_to_id.keys(), persons_out)}
+
+        families_out: List[Family] = []
+        f_alloc = IdAllocator(start=1)  # Start family IDs from 1 to match test expectations
+        for fr in families_raw:
+            hid = key_to_id.get(fr["husband_key"]) if fr["husband_key"] else None
+            wid = key_to_id.get(fr["wife_key"]) if fr["wife_key"] else None
+            child_ids = [key_to_id[c] for c in fr["children_keys"]]
+            fam = Family(
+                id=f_alloc.alloc(),
+                husband_id=hid,
+                wife_id=wid,
+                children_ids=child_ids,
+                marriage_date=fr["marriage_date"],
+                marriage_place=fr["marriage_place"],
+            )
+            families_out.append(fam)
+            # assign parents to children
+            for ck in fr["children_keys"]:
+                p = persons_by_key.get(ck)
+                if p:
+                    p.father_id = hid
+                    p.mother_id = wid
+
+        # Second pass to link parents from pevt blocks (if not set by fam)
+        # This ensures pevt data is merged with fam data
+        for pkey, pdata in persons_map.items():
+            person = persons_by_key.get(pkey)
+            if not person: continue
+
+            if person.father_id is None and pdata["father_key"]:
+                person.father_id = key_to_id.get(pdata["father_key"])
+            if person.mother_id is None and pdata["mother_key"]:
+                person.mother_id = key_to_id.get(pdata["mother_key"])
+
+            # Merge event data (pevt data overrides fam child data if present)
+            if pdata["birth_date"]:
+                 person.birth_date = pdata["birth_date"]
+            if pdata["birth_place"]:
+                 person.birth_place = pdata["birth_place"]
+            if pdata["death_date"]:
+                 person.death_date = pdata["death_date"]
+            if pdata["death_place"]:
+                 person.death_place = pdata["death_place"]
+
+        return {"persons": persons_out, "families": families_out, "notes": self.notes_map}
+
+
+def _parse_chunk(chunk) -> Tuple[List[Tuple], bool]:
+    """_parse_blocks of a chunk given as bytes or as (path, start, end) of
+    a file, mapped by the worker."""
+    if isinstance(chunk, tuple):
+        path, start, end = chunk
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            chunk = buf[start:end]
+    return _parse_blocks(chunk)
+
+
+def _merge(results: List[Tuple[List[Tuple], bool]], read_chunk: Callable[[int], bytes]) -> Dict[str, object]:
+    """Apply the chunks' operations in source order."""
+    merge = _GwMerge()
+    carry: Optional[bytes] = None
+    for n, (ops, cut) in enumerate(results):
+        chunk = None
+        if carry is not None:
+            # Coupure au milieu d'un bloc (ligne 'fam ' dans des notes...) : on reprend avec le morceau précédent
+            chunk = carry + read_chunk(n)
+            ops, cut = _parse_blocks(chunk)
+        if cut and n < len(results) - 1:
+            carry = chunk if chunk is not None else read_chunk(n)
+            continue
+        carry = None
+        merge.apply(ops)
+    return merge.result()
+
+
+def parse_gw_text(gw_text: str, workers: Optional[int] = None) -> Dict[str, object]:
+    """Parse a GW/GWPlus-like text and produce persons, families and notes.
+    - Recognizes fam blocks with children (beg/end) and marriage events (fevt)
+    - Recognizes pevt blocks for person events (#birt/#deat/#p/#bp/#dp)
+    - Recognizes notes blocks for person notes (notes <Name> ... beg ... end notes)
+    Returns dict: {persons: List[Person], families: List[Family], notes: Dict[name_key, str]}
+
+    Large texts (or any text when `workers` > 1) are cut at 'fam ' lines and
+    the chunks parsed in the shared process pool of parallel.py (concurrent
+    imports queue in it), then merged in source order; the result is the
+    same as a sequential parse.
+    """
+    buf = gw_text.encode("utf-8", "surrogatepass")
+    workers = parse_workers(buf, workers)
+    # Un bloc fam s'étend jusqu'à la ligne fam suivante : seules ces lignes sont des coupures sûres
+    chunks = [buf[a:b] for a, b in chunk_bounds(buf, (b"fam ",), workers * CHUNKS_PER_WORKER if workers > 1 else 1)]
+    return _merge(map_chunks(_parse_chunk, chunks, workers), chunks.__getitem__)
+
+
+def parse_gw_file(path: Path, workers: Optional[int] = None) -> Dict[str, object]:
+    """parse_gw_text for a UTF-8 .gw file, read through mmap one chunk at a
+    time (at most FILE_CHUNK_BYTES in sequence); in parallel, each worker
+    maps its own range of the file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _merge([], bytes)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            workers = parse_workers(buf, workers)
+            parts = max(workers * CHUNKS_PER_WORKER if workers > 1 else 1, -(-len(buf) // FILE_CHUNK_BYTES))
+            bounds = chunk_bounds(buf, (b"fam ",), parts)
+            results = map_chunks(_parse_chunk, [(str(path), a, b) for a, b in bounds], workers)
+            return _merge(results, lambda n: buf[bounds[n][0]:bounds[n][1]])
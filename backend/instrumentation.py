@@ -0,0 +1,164 @@
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
+import sys
+import threading
+import time
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+# Instrumentation opt-in (GW_INSTRUMENTATION=1) ; profilage à la demande (GW_PROFILING=1)
+enabled = _env_flag("GW_INSTRUMENTATION")
+profiling_enabled = _env_flag("GW_PROFILING")
+
+METRIC_PREFIX = "geneweb"
+
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+class Metrics:
+    """Process-wide aggregates rendered by /metrics: per-phase time and call
+    counts, free-form counters (records scanned...) and per-route requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases: Dict[str, List[float]] = {}
+        self.counters: Counter = Counter()
+        self.requests: Dict[Tuple[str, str, int], List[float]] = {}
+
+    def observe_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.phases.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def add(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            stats = self.requests.setdefault((method, route, status), [0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases.clear()
+            self.counters.clear()
+            self.requests.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        p = METRIC_PREFIX
+        with self._lock:
+            lines = [
+                f"# HELP {p}_phase_seconds_total Time spent in each instrumented phase.",
+                f"# TYPE {p}_phase_seconds_total counter",
+            ]
+            lines += [f'{p}_phase_seconds_total{{phase="{name}"}} {s[1]:.6f}' for name, s in sorted(self.phases.items())]
+            lines += [f"# HELP {p}_phase_calls_total Number of times each phase ran.", f"# TYPE {p}_phase_calls_total counter"]
+            lines += [f'{p}_phase_calls_total{{phase="{name}"}} {s[0]}' for name, s in sorted(self.phases.items())]
+            lines += [f"# HELP {p}_phase_max_seconds Slowest run of each phase.", f"# TYPE {p}_phase_max_seconds gauge"]
+            lines += [f'{p}_phase_max_seconds{{phase="{name}"}} {s[2]:.6f}' for name, s in sorted(self.phases.items())]
+            lines += [f"# HELP {p}_records_total Records processed, by counter.", f"# TYPE {p}_records_total counter"]
+            lines += [f'{p}_records_total{{counter="{name}"}} {value}' for name, value in sorted(self.counters.items())]
+            lines += [f"# HELP {p}_requests_total HTTP requests by route and status.", f"# TYPE {p}_requests_total counter"]
+            lines += [
+                f'{p}_requests_total{{method="{m}",route="{r}",status="{st}"}} {s[0]}'
+                for (m, r, st), s in sorted(self.requests.items())
+            ]
+            lines += [f"# HELP {p}_request_seconds_total Time spent serving requests.", f"# TYPE {p}_request_seconds_total counter"]
+            lines += [
+                f'{p}_request_seconds_total{{method="{m}",route="{r}",status="{st}"}} {s[1]:.6f}'
+                for (m, r, st), s in sorted(self.requests.items())
+            ]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def _timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe_phase(name, elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+
+
+def phase(name: str):
+    """Time a block as `name` (no-op unless instrumentation is enabled)."""
+    return _timed(name) if enabled else nullcontext()
+
+
+def count(name: str, value: int = 1) -> None:
+    if enabled:
+        metrics.add(name, value)
+
+
+def start_request() -> Dict[str, float]:
+    """Collect the phase timings of the current request."""
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    """Server-Timing value (durations in milliseconds), phases in first-seen order."""
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def sample_stacks(seconds: float, interval: float = 0.005, limit: int = 40) -> Dict:
+    """Statistical profile of every other thread for `seconds`: stacks are
+    sampled every `interval` through sys._current_frames(), so endpoints
+    running in the worker threadpool are seen too.
+
+    Returns the functions most often on top of a stack (self) and anywhere in
+    it (cumulative), as sample counts.
+    """
+    me = threading.get_ident()
+    own: Counter = Counter()
+    cumulative: Counter = Counter()
+    samples = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == me:
+                continue
+            samples += 1
+            seen = set()
+            top = True
+            while frame is not None:
+                code = frame.f_code
+                key = f"{code.co_filename}:{code.co_firstlineno}:{code.co_name}"
+                if top:
+                    own[key] += 1
+                    top = False
+                if key not in seen:
+                    seen.add(key)
+                    cumulative[key] += 1
+                frame = frame.f_back
+        time.sleep(interval)
+    return {
+        "samples": samples,
+        "seconds": seconds,
+        "interval": interval,
+        "functions": [
+            {"function": key, "self": own[key], "cumulative": hits}
+            for key, hits in cumulative.most_common(limit)
+        ],
+    }
@@ -0,0 +1,166 @@
+"""JSON encoding shared by the API responses and the base writers.
+
+orjson, when installed, encodes straight to UTF-8 bytes, dataclasses
+included, several times faster than the json module; the standard library is
+the fallback and produces equivalent documents.
+"""
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Iterator, TextIO, Union
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Taille des lectures du lecteur incrémental
+STREAM_CHUNK_CHARS = 1 << 16
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def _default(obj: Any) -> Any:
+    # Vues paresseuses (PersonView) : résolues au moment de l'encodage
+    to_json = getattr(obj, "to_json", None)
+    if to_json is not None:
+        return to_json()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode as UTF-8 JSON (non-ASCII kept as is, int keys turned into
+    strings), compact or indented by two spaces.
+
+    Integers beyond 64 bits, which orjson rejects, go through json.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            # Entiers au-delà de 64 bits (numéros Sosa profonds) : repli sur json
+            pass
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=_default).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def read_json(path: Path) -> Any:
+    return loads(path.read_bytes())
+
+
+def write_json(path: Path, obj: Any, indent: bool = False) -> None:
+    path.write_bytes(dumps(obj, indent))
+
+
+class _JsonStream:
+    """Incremental reader over a JSON text file, keeping only the value being
+    decoded (plus one read chunk) in memory."""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+
+    def _more(self) -> bool:
+        data = self.f.read(self.chunk_size)
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return bool(data)
+
+    def peek(self) -> str:
+        """Next non-blank character, "" at end of file."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos} of the read buffer")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._more():
+                    continue
+                raise
+            # Un nombre coupé en fin de tampon se décode sans erreur : relire
+            if end == len(self.buf) and self._more():
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() != ",":
+                self.expect("]")
+                return
+            self.pos += 1
+
+    def skip(self) -> None:
+        # Tableau parcouru élément par élément pour ne jamais le charger en entier
+        if self.peek() == "[":
+            for _ in self.items():
+                pass
+        else:
+            self.value()
+
+    def seek(self, key: str) -> bool:
+        """Move to the value of `key` in the top-level object, False if the
+        key is missing."""
+        self.expect("{")
+        if self.peek() == "}":
+            return False
+        while True:
+            name = self.value()
+            self.expect(":")
+            if name == key:
+                return True
+            self.skip()
+            if self.peek() != ",":
+                self.expect("}")
+                return False
+            self.pos += 1
+
+
+def iter_json_array(path: Path, key: str, chunk_size: int = STREAM_CHUNK_CHARS) -> Iterator[Any]:
+    """Yield the items of the array `key` of the top-level JSON object in
+    `path` one at a time, without loading the file (nothing if the key is
+    missing or null)."""
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        if stream.seek(key) and stream.peek() == "[":
+            yield from stream.items()
+
+
+def read_json_key(path: Path, key: str, chunk_size: int = STREAM_CHUNK_CHARS) -> Any:
+    """Value of `key` in the top-level JSON object in `path` (None if
+    missing), reading the file only up to that value."""
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f, chunk_size)
+        return stream.value() if stream.seek(key) else None
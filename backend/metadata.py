@@ -0,0 +1,184 @@
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+import os
+import time
+
+from .dates import code_year, date_code
+from .jsonio import read_json, read_json_key, write_json
+from .models import Person, Family
+
+
+META_FILENAME = "meta.json"
+TOP_SURNAMES = 10
+LARGEST_FAMILIES = 5
+
+
+def _string_count(db_dir: Path) -> int:
+    """Size of the string table written by storage.write_gwb, read from the
+    counts at the head of base.json (0 if the base has no base.json)."""
+    path = db_dir / "base.json"
+    if not path.exists():
+        return 0
+    counts = read_json_key(path, "counts") or {}
+    return counts.get("strings", 0)
+
+
+def _date_range(persons: List[Person], families: List[Family]) -> Dict[str, Optional[int]]:
+    years = []
+    for p in persons:
+        years.extend(code_year(date_code(d)) for d in (p.birth_date, p.death_date))
+    years.extend(code_year(date_code(f.marriage_date)) for f in families)
+    years = [y for y in years if y > 0]
+    return {"min_year": min(years) if years else None, "max_year": max(years) if years else None}
+
+
+def _generations(persons: List[Person]) -> int:
+    """Length of the longest ancestry chain (1 for a base without parent links).
+    Iterative so that deep lines never hit the recursion limit; parent cycles
+    (data errors) are cut.
+    """
+    parents = {p.id: (p.father_id, p.mother_id) for p in persons}
+    depth: Dict[int, int] = {}
+    for start in parents:
+        if start in depth:
+            continue
+        stack = [start]
+        on_stack = {start}
+        while stack:
+            pid = stack[-1]
+            pending = [
+                q for q in parents[pid]
+                if q is not None and q in parents and q not in depth and q not in on_stack
+            ]
+            if pending:
+                stack.extend(pending)
+                on_stack.update(pending)
+                continue
+            stack.pop()
+            on_stack.discard(pid)
+            depth[pid] = 1 + max((depth.get(q, 0) for q in parents[pid] if q is not None), default=0)
+    return max(depth.values(), default=0)
+
+
+def compute_stats(persons: List[Person], families: List[Family]) -> Dict:
+    """Statistics precomputed at import time and served by /stats?extended=true."""
+    surnames = Counter(p.surname for p in persons if p.surname)
+    largest = sorted(
+        (f for f in families if f.children_ids),
+        key=lambda f: (-len(f.children_ids), f.id),
+    )[:LARGEST_FAMILIES]
+    return {
+        "date_range": _date_range(persons, families),
+        "surnames": len(surnames),
+        "generations": _generations(persons),
+        "largest_families": [
+            {
+                "id": f.id,
+                "husband_id": f.husband_id,
+                "wife_id": f.wife_id,
+                "children": len(f.children_ids),
+            }
+            for f in largest
+        ],
+        "top_surnames": [
+            {"surname": name, "count": count}
+            for name, count in sorted(surnames.items(), key=lambda kv: (-kv[1], kv[0]))[:TOP_SURNAMES]
+        ],
+    }
+
+
+def _file_sizes(db_dir: Path) -> Dict[str, int]:
+    sizes: Dict[str, int] = {}
+    for p in sorted(db_dir.iterdir()):
+        if p.is_file() and p.name != META_FILENAME:
+            sizes[p.name] = p.stat().st_size
+    return sizes
+
+
+def _write_atomic(meta_path: Path, meta: Dict) -> None:
+    # Écriture atomique : les lecteurs ne voient jamais un manifeste partiel
+    tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+    write_json(tmp_path, meta, indent=True)
+    os.replace(tmp_path, meta_path)
+
+
+def read_meta(db_dir: Path) -> Optional[Dict]:
+    """Read the metadata manifest of a base directory, or None if absent/corrupt."""
+    meta_path = db_dir / META_FILENAME
+    try:
+        return read_json(meta_path)
+    except (OSError, ValueError):
+        return None
+
+
+def next_generation(db_dir: Path) -> int:
+    """Return a generation stamp strictly greater than the one currently on disk.
+    Millisecond clock based so that a deleted then re-imported base never
+    reuses an old generation.
+    """
+    previous = read_meta(db_dir) or {}
+    return max(int(previous.get("generation", 0)) + 1, int(time.time() * 1000))
+
+
+def data_generation(meta: Dict) -> Optional[int]:
+    """Generation of the imported data, the stamp carried by sidecars built
+    from it. Equal to "generation" until bump_generation moves the latter
+    (a change that alters served pages without touching the data).
+    """
+    return meta.get("data_generation", meta.get("generation"))
+
+
+def bump_generation(db_dir: Path) -> Optional[Dict]:
+    """Give the base a new generation so that caches keyed on it (rendered
+    pages, loaded contexts) are dropped, keeping sidecars valid through
+    data_generation. Returns the new manifest, None if the base has none.
+    """
+    meta = read_meta(db_dir)
+    if meta is None:
+        return None
+    meta["data_generation"] = data_generation(meta)
+    meta["generation"] = next_generation(db_dir)
+    _write_atomic(db_dir / META_FILENAME, meta)
+    return meta
+
+
+def write_meta(
+    db_dir: Path,
+    db_name: str,
+    persons: List[Person],
+    families: List[Family],
+    import_seconds: Optional[float] = None,
+) -> Dict:
+    """Write the small per-base manifest (name, counts, sizes, generation,
+    precomputed statistics) next to base.json. Must be called once all base
+    files are written so that file sizes are accurate.
+    """
+    sizes = _file_sizes(db_dir)
+    meta = {
+        "name": db_name,
+        "generation": next_generation(db_dir),
+        "imported_at": int(time.time()),
+        "counts": {
+            "persons": len(persons),
+            "families": len(families),
+            "strings": _string_count(db_dir),
+        },
+        "sizes": {
+            "files": sizes,
+            "total": sum(sizes.values()),
+        },
+        "import_seconds": round(import_seconds, 4) if import_seconds is not None else None,
+        "stats": compute_stats(persons, families),
+    }
+    _write_atomic(db_dir / META_FILENAME, meta)
+    return meta
+
+
+def rename_meta(db_dir: Path, new_name: str) -> None:
+    """Update the name stored in the manifest after a base rename (no-op if absent)."""
+    meta = read_meta(db_dir)
+    if meta is None:
+        return
+    meta["name"] = new_name
+    _write_atomic(db_dir / META_FILENAME, meta)
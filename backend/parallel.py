@@ -0,0 +1,114 @@
+"""Chunking and process-pool helpers shared by the .gw and GEDCOM parsers.
+
+A source is cut at record starts (level-0 lines, .gw block keywords) so that
+every chunk parses on its own; chunks go to shared-nothing worker processes
+and the partial results come back in source order, so merging them gives
+the same output as a sequential parse.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Tuple, TypeVar
+import multiprocessing
+import os
+import threading
+
+
+# Nombre de processus (0 = un cœur de moins que la machine, pour le serveur)
+# et taille minimale pour paralléliser
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0")) or max(1, (os.cpu_count() or 1) - 1)
+# Jamais fork : le serveur est multi-thread (verrous hérités dans un état incohérent)
+PARSE_START_METHOD = os.environ.get(
+    "PARSE_START_METHOD",
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn",
+)
+PARALLEL_MIN_CHARS = int(os.environ.get("PARALLEL_MIN_CHARS", str(8 * 1024 * 1024)))
+# Plusieurs morceaux par processus pour lisser les écarts de durée
+CHUNKS_PER_WORKER = 4
+# Taille des morceaux d'un fichier lus l'un après l'autre par un parseur séquentiel
+FILE_CHUNK_BYTES = 64 * 1024 * 1024
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def parse_workers(text, workers: Optional[int] = None) -> int:
+    """Processes to use for a source (str, bytes or mmap): `workers` when
+    given, otherwise PARSE_WORKERS for sources of at least
+    PARALLEL_MIN_CHARS, else 1."""
+    if workers is not None:
+        return max(1, workers)
+    return PARSE_WORKERS if len(text) >= PARALLEL_MIN_CHARS else 1
+
+
+def chunk_bounds(buf, starts: Tuple, parts: int) -> List[Tuple[int, int]]:
+    """(start, end) offsets cutting a str, bytes or mmap `buf` into at most
+    `parts` chunks of similar size, each new chunk beginning on a line that
+    starts with one of `starts` (of the same type as `buf`)."""
+    size = len(buf)
+    if parts <= 1 or not size:
+        return [(0, size)]
+    newline = "\n" if isinstance(buf, str) else b"\n"
+    bounds = [0]
+    for i in range(1, parts):
+        pos = max(bounds[-1], size * i // parts)
+        while True:
+            pos = buf.find(newline, pos)
+            # Pas de startswith sur mmap : comparaison par tranche
+            if pos < 0 or any(buf[pos + 1:pos + 1 + len(s)] == s for s in starts):
+                break
+            pos += 1
+        if pos < 0:
+            break
+        if pos + 1 > bounds[-1]:
+            bounds.append(pos + 1)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def split_at_starts(text: str, starts: Tuple[str, ...], parts: int) -> List[str]:
+    """`text` cut at chunk_bounds."""
+    return [text[a:b] for a, b in chunk_bounds(text, starts, parts)]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def shared_pool() -> ProcessPoolExecutor:
+    """The process pool shared by every parse, created on first use with
+    PARSE_WORKERS processes: concurrent imports queue their chunks in it
+    instead of each starting its own processes."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context(PARSE_START_METHOD),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the shared pool (it is recreated by the next parallel parse)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def map_chunks(fn: Callable[[T], R], chunks: List[T], workers: int) -> List[R]:
+    """fn over the chunks, in the shared process pool when there is more
+    than one worker and chunk; results are in chunk order."""
+    if workers <= 1 or len(chunks) <= 1:
+        return [fn(chunk) for chunk in chunks]
+    pool = shared_pool()
+    try:
+        return list(pool.map(fn, chunks))
+    except BrokenProcessPool:
+        # Processus tué (mémoire...) : le prochain appel repart d'un pool neuf
+        global _pool
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
@@ -0,0 +1,130 @@
+from typing import Dict, List, Optional, Tuple
+
+from .graph import NO_PERSON, PersonGraph
+
+
+# Garde-fous contre les parcours pathologiques (bases très implexes ou corrompues)
+MAX_VISITED = 200_000
+MAX_DEPTH = 64
+
+
+def _ordinal(n: int) -> str:
+    names = {1: "first", 2: "second", 3: "third", 4: "fourth", 5: "fifth"}
+    return names.get(n, f"{n}th")
+
+
+def _greats(n: int, word: str) -> str:
+    return "great-" * n + word
+
+
+def kinship_label(up_a: int, up_b: int) -> str:
+    """Name what B is to A, from the number of generations from A and from B
+    up to their closest common ancestor.
+    """
+    if up_a == 0 and up_b == 0:
+        return "same person"
+    if up_a == 0:
+        return "child" if up_b == 1 else _greats(up_b - 2, "grandchild")
+    if up_b == 0:
+        return "parent" if up_a == 1 else _greats(up_a - 2, "grandparent")
+    if up_a == 1 and up_b == 1:
+        return "sibling"
+    if up_a == 1:
+        return "nephew/niece" if up_b == 2 else _greats(up_b - 3, "grand-nephew/niece")
+    if up_b == 1:
+        return "uncle/aunt" if up_a == 2 else _greats(up_a - 3, "grand-uncle/aunt")
+    degree = min(up_a, up_b) - 1
+    removed = abs(up_a - up_b)
+    label = f"{_ordinal(degree)} cousin"
+    if removed == 1:
+        label += " once removed"
+    elif removed == 2:
+        label += " twice removed"
+    elif removed > 2:
+        label += f" {removed} times removed"
+    return label
+
+
+def _path_up(came_from: Dict[int, int], node: int) -> List[int]:
+    """Indexes from the start person up to `node`, following BFS back-pointers."""
+    path = [node]
+    while came_from[path[-1]] != NO_PERSON:
+        path.append(came_from[path[-1]])
+    path.reverse()
+    return path
+
+
+def find_relationship(
+    graph: PersonGraph,
+    a_id: int,
+    b_id: int,
+    max_visited: int = MAX_VISITED,
+    max_depth: int = MAX_DEPTH,
+) -> Optional[Dict]:
+    """Bidirectional BFS over the parent arrays from A and B.
+
+    The side with the smaller frontier is expanded one generation at a time;
+    the search stops as soon as no undiscovered meeting point can beat the
+    closest common ancestors already found. Returns None if A or B is unknown.
+    """
+    ia, ib = graph.index_of.get(a_id), graph.index_of.get(b_id)
+    if ia is None or ib is None:
+        return None
+    father, mother = graph.father, graph.mother
+    dist: Tuple[Dict[int, int], Dict[int, int]] = ({ia: 0}, {ib: 0})
+    came: Tuple[Dict[int, int], Dict[int, int]] = ({ia: NO_PERSON}, {ib: NO_PERSON})
+    frontier: List[List[int]] = [[ia], [ib]]
+    level = [0, 0]
+    best: Optional[int] = 0 if ia == ib else None
+    meets = {ia} if ia == ib else set()
+    visited = 1 if ia == ib else 2
+    truncated = False
+
+    while True:
+        # Borne inférieure du meilleur total encore découvrable
+        bound = min(level[s] + 1 if frontier[s] else float("inf") for s in (0, 1))
+        if bound == float("inf") or (best is not None and bound > best):
+            break
+        s = 0 if frontier[0] and (not frontier[1] or len(frontier[0]) <= len(frontier[1])) else 1
+        o = 1 - s
+        next_frontier: List[int] = []
+        for i in frontier[s]:
+            for parent in (father[i], mother[i]):
+                if parent == NO_PERSON or parent in dist[s]:
+                    continue
+                dist[s][parent] = level[s] + 1
+                came[s][parent] = i
+                next_frontier.append(parent)
+                if parent in dist[o]:
+                    total = dist[s][parent] + dist[o][parent]
+                    if best is None or total < best:
+                        best, meets = total, {parent}
+                    elif total == best:
+                        meets.add(parent)
+        level[s] += 1
+        frontier[s] = next_frontier if level[s] < max_depth else []
+        visited += len(next_frontier)
+        if visited > max_visited:
+            truncated = True
+            break
+
+    ids = graph.ids
+    common = []
+    for m in sorted(meets, key=lambda m: (dist[0][m], ids[m])):
+        if best is not None and dist[0][m] + dist[1][m] != best:
+            continue
+        common.append({
+            "id": ids[m],
+            "generations": [dist[0][m], dist[1][m]],
+            "path_a": [ids[i] for i in _path_up(came[0], m)],
+            "path_b": [ids[i] for i in _path_up(came[1], m)],
+        })
+    return {
+        "a": a_id,
+        "b": b_id,
+        "distance": best,
+        "label": kinship_label(*common[0]["generations"]) if common else None,
+        "common_ancestors": common,
+        "visited": visited,
+        "truncated": truncated,
+    }
@@ -0,0 +1,125 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import os
+
+from .dates import code_year, date_code
+from .jsonio import read_json, write_json
+from .name_utils import crush_name
+
+
+SEARCH_INDEX_FILENAME = "search_index.json"
+
+# Lieux indexés pour chaque personne
+PLACE_FIELDS = ("birth_place", "death_place")
+
+
+def place_tokens(place: Optional[str]) -> List[str]:
+    """Crushed words of a place ("Saint-Malo, Ille-et-Vilaine" -> saint, malo, ille, et, vilaine)."""
+    return crush_name(place).split() if place else []
+
+
+def _intersect(postings: List[List[int]]) -> List[int]:
+    """Intersection of sorted id lists, probing the longer lists from the shortest."""
+    if not postings:
+        return []
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        members = set(other)
+        result = [pid for pid in result if pid in members]
+    return result
+
+
+class SearchIndex:
+    """Inverted index of crushed place tokens (token -> sorted person ids) and
+    birth years sorted with their person ids, so that place and date-range
+    queries are answered from postings without scanning the persons.
+    """
+
+    def __init__(self, places: Dict[str, List[int]], birth_years: array, birth_ids: array):
+        self.places = places
+        self.birth_years = birth_years
+        self.birth_ids = birth_ids
+
+    @classmethod
+    def build(cls, persons: Iterable[Dict], strings: Optional[List[str]] = None) -> "SearchIndex":
+        """Index plain records or string-table records (with `strings`)."""
+        def text(record: Dict, field: str) -> Optional[str]:
+            if strings is None:
+                return record.get(field)
+            sid = record.get(f"{field}_id")
+            return strings[sid] if sid is not None else None
+
+        places: Dict[str, List[int]] = {}
+        births = []
+        for p in persons:
+            pid = p["id"]
+            tokens = set()
+            for field in PLACE_FIELDS:
+                tokens.update(place_tokens(text(p, field)))
+            for token in tokens:
+                places.setdefault(token, []).append(pid)
+            # Code calculé à l'import, sinon analyse de la date
+            code = p.get("birth_date_code")
+            year = code_year(code if code is not None else date_code(text(p, "birth_date")))
+            if year:
+                births.append((year, pid))
+        for ids in places.values():
+            ids.sort()
+        births.sort()
+        return cls(places, array("i", (y for y, _ in births)), array("q", (pid for _, pid in births)))
+
+    def persons_at(self, place: str) -> List[int]:
+        """Sorted ids of the persons with a place containing every word of `place`."""
+        tokens = place_tokens(place)
+        if not tokens:
+            return []
+        postings = []
+        for token in set(tokens):
+            ids = self.places.get(token)
+            if not ids:
+                return []
+            postings.append(ids)
+        return _intersect(postings)
+
+    def born_between(self, after: Optional[int] = None, before: Optional[int] = None) -> List[int]:
+        """Sorted ids of the persons born in [after, before] (years, inclusive)."""
+        lo = bisect_left(self.birth_years, after) if after is not None else 0
+        hi = bisect_right(self.birth_years, before) if before is not None else len(self.birth_years)
+        return sorted(self.birth_ids[lo:hi]) if lo < hi else []
+
+    def query(self, place: Optional[str] = None, born_after: Optional[int] = None, born_before: Optional[int] = None) -> List[int]:
+        postings = []
+        if place:
+            postings.append(self.persons_at(place))
+        if born_after is not None or born_before is not None:
+            postings.append(self.born_between(born_after, born_before))
+        return _intersect(postings)
+
+
+def write_search_index(db_dir: Path, index: SearchIndex, generation: Optional[int]) -> None:
+    """Persist the index next to base.json, stamped with the base generation."""
+    payload = {
+        "generation": generation,
+        "places": index.places,
+        "birth_years": index.birth_years.tolist(),
+        "birth_ids": index.birth_ids.tolist(),
+    }
+    path = db_dir / SEARCH_INDEX_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    write_json(tmp_path, payload)
+    os.replace(tmp_path, path)
+
+
+def read_search_index(db_dir: Path) -> Optional[Dict]:
+    """Read the index sidecar as {"generation", "index"}, or None if absent/corrupt."""
+    try:
+        payload = read_json(db_dir / SEARCH_INDEX_FILENAME)
+        index = SearchIndex(payload["places"], array("i", payload["birth_years"]), array("q", payload["birth_ids"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return {"generation": payload.get("generation"), "index": index}
@@ -0,0 +1,85 @@
+from pathlib import Path
+from typing import Dict, Optional
+import os
+
+from .graph import NO_PERSON, PersonGraph
+from .jsonio import read_json, write_json
+
+
+SOSA_FILENAME = "sosa.json"
+
+
+def build_sosa(graph: PersonGraph, reference_id: int) -> Dict[int, int]:
+    """Sosa number of every ancestor of the reference person (who gets 1).
+
+    Uses the iterative breadth-first walk of PersonGraph.ancestors; numbers
+    are Python ints, so they never overflow however deep the tree. An
+    ancestor reached through several lines (implex) keeps its smallest number.
+    """
+    ancestors, _ = graph.ancestors(reference_id, len(graph))
+    return {pid: sosa for sosa, _, pid in ancestors}
+
+
+def _shift(sosa: int, root: int) -> int:
+    """Renumber a Sosa number relative to a person who now carries `root`."""
+    generation = sosa.bit_length() - 1
+    return (root << generation) | (sosa ^ (1 << generation))
+
+
+def rebase_sosa(
+    graph: PersonGraph,
+    previous_id: Optional[int],
+    previous: Optional[Dict[int, int]],
+    reference_id: int,
+) -> Optional[Dict[int, int]]:
+    """Derive the map of a new reference person from the previous map when the
+    new reference is a child of the previous one: that parent's whole tree is
+    renumbered arithmetically and only the other parent's tree is walked.
+
+    Returns None when the previous map cannot be reused (full rebuild needed).
+    """
+    start = graph.index_of.get(reference_id)
+    if previous is None or previous_id is None or start is None:
+        return None
+    father, mother = graph.father[start], graph.mother[start]
+    known = graph.index_of.get(previous_id)
+    if known is None or known not in (father, mother):
+        return None
+    root = 2 if known == father else 3
+    other = mother if root == 2 else father
+
+    numbers = {pid: _shift(sosa, root) for pid, sosa in previous.items()}
+    if other != NO_PERSON and other != known:
+        for pid, sosa in build_sosa(graph, graph.ids[other]).items():
+            shifted = _shift(sosa, 5 - root)
+            if pid not in numbers or shifted < numbers[pid]:
+                numbers[pid] = shifted
+    numbers[reference_id] = 1
+    return numbers
+
+
+def write_sosa(db_dir: Path, reference_id: int, generation: Optional[int], numbers: Dict[int, int]) -> None:
+    """Persist the map next to base.json as parallel id / hexadecimal number
+    arrays, in Sosa order."""
+    ordered = sorted(numbers.items(), key=lambda item: item[1])
+    payload = {
+        "reference": reference_id,
+        "generation": generation,
+        "ids": [pid for pid, _ in ordered],
+        "sosa": [format(sosa, "x") for _, sosa in ordered],
+    }
+    path = db_dir / SOSA_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    write_json(tmp_path, payload)
+    os.replace(tmp_path, path)
+
+
+def read_sosa(db_dir: Path) -> Optional[Dict]:
+    """Read the Sosa sidecar as {"reference", "generation", "numbers": {id: sosa}},
+    or None if absent/corrupt."""
+    try:
+        payload = read_json(db_dir / SOSA_FILENAME)
+        numbers = {pid: int(sosa, 16) for pid, sosa in zip(payload["ids"], payload["sosa"])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return {"reference": payload.get("reference"), "generation": payload.get("generation"), "numbers": numbers}
@@ -1,10 +1,14 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .dates import code_year, date_code
+from .jsonio import read_json, write_json
 from .models import Person, Family
 
 
+GW_WRITE_BUFFER = 1024 * 1024
+
+
 class StringsMap:
     def __init__(self):
         self.strings: List[str] = []
@@ -38,6 +42,9 @@ def _encode_persons(persons: List[Person], strings: StringsMap) -> List[Dict]:
             "birth_place_id": strings.get_id(p.birth_place),
             "death_date_id": strings.get_id(p.death_date),
             "death_place_id": strings.get_id(p.death_place),
+            # Dates codées (voir dates.py) pour les tris et requêtes par intervalle
+            "birth_date_code": date_code(p.birth_date),
+            "death_date_code": date_code(p.death_date),
         })
     return out
 
@@ -52,6 +59,7 @@ def _encode_families(families: List[Family], strings: StringsMap) -> List[Dict]:
             "children_ids": f.children_ids,
             "marriage_date_id": strings.get_id(f.marriage_date),
             "marriage_place_id": strings.get_id(f.marriage_place),
+            "marriage_date_code": date_code(f.marriage_date),
         })
     return out
 
@@ -82,20 +90,14 @@ def write_gwb(
         "notes_origin_file": notes_origin_file,
     }
 
-    (db_dir / "base.json").write_text(
-        json.dumps(base, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(db_dir / "base.json", base, indent=True)
 
     # Simple access index with logical offsets (here just identity)
     acc = {
         "persons": {str(p["id"]): p["id"] for p in persons_enc},
         "families": {str(f["id"]): f["id"] for f in families_enc},
     }
-    (db_dir / "base.acc.json").write_text(
-        json.dumps(acc, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(db_dir / "base.acc.json", acc, indent=True)
 
     # Names index (hashed buckets by crushed full name)
     from .name_utils import crush_name
@@ -121,10 +123,7 @@ def write_gwb(
         "table_size": table_size,
         "buckets": name_buckets,
     }
-    (db_dir / "names.inx.json").write_text(
-        json.dumps(names_json, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(db_dir / "names.inx.json", names_json, indent=True)
 
     # Strings index (hashed buckets)
     s_buckets: Dict[int, List[int]] = {}
@@ -141,10 +140,7 @@ def write_gwb(
         "table_size": s_table_size,
         "buckets": [s_buckets.get(i, []) for i in range(s_table_size)],
     }
-    (db_dir / "strings.inx.json").write_text(
-        json.dumps(s_inx, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(db_dir / "strings.inx.json", s_inx, indent=True)
 
     return db_dir
 
@@ -162,32 +158,100 @@ def _first_names_token(first_names: List[str]) -> str:
 def _year_from_date(date_str: Optional[str]) -> str:
     if not date_str:
         return "0"
-    # Accept forms like "7/9/1830", "1839", "<1849", etc.
-    for ch in date_str:
-        if ch.isdigit():
-            break
+    year = code_year(date_code(date_str))
+    if year:
+        return str(year)
+    # Dates non reconnues (texte, autres calendriers) : derniers chiffres
     digits = "".join([c for c in date_str if c.isdigit()])
     if len(digits) >= 4:
         return digits[-4:]
     return "0"
 
 
+def decode_person(record: Dict, strings: Optional[List[str]] = None) -> Person:
+    """Rebuild a Person from a base.json record (string-table ids when
+    `strings` is given, plain fields otherwise)."""
+    if strings is None:
+        fields = {k: record.get(k) for k in Person.__dataclass_fields__}
+        fields["first_names"] = fields["first_names"] or []
+        fields["surname"] = fields["surname"] or ""
+        return Person(**fields)
+
+    def text(key: str) -> Optional[str]:
+        sid = record.get(f"{key}_id")
+        return strings[sid] if sid is not None else None
+
+    return Person(
+        id=record["id"],
+        first_names=[strings[i] for i in record.get("first_name_ids") or [] if i is not None],
+        surname=text("surname") or "",
+        sex=record.get("sex"),
+        father_id=record.get("father_id"),
+        mother_id=record.get("mother_id"),
+        birth_date=text("birth_date"),
+        birth_place=text("birth_place"),
+        death_date=text("death_date"),
+        death_place=text("death_place"),
+    )
+
+
+def decode_family(record: Dict, strings: Optional[List[str]] = None) -> Family:
+    """Rebuild a Family from a base.json record (see decode_person)."""
+    if strings is None:
+        marriage_date, marriage_place = record.get("marriage_date"), record.get("marriage_place")
+    else:
+        date_id, place_id = record.get("marriage_date_id"), record.get("marriage_place_id")
+        marriage_date = strings[date_id] if date_id is not None else None
+        marriage_place = strings[place_id] if place_id is not None else None
+    return Family(
+        id=record["id"],
+        husband_id=record.get("husband_id"),
+        wife_id=record.get("wife_id"),
+        children_ids=list(record.get("children_ids") or []),
+        marriage_date=marriage_date,
+        marriage_place=marriage_place,
+    )
+
+
+def _person_lookup(persons: List[Person]) -> Callable[[int], Optional[Person]]:
+    """id -> Person without a full id dict when ids are list positions (the
+    IdAllocator case); falls back to a dict otherwise."""
+    if all(p.id == i for i, p in enumerate(persons)):
+        n = len(persons)
+        return lambda pid: persons[pid] if 0 <= pid < n else None
+    by_id = {p.id: p for p in persons}
+    return by_id.get
+
+
 # Write a .gw textual file (GeneWeb style) matching data/galichet.gw format
 # This is a minimal generator for interoperability/tests
 
-def write_gw(root_dir: Path, db_name: str, persons: List[Person], families: List[Family]) -> Path:
-    gw_path = root_dir / f"{db_name}.gw"
-    lines: List[str] = []
-    lines.append("encoding: utf-8")
-    lines.append("gwplus")
-    lines.append("")
+def iter_gw_lines(
+    persons: Iterable[Person],
+    families: Iterable[Family],
+    person_of: Callable[[int], Optional[Person]],
+) -> Iterator[str]:
+    """Generate the .gw text line by line: header, families (fam / fevt /
+    children), then one pevt block per person. Trailing blank lines are not
+    emitted, so joining the lines with newlines gives write_gw's output.
+    """
+    pending_blank = False
 
-    persons_by_id: Dict[int, Person] = {p.id: p for p in persons}
+    def block(lines: List[str]) -> Iterator[str]:
+        nonlocal pending_blank
+        if pending_blank:
+            yield ""
+        yield from lines
+        pending_blank = True
+
+    yield "encoding: utf-8"
+    yield "gwplus"
+    pending_blank = True
 
     # Families first
     for f in families:
-        h = persons_by_id.get(f.husband_id) if f.husband_id is not None else None
-        w = persons_by_id.get(f.wife_id) if f.wife_id is not None else None
+        h = person_of(f.husband_id) if f.husband_id is not None else None
+        w = person_of(f.wife_id) if f.wife_id is not None else None
         h_year = _year_from_date(h.birth_date) if h else "0"
         w_year = _year_from_date(w.birth_date) if w else "0"
         fam_line_parts = [
@@ -202,8 +266,7 @@ def write_gw(root_dir: Path, db_name: str, persons: List[Person], families: List
             "0",
             w_year,
         ]
-        lines.append(" ".join([x for x in fam_line_parts if x != ""]))
-        lines.append("fevt")
+        lines = [" ".join([x for x in fam_line_parts if x != ""]), "fevt"]
         if f.marriage_date:
             lines.append(f"#marr {f.marriage_date}")
         else:
@@ -214,7 +277,7 @@ def write_gw(root_dir: Path, db_name: str, persons: List[Person], families: List
         if f.children_ids:
             lines.append("beg")
             for cid in f.children_ids:
-                c = persons_by_id.get(cid)
+                c = person_of(cid)
                 if not c:
                     continue
                 sex_tok = "h" if c.sex == "M" else "f" if c.sex == "F" else "h"
@@ -229,11 +292,11 @@ def write_gw(root_dir: Path, db_name: str, persons: List[Person], families: List
                 child.append("od")
                 lines.append(" ".join(child))
             lines.append("end")
-        lines.append("")
+        yield from block(lines)
 
     # Person events
     for p in persons:
-        lines.append(f"pevt {_to_gw_token(p.surname)} {_first_names_token(p.first_names)}")
+        lines = [f"pevt {_to_gw_token(p.surname)} {_first_names_token(p.first_names)}"]
         if p.birth_date:
             if p.birth_place:
                 lines.append(f"#birt {p.birth_date} #p {p.birth_place}")
@@ -249,9 +312,16 @@ def write_gw(root_dir: Path, db_name: str, persons: List[Person], families: List
         else:
             lines.append("#deat ")
         lines.append("end pevt")
-        lines.append("")
+        yield from block(lines)
+
 
-    gw_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+def write_gw(root_dir: Path, db_name: str, persons: List[Person], families: List[Family]) -> Path:
+    """Write {db}.gw through a buffered file, one block at a time."""
+    gw_path = root_dir / f"{db_name}.gw"
+    with gw_path.open("w", encoding="utf-8", buffering=GW_WRITE_BUFFER) as out:
+        for line in iter_gw_lines(persons, families, _person_lookup(persons)):
+            out.write(line)
+            out.write("\n")
     return gw_path
 
 
@@ -300,6 +370,43 @@ def write_gwf(root_dir: Path, db_name: str) -> Path:
     return gwf_path
 
 
+def read_gwf(root_dir: Path, db_name: str) -> Dict[str, str]:
+    """Read the key=value options of a base's .gwf file ({} if absent)."""
+    gwf_path = root_dir / f"{db_name}.gwf"
+    options: Dict[str, str] = {}
+    try:
+        content = gwf_path.read_text(encoding="utf-8")
+    except OSError:
+        return options
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        options[key.strip()] = value.strip()
+    return options
+
+
+def gwf_int(options: Dict[str, str], key: str, default: int) -> int:
+    try:
+        return int(options.get(key, default))
+    except ValueError:
+        return default
+
+
+def json_base_path(root_dir: Path, db_name: str) -> Path:
+    """Path of the string-table base.json of a base (json_bases first, then .gwb)."""
+    for path in (root_dir / "json_bases" / db_name / "base.json", root_dir / f"{db_name}.gwb" / "base.json"):
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"base.json not found for database {db_name}")
+
+
+def read_json_base(root_dir: Path, db_name: str) -> Dict:
+    """Load the string-table base.json of a base (json_bases first, then .gwb)."""
+    return read_json(json_base_path(root_dir, db_name))
+
+
 def write_gwb_classic(
     root_dir: Path,
     db_name: str,
@@ -334,18 +441,18 @@ def write_gwb_classic(
         "table_size": max(1, len(surnames)),
         "buckets": [[i] for i in range(len(surnames))],
     }
-    (db_dir / "names.inx").write_text(json.dumps(names_inx), encoding="utf-8")
+    write_json(db_dir / "names.inx", names_inx)
     names_acc = {
         "offsets": list(range(len(surnames))),
     }
-    (db_dir / "names.acc").write_text(json.dumps(names_acc), encoding="utf-8")
+    write_json(db_dir / "names.acc", names_acc)
 
     # fnames.inx
     fnames_inx = {
         "table_size": max(1, len(firstnames)),
         "buckets": [[i] for i in range(len(firstnames))],
     }
-    (db_dir / "fnames.inx").write_text(json.dumps(fnames_inx), encoding="utf-8")
+    write_json(db_dir / "fnames.inx", fnames_inx)
 
     # strings.inx : index pour toutes chaînes simples (dates/lieux)
     strings_set = set()
@@ -363,26 +470,26 @@ def write_gwb_classic(
         "table_size": max(1, len(strings)),
         "buckets": [[i] for i in range(len(strings))],
     }
-    (db_dir / "strings.inx").write_text(json.dumps(s_inx), encoding="utf-8")
+    write_json(db_dir / "strings.inx", s_inx)
 
     # snames.inx : index des patronymes
     sn_inx = {
         "table_size": max(1, len(surnames)),
         "buckets": [[i] for i in range(len(surnames))],
     }
-    (db_dir / "snames.inx").write_text(json.dumps(sn_inx), encoding="utf-8")
+    write_json(db_dir / "snames.inx", sn_inx)
 
     # base / base.acc : placeholders textuels
     base_placeholder = {
         "persons_count": len(persons),
         "families_count": len(families),
     }
-    (db_dir / "base").write_text(json.dumps(base_placeholder), encoding="utf-8")
+    write_json(db_dir / "base", base_placeholder)
     base_acc_placeholder = {
         "persons_offsets": list(range(len(persons))),
         "families_offsets": list(range(len(families))),
     }
-    (db_dir / "base.acc").write_text(json.dumps(base_acc_placeholder), encoding="utf-8")
+    write_json(db_dir / "base.acc", base_acc_placeholder)
 
     return db_dir
 
@@ -417,19 +524,13 @@ def write_json_base(
         "notes_origin_file": notes_origin_file,
     }
 
-    (json_dir / "base.json").write_text(
-        json.dumps(base, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(json_dir / "base.json", base, indent=True)
 
     acc = {
         "persons": {str(p["id"]): p["id"] for p in persons_enc},
         "families": {str(f["id"]): f["id"] for f in families_enc},
     }
-    (json_dir / "base.acc.json").write_text(
-        json.dumps(acc, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(json_dir / "base.acc.json", acc, indent=True)
 
     # Names/strings index JSON lisibles
     from .name_utils import crush_name
@@ -455,10 +556,7 @@ def write_json_base(
         "table_size": table_size,
         "buckets": name_buckets,
     }
-    (json_dir / "names.inx.json").write_text(
-        json.dumps(names_json, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(json_dir / "names.inx.json", names_json, indent=True)
 
     str_table_size = max(1, len(strings_map.strings))
     str_buckets: Dict[int, List[int]] = {}
@@ -469,9 +567,6 @@ def write_json_base(
         "table_size": str_table_size,
         "buckets": str_buckets,
     }
-    (json_dir / "strings.inx.json").write_text(
-        json.dumps(strings_json, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_json(json_dir / "strings.inx.json", strings_json, indent=True)
 
     return json_dir
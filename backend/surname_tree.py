@@ -0,0 +1,135 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import os
+
+from .jsonio import read_json, write_json
+from .name_utils import crush_name
+
+
+SURNAME_TREE_FILENAME = "surname_tree.json"
+
+
+def _first_names(record: Dict, strings: Optional[List[str]]) -> List[str]:
+    if strings is None:
+        return record.get("first_names", ["?"])
+    return [strings[sid] if sid is not None and 0 <= sid < len(strings) else "?" for sid in record.get("first_name_ids", [])]
+
+
+def _surname(record: Dict, strings: Optional[List[str]]) -> str:
+    if strings is None:
+        return record.get("surname") or ""
+    sid = record.get("surname_id")
+    return strings[sid] if sid is not None and 0 <= sid < len(strings) else ""
+
+
+def _branch_sort_key(first_names: List[str]) -> str:
+    # Les prénoms génériques ("Many", "Mr.", "Mrs.") sont rangés en fin de liste
+    joined = " ".join(first_names)
+    if any(name.lower() in ("many", "mr.", "mrs.") for name in first_names):
+        return f"z_{joined}"
+    return f"a_{joined}"
+
+
+def build_surname_forest(
+    persons: Iterable[Dict],
+    families: Iterable[Dict],
+    strings: Optional[List[str]] = None,
+) -> Dict:
+    """Surname lineage forest of a base (port of GeneWeb's "surname by branch").
+
+    For every crushed surname, the roots are its bearers none of whose parents
+    bears it, in display order. Each bearer's first family gives its spouse and
+    its lineage children: the children of that family bearing the surname.
+    A person reachable from several branches only appears in the first one
+    walked, so the forest is exactly what the search page displays.
+
+    Returns {"roots": {crushed: [ids]}, "children": {id: [ids]}, "spouse": {id: id}}.
+    """
+    by_id: Dict[int, Dict] = {}
+    for p in persons:
+        by_id[p["id"]] = p
+    first_family: Dict[int, Dict] = {}
+    for f in families:
+        for pid in (f.get("husband_id"), f.get("wife_id")):
+            if pid is not None:
+                first_family.setdefault(pid, f)
+
+    crushed = {pid: crush_name(_surname(p, strings)) for pid, p in by_id.items()}
+
+    def bears(pid: Optional[int], key: str) -> bool:
+        # Un parent absent de la base porte un nom vide
+        return pid is not None and crushed.get(pid, "") == key
+
+    bearers: Dict[str, List[int]] = {}
+    for pid in sorted(by_id):
+        key = crushed[pid]
+        if key and not bears(by_id[pid].get("father_id"), key) and not bears(by_id[pid].get("mother_id"), key):
+            bearers.setdefault(key, []).append(pid)
+
+    roots: Dict[str, List[int]] = {}
+    children: Dict[int, List[int]] = {}
+    spouse: Dict[int, int] = {}
+    for key, candidates in bearers.items():
+        processed = set()
+        branch_roots = []
+        for rid in candidates:
+            if rid in processed:
+                continue
+            branch_roots.append(rid)
+            processed.add(rid)
+            # Parcours en profondeur préfixe, comme la construction récursive des branches
+            stack = [(rid, _lineage(rid, key, first_family, crushed, spouse))]
+            while stack:
+                parent, pending = stack[-1]
+                child = next(pending, None)
+                if child is None:
+                    stack.pop()
+                    continue
+                if child in processed:
+                    continue
+                processed.add(child)
+                children.setdefault(parent, []).append(child)
+                stack.append((child, _lineage(child, key, first_family, crushed, spouse)))
+        branch_roots.sort(key=lambda pid: _branch_sort_key(_first_names(by_id[pid], strings)))
+        roots[key] = branch_roots
+    return {"roots": roots, "children": children, "spouse": spouse}
+
+
+def _lineage(pid: int, key: str, first_family: Dict[int, Dict], crushed: Dict[int, str], spouse: Dict[int, int]):
+    """Children of the first family of `pid` bearing the surname `key`; records
+    the spouse of that family on the way."""
+    fam = first_family.get(pid)
+    if fam is None:
+        return iter(())
+    other = fam.get("wife_id") if fam.get("husband_id") == pid else fam.get("husband_id")
+    if other is not None and other in crushed:
+        spouse[pid] = other
+    return iter([c for c in fam.get("children_ids") or [] if crushed.get(c) == key])
+
+
+def write_surname_tree(db_dir: Path, forest: Dict, generation: Optional[int]) -> None:
+    """Persist the forest next to base.json, stamped with the base generation."""
+    payload = {
+        "generation": generation,
+        "roots": forest["roots"],
+        "children": {str(pid): ids for pid, ids in forest["children"].items()},
+        "spouse": {str(pid): sid for pid, sid in forest["spouse"].items()},
+    }
+    path = db_dir / SURNAME_TREE_FILENAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    write_json(tmp_path, payload)
+    os.replace(tmp_path, path)
+
+
+def read_surname_tree(db_dir: Path) -> Optional[Dict]:
+    """Read the forest sidecar (with its "generation"), or None if absent/corrupt."""
+    try:
+        payload = read_json(db_dir / SURNAME_TREE_FILENAME)
+        return {
+            "generation": payload.get("generation"),
+            "roots": payload["roots"],
+            "children": {int(pid): ids for pid, ids in payload["children"].items()},
+            "spouse": {int(pid): sid for pid, sid in payload["spouse"].items()},
+        }
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
@@ -0,0 +1,201 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError
+
+
+DEFAULT_CANDIDATES = [
+    "http://127.0.0.1:8000",
+    "http://host.docker.internal:8000",
+]
+
+# (connect, read) : un candidat mort coûte au plus CONNECT_TIMEOUT, pas 10 s
+CONNECT_TIMEOUT = 2
+READ_TIMEOUT = 10
+HEALTH_TIMEOUT = (1, 2)
+# Méthodes rejouables sur un autre candidat même si la requête a pu partir
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+
+class BackendUnavailable(Exception):
+    """Raised when no backend candidate answers."""
+
+
+def _server_key(root: str):
+    """(scheme, host, port) of a root URL, loopback names folded together."""
+    parts = urlsplit(root)
+    host = (parts.hostname or "").lower()
+    if host in LOOPBACK_HOSTS:
+        host = "loopback"
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        port = None
+    return parts.scheme, host, port
+
+
+def _never_sent(error: requests.RequestException) -> bool:
+    """True when the connection itself failed, so the server cannot have
+    received the request (refused, unresolved host, connect timeout)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class BackendClient:
+    """Pooled HTTP client shared by the Flask front ends.
+
+    - one keep-alive requests.Session (connection pool) for every call;
+    - the last backend that answered is remembered and tried first; other
+      candidates are only used after a failed call, once a cheap /health
+      probe says they are up;
+    - per-call latency metrics, keyed by a logical call name.
+    """
+
+    def __init__(self, candidates: Optional[List[str]] = None, pool_size: int = 10):
+        self._candidates = candidates
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._good: Optional[str] = None
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    def candidates(self) -> List[str]:
+        if self._candidates is not None:
+            roots = list(self._candidates)
+        else:
+            roots = [os.environ.get(k) for k in ("BACKEND_URL", "BACKEND_BASE")] + DEFAULT_CANDIDATES
+        # 127.0.0.1 et localhost désignent le même serveur : un seul candidat
+        seen, servers = [], set()
+        for root in roots:
+            root = root.rstrip("/") if root else root
+            if root and _server_key(root) not in servers:
+                servers.add(_server_key(root))
+                seen.append(root)
+        good = self._good
+        if good in seen:
+            seen.remove(good)
+            seen.insert(0, good)
+        return seen
+
+    def _healthy(self, root: str) -> bool:
+        try:
+            self.session.get(f"{root}/health", timeout=HEALTH_TIMEOUT)
+        except requests.RequestException:
+            return False
+        # Toute réponse HTTP (même 404 d'un ancien backend) prouve qu'il est joignable
+        return True
+
+    def _record(self, name: str, started: float, error: bool = False) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            m = self.metrics.setdefault(
+                name, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+            )
+            m["calls"] += 1
+            m["errors"] += 1 if error else 0
+            m["total_ms"] += elapsed_ms
+            m["max_ms"] = max(m["max_ms"], elapsed_ms)
+            m["last_ms"] = elapsed_ms
+
+    def metrics_snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {**m, "avg_ms": m["total_ms"] / m["calls"] if m["calls"] else 0.0}
+                for name, m in self.metrics.items()
+            }
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        name: Optional[str] = None,
+        timeout: float = READ_TIMEOUT,
+        **kwargs,
+    ) -> requests.Response:
+        """Send one request to the current backend, failing over on connection errors.
+        HTTP error statuses are returned to the caller: the backend is alive.
+        A POST or DELETE only moves to another candidate when the connection
+        could not be opened; once it may have reached a server (read timeout,
+        connection reset) it is never sent again.
+        """
+        name = name or f"{method} {path}"
+        replayable = method.upper() in IDEMPOTENT_METHODS
+        last_error = None
+        for root in self.candidates():
+            if root != self._good and not self._healthy(root):
+                last_error = f"{root} unreachable"
+                continue
+            started = time.perf_counter()
+            try:
+                r = self.session.request(method, f"{root}{path}", timeout=(CONNECT_TIMEOUT, timeout), **kwargs)
+            except requests.ConnectionError as e:
+                self._record(name, started, error=True)
+                if self._good == root:
+                    self._good = None
+                if not (replayable or _never_sent(e)):
+                    raise BackendUnavailable(str(e)) from e
+                last_error = str(e)
+                continue
+            except requests.RequestException as e:
+                # Délai de lecture dépassé ou réponse invalide : le backend est joint, pas de bascule
+                self._record(name, started, error=True)
+                raise BackendUnavailable(str(e)) from e
+            self._record(name, started)
+            self._good = root
+            return r
+        raise BackendUnavailable(last_error or "no backend candidate")
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+
+backend = BackendClient()
+
+
+def get_all_dbs():
+    try:
+        r = backend.get("/dbs", name="dbs")
+    except BackendUnavailable as e:
+        return [], str(e)
+    if r.status_code == 200:
+        return r.json(), None
+    return [], f"HTTP {r.status_code}"
+
+
+def get_db_stats(db_name):
+    try:
+        r = backend.get(f"/db/{db_name}/stats", name="stats")
+    except BackendUnavailable as e:
+        return {}, str(e)
+    if r.status_code == 200:
+        return r.json(), None
+    return {}, f"HTTP {r.status_code}"
+
+
+def get_generations():
+    """Current generation of every base ({db: generation}), or None if unreachable."""
+    try:
+        r = backend.get("/dbs/generations", name="generations")
+    except BackendUnavailable:
+        return None
+    if r.status_code == 200:
+        return r.json()
+    return None
@@ -1,103 +1,54 @@
 import os
-import requests
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, make_response, render_template, request, redirect, url_for
+
+from front.backend_client import BackendUnavailable, backend, get_all_dbs, get_db_stats, get_generations
+from front.render_cache import RenderCache
 
 app = Flask(__name__, static_folder="../static",
             template_folder="../templates")
 
+# Cache des pages rendues, invalidé par la génération de chaque base
+render_cache = RenderCache(
+    get_generations,
+    max_entries=int(os.environ.get("RENDER_CACHE_SIZE", "512")),
+)
 
-# --- Fonctions Helper ---
 
-def get_all_dbs():
-    databases = []
-    error = None
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    for root in base_candidates:
-        try:
-            r = requests.get(f"{root.rstrip('/')}/dbs", timeout=10)
-            if r.status_code == 200:
-                databases = r.json()
-                return databases, None
-            error = f"HTTP {r.status_code}"
-        except Exception as e:
-            error = str(e)
-    return databases, error
-
-def get_db_stats(db_name):
-    stats = {}
-    error = None
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    for root in base_candidates:
-        try:
-            r = requests.get(f"{root.rstrip('/')}/db/{db_name}/stats", timeout=10)
-            if r.status_code == 200:
-                stats = r.json()
-                return stats, None
-            error = f"HTTP {r.status_code}"
-        except Exception as e:
-            error = str(e)
-    return stats, error
+# --- Fonctions Helper ---
+# get_all_dbs / get_db_stats et le client HTTP mutualisé viennent de front.backend_client
 
 def call_backend_search(db_name, surname, firstname):
     """Appelle le backend pour les résultats de recherche."""
     print(f"Appel backend pour RECHERCHER {db_name} n: {surname} p: {firstname}")
     params = {"n": surname, "p": firstname}
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    for root in base_candidates:
-        try:
-            r = requests.get(f"{root.rstrip('/')}/db/{db_name}/search", params=params, timeout=10)
-            if r.status_code == 200:
-                data = r.json()
-                if data.get("ok"):
-                    return data, None
-                else:
-                    return None, data.get("error", "Erreur backend inconnue")
-            error = f"HTTP {r.status_code}"
-        except Exception as e:
-            error = str(e)
-    return None, error
-
-# --- NOUVELLE FONCTION HELPER ---
+    try:
+        r = backend.get(f"/db/{db_name}/search", params=params, name="search")
+    except BackendUnavailable as e:
+        return None, str(e)
+    if r.status_code != 200:
+        return None, f"HTTP {r.status_code}"
+    data = r.json()
+    if data.get("ok"):
+        return data, None
+    return None, data.get("error", "Erreur backend inconnue")
+
 def call_backend_person(db_name, surname, firstname):
     """Appelle le backend pour les détails d'UNE personne."""
     print(f"Appel backend pour PERSONNE {db_name} n: {surname} p: {firstname}")
-    
+
     # Le prénom peut contenir des espaces (ex: "Many Generations")
     # L'URL (`p=Many+Generations`) est gérée par requests
     params = {"n": surname, "p": firstname}
-    
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    
-    for root in base_candidates:
-        try:
-            r = requests.get(f"{root.rstrip('/')}/db/{db_name}/person", params=params, timeout=10)
-            if r.status_code == 200:
-                data = r.json()
-                if data.get("ok"):
-                    return data.get("details"), None
-                else:
-                    return None, data.get("error", "Erreur backend inconnue")
-            error = f"HTTP {r.status_code}"
-        except Exception as e:
-            error = str(e)
-    return None, error
-# --- FIN DE LA NOUVELLE FONCTION ---
+    try:
+        r = backend.get(f"/db/{db_name}/person", params=params, name="person")
+    except BackendUnavailable as e:
+        return None, str(e)
+    if r.status_code != 200:
+        return None, f"HTTP {r.status_code}"
+    data = r.json()
+    if data.get("ok"):
+        return data.get("details"), None
+    return None, data.get("error", "Erreur backend inconnue")
 
 
 # --- Routes de l'application ---
@@ -124,6 +75,18 @@ def choose_genealogy():
         error=error
     )
 
+def _html_response(html, etag):
+    if etag and request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(html)
+    if etag:
+        response.set_etag(etag)
+        # Le navigateur revalide à chaque fois, le 304 ne coûte rien
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 # --- ROUTE PRINCIPALE MODIFIÉE ---
 @app.route("/<db_name>")
 def search_page(db_name):
@@ -132,6 +95,22 @@ def search_page(db_name):
     n = request.args.get("n")
     p = request.args.get("p")
 
+    generation = render_cache.generation(db_name)
+    cache_key = (db_name, generation, lang, m, n, p) if generation is not None else None
+    if cache_key is not None:
+        cached = render_cache.get(cache_key)
+        if cached is not None:
+            return _html_response(*cached)
+
+    page = _render_search_page(db_name, lang, m, n, p)
+    if not isinstance(page, str):
+        return page  # redirection d'erreur, jamais mise en cache
+    etag = render_cache.put(cache_key, page) if cache_key is not None else None
+    return _html_response(page, etag)
+
+
+def _render_search_page(db_name, lang, m, n, p):
+    """Render the search/person/form page as HTML, or return an error redirect."""
     # --- LOGIQUE DE RECHERCHE (m=S) ---
     if m == 'S' and (n or p):
         search_query = n or p # Priorité au nom de famille pour le titre
@@ -1,7 +1,7 @@
 import os
-import requests
 from flask import Flask, render_template, request, redirect, url_for
 from .path import list_dir, BASE_DIR
+from front.backend_client import BackendUnavailable, backend, get_all_dbs, get_db_stats
 
 app = Flask(
     __name__,
@@ -10,13 +10,22 @@ app = Flask(
 )
 
 def get_backend_candidates():
-    candidates = []
-    if os.environ.get("BACKEND_URL"):
-        candidates.append(os.environ.get("BACKEND_URL"))
-    candidates.append("http://127.0.0.1:8000")
-    candidates.append("http://localhost:8000")
-    candidates.append("http://host.docker.internal:8000")
-    return candidates
+    # Le dernier backend joignable est placé en tête par le client mutualisé
+    return backend.candidates()
+
+
+def post_import(endpoint, payload):
+    """POST an import payload once to the current backend; returns (ok, error)."""
+    try:
+        resp = backend.post(endpoint, json=payload, timeout=20, name=endpoint.strip("/"))
+        data = resp.json()
+    except BackendUnavailable as e:
+        return False, str(e)
+    except ValueError as e:
+        return False, str(e)
+    if data.get("ok"):
+        return True, None
+    return False, f"Backend error: {data}"
 
 @app.route("/")
 def home():
@@ -56,22 +65,13 @@ def ged2gwb():
                 all_options=request.form.to_dict(), error=str(e)
             )
 
-        candidates = get_backend_candidates()
-        last_error = None
-        for base_url in candidates:
-            try:
-                backend_url = f"{base_url.rstrip('/')}/import_ged"
-                resp = requests.post(backend_url, json={
-                    "db_name": db_name,
-                    "ged_text": ged_text,
-                    "notes_origin_file": filepath,
-                }, timeout=20)
-                data = resp.json()
-                if data.get("ok"):
-                    return redirect(url_for("ged2gwb_result", db=db_name, lang=lang))
-                last_error = f"Backend error: {data}"
-            except Exception as e:
-                last_error = str(e)
+        ok, last_error = post_import("/import_ged", {
+            "db_name": db_name,
+            "ged_text": ged_text,
+            "notes_origin_file": filepath,
+        })
+        if ok:
+            return redirect(url_for("ged2gwb_result", db=db_name, lang=lang))
 
         return render_template(
             "management_creation/ged2gwb_confirm.html",
@@ -143,22 +143,13 @@ def gwc():
                     all_options=all_options, error=str(e)
                 )
         
-        candidates = get_backend_candidates()
-        last_error = None
-        for base_url in candidates:
-            try:
-                backend_url = f"{base_url.rstrip('/')}/import_gw"
-                resp = requests.post(backend_url, json={
-                    "db_name": db_name,
-                    "gw_text": gw_text,
-                    "notes_origin_file": filepath,
-                }, timeout=20)
-                data = resp.json()
-                if data.get("ok"):
-                    return redirect(url_for("gwc_result", db=db_name, lang=lang))
-                last_error = f"Backend error: {data}"
-            except Exception as e:
-                last_error = str(e)
+        ok, last_error = post_import("/import_gw", {
+            "db_name": db_name,
+            "gw_text": gw_text,
+            "notes_origin_file": filepath,
+        })
+        if ok:
+            return redirect(url_for("gwc_result", db=db_name, lang=lang))
 
         if filepath:
             all_options = request.form.to_dict()
@@ -333,91 +324,36 @@ def delete_result():
         list_error=list_error
     )
 
-def get_db_stats(db_name):
-    stats = {}
-    error = None
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    for root in base_candidates:
-        try:
-            r = requests.get(f"{root.rstrip('/')}/db/{db_name}/stats", timeout=10)
-            if r.status_code == 200:
-                stats = r.json()
-                return stats, None
-            error = f"HTTP {r.status_code}"
-        except Exception as e:
-            error = str(e)
-    return stats, error
-
-def get_all_dbs():
-    databases = []
-    error = None
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    for root in base_candidates:
-        try:
-            r = requests.get(f"{root.rstrip('/')}/dbs", timeout=10)
-            if r.status_code == 200:
-                databases = r.json()
-                return databases, None
-            error = f"HTTP {r.status_code}"
-        except Exception as e:
-            error = str(e)
-    return databases, error
-
 def call_backend_delete(db_name):
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    last_error = None
-    for root in base_candidates:
-        try:
-            r = requests.delete(f"{root.rstrip('/')}/db/{db_name}", timeout=10)
-            if r.status_code in (200, 204):
-                try:
-                    data = r.json() if r.content else {"ok": True}
-                except Exception:
-                    data = {"ok": True}
-                if data.get("ok", True):
-                    return True, None
-                return False, f"Backend error: {data}"
-            last_error = f"HTTP {r.status_code}"
-        except Exception as e:
-            last_error = str(e)
-    return False, last_error
+    try:
+        r = backend.delete(f"/db/{db_name}", name="delete")
+    except BackendUnavailable as e:
+        return False, str(e)
+    if r.status_code not in (200, 204):
+        return False, f"HTTP {r.status_code}"
+    try:
+        data = r.json() if r.content else {"ok": True}
+    except Exception:
+        data = {"ok": True}
+    if data.get("ok", True):
+        return True, None
+    return False, f"Backend error: {data}"
 
 
 def call_backend_rename(old_name, new_name):
-    base_candidates = [
-        os.environ.get("BACKEND_BASE", "http://127.0.0.1:8000"),
-        "http://localhost:8000",
-        "http://host.docker.internal:8000",
-    ]
-    last_error = None
-    for root in base_candidates:
-        try:
-            url = f"{root.rstrip('/')}/db/{old_name}/rename"
-            r = requests.post(url, json={"new_name": new_name}, timeout=10)
-            if r.status_code == 200:
-                try:
-                    data = r.json()
-                except Exception:
-                    return True, None
-                if data.get("ok", False):
-                    return True, None
-                return False, f"Backend error: {data}"
-            last_error = f"HTTP {r.status_code}"
-        except Exception as e:
-            last_error = str(e)
-    return False, last_error
+    try:
+        r = backend.post(f"/db/{old_name}/rename", json={"new_name": new_name}, name="rename")
+    except BackendUnavailable as e:
+        return False, str(e)
+    if r.status_code != 200:
+        return False, f"HTTP {r.status_code}"
+    try:
+        data = r.json()
+    except Exception:
+        return True, None
+    if data.get("ok", False):
+        return True, None
+    return False, f"Backend error: {data}"
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=2316, debug=True)
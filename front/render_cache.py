@@ -0,0 +1,83 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+
+class RenderCache:
+    """LRU cache of rendered HTML pages keyed by (db, generation, query...).
+
+    Base generations come from the backend (/dbs/generations) and are
+    refreshed at most every `generation_ttl` seconds; when a base's generation
+    changes, its cached pages are dropped. Pages of bases without a known
+    generation are never cached since they could not be invalidated.
+    """
+
+    def __init__(
+        self,
+        fetch_generations: Callable[[], Optional[Dict[str, int]]],
+        max_entries: int = 512,
+        generation_ttl: float = 2.0,
+    ):
+        self._fetch_generations = fetch_generations
+        self.max_entries = max_entries
+        self.generation_ttl = generation_ttl
+        self._lock = threading.Lock()
+        self._pages: "OrderedDict[Tuple, Tuple[str, str]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._fetched_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    def generation(self, db_name: str) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            fresh = self._fetched_at is not None and now - self._fetched_at < self.generation_ttl
+            if fresh:
+                return self._generations.get(db_name)
+        generations = self._fetch_generations()
+        with self._lock:
+            if generations is None:
+                # Backend injoignable : on ne sert rien du cache
+                self._fetched_at = None
+                return None
+            changed = {
+                db for db, gen in self._generations.items() if generations.get(db) != gen
+            }
+            if changed:
+                for key in [k for k in self._pages if k[0] in changed]:
+                    del self._pages[key]
+            self._generations = dict(generations)
+            self._fetched_at = now
+            return self._generations.get(db_name)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Tuple[str, str]]:
+        """Return (html, etag) for a key, refreshing its LRU position."""
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[Hashable, ...], html: str) -> str:
+        """Store a rendered page and return its ETag."""
+        etag = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        with self._lock:
+            self._pages[key] = (html, etag)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+        return etag
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._generations = {}
+            self._fetched_at = None
+
+    def __len__(self) -> int:
+        return len(self._pages)
@@ -0,0 +1,46 @@
+import os
+from collections import Counter
+
+import pytest
+
+from tests.benchmarks.synthetic import generate_base, to_ged_text, to_gw_text
+
+
+# Tailles générées : 10k par défaut, BENCH_SIZES=10000,100000,1000000 pour la campagne complète
+BENCH_SIZES = [int(s) for s in os.environ.get("BENCH_SIZES", "10000").split(",") if s.strip()]
+BENCH_SKEW = float(os.environ.get("BENCH_SKEW", "1.0"))
+
+
+def _size_id(n):
+    return f"{n // 1_000_000}M" if n >= 1_000_000 and n % 1_000_000 == 0 else f"{n // 1000}k" if n >= 1000 else str(n)
+
+
+_bases = {}
+
+
+def _base(n):
+    if n not in _bases:
+        _bases[n] = generate_base(n, surname_skew=BENCH_SKEW)
+    return _bases[n]
+
+
+@pytest.fixture(scope="session", params=BENCH_SIZES, ids=_size_id)
+def synthetic_base(request):
+    """(persons, families) of a synthetic base, generated once per size."""
+    return _base(request.param)
+
+
+@pytest.fixture(scope="session")
+def synthetic_ged(synthetic_base):
+    return to_ged_text(*synthetic_base)
+
+
+@pytest.fixture(scope="session")
+def synthetic_gw(synthetic_base):
+    return to_gw_text(*synthetic_base)
+
+
+@pytest.fixture(scope="session")
+def top_surname(synthetic_base):
+    persons, _ = synthetic_base
+    return Counter(p.surname for p in persons).most_common(1)[0][0]
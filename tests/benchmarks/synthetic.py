@@ -0,0 +1,138 @@
+"""Synthetic multi-generation genealogy generator for the benchmarks.
+
+Usage: python -m tests.benchmarks.synthetic PERSONS [--format ged|gw] [--skew S] [--seed N] [-o FILE]
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple
+import argparse
+import bisect
+import random
+import sys
+
+from backend.ged_writer import iter_ged_lines
+from backend.models import Family, Person
+from backend.storage import iter_gw_lines
+
+
+FIRST_NAMES = {
+    "M": ["Jean", "Pierre", "Louis", "Paul", "Jacques", "Henri", "Marcel", "Andre", "Rene", "Joseph", "Michel", "Robert"],
+    "F": ["Marie", "Jeanne", "Anne", "Louise", "Marguerite", "Madeleine", "Suzanne", "Germaine", "Alice", "Rose"],
+}
+PLACES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Lille", "Rennes", "Dijon", "Brest", "Tours", "Reims", "Nancy"]
+# Nombre d'enfants par union et poids associés
+CHILDREN_WEIGHTS = [(0, 15), (1, 20), (2, 25), (3, 20), (4, 12), (5, 8)]
+
+
+class _SurnamePicker:
+    """Zipf-like surname draw: rank r has weight 1 / r**skew (0 = uniform)."""
+
+    def __init__(self, rng: random.Random, count: int, skew: float):
+        self.rng = rng
+        self.names = [f"Surname{i:05d}" for i in range(count)]
+        total = 0.0
+        self.cumulative = []
+        for rank in range(1, count + 1):
+            total += 1.0 / rank ** skew
+            self.cumulative.append(total)
+
+    def pick(self) -> str:
+        return self.names[bisect.bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+
+def generate_base(
+    persons_count: int,
+    surname_skew: float = 1.0,
+    seed: int = 42,
+    marriage_rate: float = 0.75,
+) -> Tuple[List[Person], List[Family]]:
+    """Generate a realistic multi-generation base of exactly `persons_count` persons.
+
+    Founders and spouses marrying in draw their surname from a Zipf-like
+    distribution (`surname_skew`: 0 uniform, ~1 realistic, >1 a few dominant
+    surnames); children take their father's surname. Generations are about
+    28 years apart; new founders are added whenever a generation dies out.
+    """
+    rng = random.Random(seed)
+    surnames = _SurnamePicker(rng, max(10, persons_count // 25), surname_skew)
+    children_counts, weights = zip(*CHILDREN_WEIGHTS)
+    persons: List[Person] = []
+    families: List[Family] = []
+
+    def new_person(sex: str, surname: str, year: int, father: Optional[int] = None, mother: Optional[int] = None) -> Person:
+        p = Person(
+            id=len(persons),
+            first_names=[rng.choice(FIRST_NAMES[sex])],
+            surname=surname,
+            sex=sex,
+            father_id=father,
+            mother_id=mother,
+            birth_date=f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/{year}",
+            birth_place=rng.choice(PLACES),
+        )
+        if year < 1940 and rng.random() < 0.8:
+            p.death_date = str(year + rng.randint(30, 90))
+            p.death_place = rng.choice(PLACES)
+        persons.append(p)
+        return p
+
+    year = 1600
+    generation: List[Person] = []
+    while len(persons) < persons_count:
+        if not generation:
+            generation = [new_person(rng.choice("MF"), surnames.pick(), year) for _ in range(min(50, persons_count - len(persons)))]
+        next_generation: List[Person] = []
+        for p in generation:
+            if len(persons) >= persons_count:
+                break
+            if rng.random() > marriage_rate:
+                continue
+            spouse = new_person("F" if p.sex == "M" else "M", surnames.pick(), year + rng.randint(-5, 5))
+            husband, wife = (p, spouse) if p.sex == "M" else (spouse, p)
+            family = Family(
+                id=len(families),
+                husband_id=husband.id,
+                wife_id=wife.id,
+                marriage_date=str(year + rng.randint(18, 30)),
+                marriage_place=rng.choice(PLACES),
+            )
+            for _ in range(rng.choices(children_counts, weights)[0]):
+                if len(persons) >= persons_count:
+                    break
+                child = new_person(rng.choice("MF"), husband.surname, year + rng.randint(20, 40), husband.id, wife.id)
+                family.children_ids.append(child.id)
+                next_generation.append(child)
+            families.append(family)
+        generation = next_generation
+        year += 28
+    return persons, families
+
+
+def to_ged_text(persons: List[Person], families: List[Family]) -> str:
+    return "\n".join(iter_ged_lines((p.__dict__ for p in persons), [f.__dict__ for f in families])) + "\n"
+
+
+def to_gw_text(persons: List[Person], families: List[Family]) -> str:
+    by_id = {p.id: p for p in persons}
+    return "\n".join(iter_gw_lines(persons, families, by_id.get)) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks.synthetic", description="Generate a synthetic base.")
+    parser.add_argument("persons", type=int)
+    parser.add_argument("--format", choices=("ged", "gw"), default="ged")
+    parser.add_argument("--skew", type=float, default=1.0, help="surname Zipf exponent (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", type=Path)
+    args = parser.parse_args(argv)
+
+    persons, families = generate_base(args.persons, args.skew, args.seed)
+    text = to_ged_text(persons, families) if args.format == "ged" else to_gw_text(persons, families)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
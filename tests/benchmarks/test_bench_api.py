@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Désélectionnés par défaut (pytest.ini) : pytest tests/benchmarks -m bench
+pytestmark = pytest.mark.bench
+
+from fastapi.testclient import TestClient
+
+import backend.api
+from backend.api import app
+from backend.storage import write_json_base
+
+
+@pytest.fixture(scope="module")
+def bench_client(synthetic_base):
+    """A client serving the synthetic base from a temporary bases directory."""
+    temp_dir = Path(tempfile.mkdtemp())
+    original = backend.api.BASES_DIR
+    backend.api.BASES_DIR = temp_dir
+    write_json_base(temp_dir, "bench", *synthetic_base)
+    backend.api._context_cache.clear()
+    yield TestClient(app)
+    backend.api._context_cache.clear()
+    backend.api.BASES_DIR = original
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestApiBenchmarks:
+    """Search and person latency through the HTTP layer."""
+
+    def test_context_cold_load(self, benchmark, bench_client):
+        def cold_load():
+            backend.api.forget_search_context("bench")
+            return backend.api.get_search_context("bench")
+
+        ctx = benchmark.pedantic(cold_load, rounds=3, iterations=1)
+        assert ctx.persons_list
+
+    def test_search_surname(self, benchmark, bench_client, top_surname):
+        response = benchmark(bench_client.get, "/db/bench/search", params={"n": top_surname})
+        assert response.json()["ok"] is True
+
+    def test_search_first_name(self, benchmark, bench_client):
+        response = benchmark(bench_client.get, "/db/bench/search", params={"p": "Marie"})
+        assert response.json()["ok"] is True
+
+    def test_person(self, benchmark, bench_client, synthetic_base):
+        p = synthetic_base[0][len(synthetic_base[0]) // 2]
+        params = {"n": p.surname, "p": " ".join(p.first_names)}
+        response = benchmark(bench_client.get, "/db/bench/person", params=params)
+        assert response.json()["ok"] is True
+
+    def test_search_place_and_dates(self, benchmark, bench_client):
+        params = {"place": "Paris", "born_after": 1700, "born_before": 1800}
+        response = benchmark(bench_client.get, "/db/bench/search", params=params)
+        assert response.json()["ok"] is True
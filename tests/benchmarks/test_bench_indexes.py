@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Désélectionnés par défaut (pytest.ini) : pytest tests/benchmarks -m bench
+pytestmark = pytest.mark.bench
+
+from backend.indexes import build_names_index, build_strings_index
+from backend.storage import StringsMap, _encode_persons
+
+
+@pytest.fixture(scope="module")
+def encoded(synthetic_base):
+    strings = StringsMap()
+    persons = _encode_persons(synthetic_base[0], strings)
+    return persons, strings.strings
+
+
+class TestIndexBenchmarks:
+    """Index building of backend.indexes."""
+
+    def test_build_strings_index(self, benchmark, encoded):
+        _, strings = encoded
+        benchmark.pedantic(build_strings_index, args=(strings,), rounds=3, iterations=1)
+
+    def test_build_names_index(self, benchmark, encoded):
+        benchmark.pedantic(build_names_index, args=encoded, rounds=3, iterations=1)
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Désélectionnés par défaut (pytest.ini) : pytest tests/benchmarks -m bench
+pytestmark = pytest.mark.bench
+
+from backend.ged_parser import parse_ged_text
+from backend.gw_parser import parse_gw_text
+from backend.parallel import PARSE_WORKERS
+
+
+class TestParserBenchmarks:
+    """Parsing a synthetic base from text."""
+
+    def test_parse_ged_text(self, benchmark, synthetic_base, synthetic_ged):
+        parsed = benchmark.pedantic(parse_ged_text, args=(synthetic_ged,), rounds=3, iterations=1)
+        assert len(parsed["persons"]) == len(synthetic_base[0])
+
+    def test_parse_ged_text_parallel(self, benchmark, synthetic_base, synthetic_ged):
+        parsed = benchmark.pedantic(parse_ged_text, args=(synthetic_ged, PARSE_WORKERS), rounds=3, iterations=1)
+        assert len(parsed["persons"]) == len(synthetic_base[0])
+
+    def test_parse_gw_text(self, benchmark, synthetic_gw):
+        parsed = benchmark.pedantic(parse_gw_text, args=(synthetic_gw,), rounds=3, iterations=1)
+        assert parsed["persons"]
+
+    def test_parse_gw_text_parallel(self, benchmark, synthetic_gw):
+        parsed = benchmark.pedantic(parse_gw_text, args=(synthetic_gw, PARSE_WORKERS), rounds=3, iterations=1)
+        assert parsed["persons"]
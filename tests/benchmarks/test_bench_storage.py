@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Désélectionnés par défaut (pytest.ini) : pytest tests/benchmarks -m bench
+pytestmark = pytest.mark.bench
+
+from backend.storage import write_gw, write_gwb, write_gwb_classic, write_gwf, write_json_base
+
+
+class TestStorageBenchmarks:
+    """Every writer of backend.storage on a synthetic base."""
+
+    def test_write_gwb(self, benchmark, tmp_path, synthetic_base):
+        benchmark.pedantic(write_gwb, args=(tmp_path, "bench", *synthetic_base), rounds=3, iterations=1)
+
+    def test_write_json_base(self, benchmark, tmp_path, synthetic_base):
+        benchmark.pedantic(write_json_base, args=(tmp_path, "bench", *synthetic_base), rounds=3, iterations=1)
+
+    def test_write_gwb_classic(self, benchmark, tmp_path, synthetic_base):
+        benchmark.pedantic(write_gwb_classic, args=(tmp_path, "bench", *synthetic_base), rounds=3, iterations=1)
+
+    def test_write_gw(self, benchmark, tmp_path, synthetic_base):
+        benchmark.pedantic(write_gw, args=(tmp_path, "bench", *synthetic_base), rounds=3, iterations=1)
+
+    def test_write_gwf(self, benchmark, tmp_path):
+        benchmark(write_gwf, tmp_path, "bench")
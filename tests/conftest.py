@@ -18,6 +18,11 @@ def test_client():
     yield client
 
 
+def parent_record(pid: int, father=None, mother=None) -> Dict:
+    """Minimal person record (id and parents) for PersonGraph-based tests."""
+    return {"id": pid, "father_id": father, "mother_id": mother}
+
+
 @pytest.fixture(scope="function")
 def temp_bases_dir():
     """
@@ -42,6 +47,28 @@ def temp_bases_dir():
     shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+@pytest.fixture
+def imported_client(temp_bases_dir):
+    """
+    Factory importing a base through POST /import in a temporary bases
+    directory: imported_client(db_name, persons, families=(), **extra)
+    returns the TestClient. Loaded search contexts are dropped after the
+    import and at teardown.
+    """
+    import backend.api
+    client = TestClient(app)
+
+    def load(db_name: str, persons: List[Dict], families=(), **extra) -> TestClient:
+        payload = {"db_name": db_name, "persons": persons, "families": list(families), **extra}
+        response = client.post("/import", json=payload)
+        assert response.status_code == 200
+        backend.api._context_cache.clear()
+        return client
+
+    yield load
+    backend.api._context_cache.clear()
+
+
 @pytest.fixture
 def sample_persons_data():
     """
@@ -7,7 +7,7 @@ import shutil
 from backend.api import (
     app, BASES_DIR, PersonInput, FamilyInput, ImportRequest,
     GwParseRequest, GwImportGWRequest, GwImportGEDRequest,
-    RenameRequest, PersonNode, SearchContext
+    RenameRequest, PersonView, SearchContext
 )
 from backend.models import Person, Family
 from fastapi.testclient import TestClient
@@ -104,39 +104,32 @@ class TestModels:
         request = RenameRequest(new_name="new_db_name")
         assert request.new_name == "new_db_name"
 
-    def test_person_node_creation(self):
-        """Test PersonNode model creation."""
-        node = PersonNode(
-            id=1,
-            surname="Doe",
-            first_names=["John"],
-            birth_date="1990",
-            sex="m"
-        )
+    def _view(self, record):
+        ctx = Mock(is_gedcom_format=False, sosa_numbers={})
+        return PersonView(ctx, record)
+
+    def test_person_view_creation(self):
+        """Test PersonView over a plain person record."""
+        node = self._view({"id": 1, "surname": "Doe", "first_names": ["John"], "birth_date": "1990", "sex": "m"})
         assert node.id == 1
         assert node.surname == "Doe"
         assert node.first_names == ["John"]
         assert node.birth_date == "1990"
         assert node.sex == "m"
         assert node.spouse is None
-        assert node.children == []
+        assert list(node.children) == []
 
-    def test_person_node_with_relationships(self):
-        """Test PersonNode with spouse and children."""
-        child = PersonNode(id=3, surname="Doe", first_names=["Child"])
-        spouse = PersonNode(id=2, surname="Smith", first_names=["Jane"])
-        
-        node = PersonNode(
-            id=1,
-            surname="Doe",
-            first_names=["John"],
-            spouse=spouse,
-            children=[child]
-        )
-        
-        assert node.spouse == spouse
-        assert len(node.children) == 1
-        assert node.children[0] == child
+    def test_person_view_with_relationships(self):
+        """Test PersonView with spouse and children."""
+        child = self._view({"id": 3, "surname": "Doe", "first_names": ["Child"]})
+        spouse = self._view({"id": 2, "surname": "Smith", "first_names": ["Jane"]})
+
+        node = self._view({"id": 1, "surname": "Doe", "first_names": ["John"]})
+        node.spouse = spouse
+        node.children = [child]
+
+        assert node.to_json()["spouse"] is spouse
+        assert node.to_json()["children"] == [child]
 
 
 class TestConstants:
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import patch, Mock
 from backend.ged_parser import (
-    GedRecord, _tokenize, parse_ged_text, GED_TAG_LEVEL
+    GedRecord, _tokenize, parse_ged_file, parse_ged_text, GED_TAG_LEVEL
 )
 from backend.models import Person, Family
 
@@ -27,4 +27,93 @@ class TestTokenize:
 class TestParseGedText:
     """Tests for parse_ged_text function."""
 
-    # All tests in TestParseGedText removed - were failing
\ No newline at end of file
+    # All tests in TestParseGedText removed - were failing
+
+GED_SAMPLE = """0 HEAD
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE 1 JAN 1900
+2 PLAC Paris
+1 FAMS @F1@
+0 @I2@ INDI
+1 NAME Jane /Roe/
+1 SEX F
+1 FAMS @F1@
+0 @I3@ INDI
+1 NAME Bob /Doe/
+1 FAMC @F1@
+1 DEAT
+2 DATE 1980
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I2@
+1 CHIL @I3@
+1 MARR
+2 DATE 1925
+0 @I4@ INDI
+1 NAME Ann /Doe/
+1 FAMC @F1@
+0 @F2@ FAM
+1 HUSB @I3@
+1 CHIL @I4@
+0 TRLR
+"""
+
+
+class TestParallelParse:
+    """Tests for the chunked parse in a process pool."""
+
+    def test_same_result_as_sequential(self):
+        sequential = parse_ged_text(GED_SAMPLE, workers=1)
+        for workers in (2, 3):
+            parallel = parse_ged_text(GED_SAMPLE, workers=workers)
+            assert parallel["persons"] == sequential["persons"]
+            assert parallel["families"] == sequential["families"]
+
+    def test_xrefs_linked_across_chunks(self):
+        parsed = parse_ged_text(GED_SAMPLE, workers=3)
+        bob = parsed["persons"][2]
+        assert (bob.father_id, bob.mother_id, bob.death_date) == (0, 1, "1980")
+        # Ann est enfant de F2 mais sa FAMC désigne F1 : pas de parents
+        ann = parsed["persons"][3]
+        assert (ann.father_id, ann.mother_id) == (None, None)
+        assert parsed["families"][1].children_ids == [3]
+
+
+class TestParseBytes:
+    """Tests for the byte-level reader and parse_ged_file."""
+
+    def test_file_same_result_as_text(self, tmp_path):
+        path = tmp_path / "sample.ged"
+        path.write_text(GED_SAMPLE, encoding="utf-8")
+        expected = parse_ged_text(GED_SAMPLE)
+        for workers in (1, 3):
+            parsed = parse_ged_file(path, workers=workers)
+            assert parsed["persons"] == expected["persons"]
+            assert parsed["families"] == expected["families"]
+
+    @pytest.mark.parametrize("newline", ["\r\n", "\r"])
+    def test_crlf_and_cr(self, newline):
+        expected = parse_ged_text(GED_SAMPLE)
+        parsed = parse_ged_text(GED_SAMPLE.replace("\n", newline))
+        assert parsed["persons"] == expected["persons"]
+        assert parsed["families"] == expected["families"]
+
+    def test_other_records_skipped(self):
+        text = "0 @S1@ SOUR\n1 NAME Not /Person/\n" + GED_SAMPLE
+        assert parse_ged_text(text)["persons"] == parse_ged_text(GED_SAMPLE)["persons"]
+
+    def test_non_ascii_values(self, tmp_path):
+        path = tmp_path / "accents.ged"
+        path.write_text("0 @I1@ INDI\n1 NAME Zoé /Müller/\n1 BIRT\n2 PLAC Besançon\n", encoding="utf-8")
+        person = parse_ged_file(path)["persons"][0]
+        assert (person.first_names, person.surname, person.birth_place) == (["Zoé"], "Müller", "Besançon")
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.ged"
+        path.write_bytes(b"")
+        parsed = parse_ged_file(path)
+        assert (parsed["persons"], parsed["families"]) == ([], [])
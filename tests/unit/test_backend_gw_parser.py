@@ -1,10 +1,13 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, Mock
+from backend import parallel
 from backend.gw_parser import (
     _clean_token, _normalize_place, _name_key, _parse_name_pair,
-    _looks_date, parse_gw_text
+    _looks_date, parse_gw_file, parse_gw_text
 )
 from backend.models import Person, Family
+from backend.parallel import shared_pool
 
 
 class TestCleanToken:
@@ -740,4 +743,99 @@ end"""
         assert patrick.surname == "O'Connor"
         assert mary.surname == "Smith-Jones"
         assert mary.first_names == ["Mary", "Anne"]
-        assert child.birth_date == "<1990"
\ No newline at end of file
+        assert child.birth_date == "<1990"
+
+GW_SAMPLE = """encoding: utf-8
+gwplus
+
+per 5 Bob /Doe/ m 1930 in Paris +1990 fath 1 moth 2
+notes Doe Ann
+beg
+fam Not A Family + Only Text
+end notes
+
+fam Doe John 0 1900 + Roe Jane 0 1902 chil 5
+fevt
+#marr 1925 #p Paris
+end fevt
+beg
+- h Carl 1932
+- f Roe Lisa 1931
+end
+
+fam Doe Carl + Smith Amy
+beg
+- h Dan
+fam Doe Dan + Unterminated Children
+end
+
+fam Doe Bob + Roe Lisa
+fevt
+#marr 1955
+end fevt
+"""
+
+
+class TestParallelParse:
+    """Tests for the chunked parse in a process pool."""
+
+    @pytest.mark.parametrize("workers", [2, 3, 7])
+    def test_same_result_as_sequential(self, workers):
+        sequential = parse_gw_text(GW_SAMPLE, workers=1)
+        parallel = parse_gw_text(GW_SAMPLE, workers=workers)
+        assert parallel == sequential
+
+    def test_concurrent_parses_share_the_pool(self):
+        # Imports simultanées depuis les threads du serveur : un seul pool, borné
+        sequential = parse_gw_text(GW_SAMPLE, workers=1)
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            results = list(threads.map(lambda _: parse_gw_text(GW_SAMPLE, workers=3), range(3)))
+        assert results == [sequential] * 3
+        assert shared_pool()._max_workers == parallel.PARSE_WORKERS
+
+    def test_merged_across_chunks(self):
+        parsed = parse_gw_text(GW_SAMPLE, workers=3)
+        persons = {" ".join(p.first_names + [p.surname]): p for p in parsed["persons"]}
+        # Bob du 'per' désigné par 'chil 5', mari de la dernière famille
+        assert persons["Bob Doe"].id == 5
+        assert parsed["families"][0].children_ids[0] == 5
+        assert parsed["families"][-1].husband_id == 5
+        # Lisa Roe : enfant de la première famille puis épouse, une seule personne
+        lisa = persons["Lisa Roe"]
+        assert parsed["families"][-1].wife_id == lisa.id
+        assert (lisa.father_id, lisa.birth_date) == (parsed["families"][0].husband_id, "1931")
+        # Les lignes 'fam ' dans des notes ou une liste d'enfants ne sont pas des familles
+        assert len(parsed["families"]) == 3
+        assert "Not" not in persons and "Unterminated" not in " ".join(persons)
+        assert parsed["notes"]["Doe|Ann"] == "beg\nfam Not A Family + Only Text"
+
+
+class TestParseBytes:
+    """Tests for the byte-level reader and parse_gw_file."""
+
+    def test_file_same_result_as_text(self, tmp_path):
+        path = tmp_path / "sample.gw"
+        path.write_text(GW_SAMPLE, encoding="utf-8")
+        expected = parse_gw_text(GW_SAMPLE)
+        assert parse_gw_file(path, workers=1) == expected
+        assert parse_gw_file(path, workers=3) == expected
+
+    def test_file_read_in_small_chunks(self, tmp_path, monkeypatch):
+        # Morceaux de quelques octets : les blocs coupés sont reportés au suivant
+        monkeypatch.setattr("backend.gw_parser.FILE_CHUNK_BYTES", 16)
+        path = tmp_path / "sample.gw"
+        path.write_text(GW_SAMPLE, encoding="utf-8")
+        assert parse_gw_file(path, workers=1) == parse_gw_text(GW_SAMPLE)
+
+    def test_crlf(self):
+        assert parse_gw_text(GW_SAMPLE.replace("\n", "\r\n")) == parse_gw_text(GW_SAMPLE)
+
+    def test_unicode_spaces_stripped(self):
+        text = "fam Doe John + Roe Jane\u00a0\nbeg\n- h Bob\u3000\nend\n"
+        parsed = parse_gw_text(text)
+        assert [p.first_names for p in parsed["persons"]] == [["John"], ["Jane"], ["Bob"]]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.gw"
+        path.write_bytes(b"")
+        assert parse_gw_file(path) == parse_gw_text("")
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.api
+from backend.api import app, get_search_context
+
+
+@pytest.fixture
+def client(imported_client, sample_import_request):
+    return imported_client(**sample_import_request)
+
+
+class TestSearchContextCache:
+    """Tests for reuse of loaded contexts between requests."""
+
+    def test_context_reused_while_base_unchanged(self, client):
+        """Two lookups on an unchanged base share one loaded context."""
+        assert get_search_context("test_db") is get_search_context("test_db")
+
+    def test_context_reloaded_after_reimport(self, client, sample_import_request):
+        """A rewritten base.json invalidates the cached context."""
+        first = get_search_context("test_db")
+        sample_import_request["persons"].append({"id": 4, "first_names": ["Ann"], "surname": "Lee"})
+        client.post("/import", json=sample_import_request)
+        second = get_search_context("test_db")
+        assert second is not first
+        assert 4 in second.persons_by_id
+
+    def test_context_forgotten_on_delete(self, client):
+        """Deleting a base drops its cached context."""
+        get_search_context("test_db")
+        client.delete("/db/test_db")
+        assert "test_db" not in backend.api._context_cache
+
+
+class TestPersonsBatchEndpoint:
+    """Tests for POST /db/{db}/persons:batch."""
+
+    def test_batch_by_ids_and_keys_keeps_request_order(self, client):
+        """Ids come first, then keys, each in request order."""
+        response = client.post("/db/test_db/persons:batch", json={
+            "ids": [3, 1],
+            "keys": [{"n": "doe", "p": "JANE"}],
+        })
+        data = response.json()
+        assert data["ok"] is True
+        assert [r["first_names"] for r in data["results"]] == [["Bob"], ["John"], ["Jane"]]
+        assert data["missing"] == 0
+
+    def test_batch_missing_persons_are_none(self, client):
+        """Unknown ids or keys yield None placeholders."""
+        data = client.post("/db/test_db/persons:batch", json={
+            "ids": [99],
+            "keys": [{"n": "Nobody", "p": "Here"}],
+        }).json()
+        assert data["results"] == [None, None]
+        assert data["missing"] == 2
+
+    def test_batch_with_details(self, client):
+        """details=true returns parents and families for each person."""
+        data = client.post("/db/test_db/persons:batch", json={"ids": [3], "details": True}).json()
+        details = data["results"][0]
+        assert details["person"]["first_names"] == ["Bob"]
+        assert details["father"]["first_names"] == ["John"]
+        assert details["mother"]["first_names"] == ["Jane"]
+
+    def test_batch_size_limit(self, client):
+        """Oversized batches are rejected."""
+        response = client.post("/db/test_db/persons:batch", json={"ids": list(range(501))})
+        assert response.status_code == 400
+
+    def test_batch_unknown_base(self, temp_bases_dir):
+        """An unknown base reports an error like the other lookup endpoints."""
+        data = TestClient(app).post("/db/nope/persons:batch", json={"ids": [1]}).json()
+        assert data["ok"] is False
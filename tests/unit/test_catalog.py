@@ -0,0 +1,201 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import app
+from backend.catalog import BaseCatalog
+from backend.metadata import META_FILENAME, compute_stats, read_meta, write_meta, rename_meta
+from backend.models import Person, Family
+
+
+@pytest.fixture
+def persons():
+    return [
+        Person(id=1, first_names=["John"], surname="Doe", sex="M"),
+        Person(id=2, first_names=["Jane"], surname="Doe", sex="F"),
+    ]
+
+
+@pytest.fixture
+def families():
+    return [Family(id=1, husband_id=1, wife_id=2)]
+
+
+class TestMetadata:
+    """Tests for the per-base meta.json manifest."""
+
+    def test_write_meta_contents(self, tmp_path, persons, families):
+        """Manifest holds name, counts, sizes and a generation."""
+        base = '{"counts": {"strings": 3}}'
+        (tmp_path / "base.json").write_text(base, encoding="utf-8")
+        meta = write_meta(tmp_path, "demo", persons, families)
+        assert meta["name"] == "demo"
+        assert meta["counts"] == {"persons": 2, "families": 1, "strings": 3}
+        assert meta["sizes"]["files"] == {"base.json": len(base)}
+        assert meta["sizes"]["total"] == len(base)
+        assert read_meta(tmp_path) == meta
+        assert not (tmp_path / (META_FILENAME + ".tmp")).exists()
+
+    def test_generation_increases_on_reimport(self, tmp_path, persons, families):
+        """Each import bumps the generation."""
+        first = write_meta(tmp_path, "demo", persons, families)
+        second = write_meta(tmp_path, "demo", persons, families)
+        assert second["generation"] > first["generation"]
+
+    def test_read_meta_missing_or_corrupt(self, tmp_path):
+        """Missing or invalid manifests read as None."""
+        assert read_meta(tmp_path) is None
+        (tmp_path / META_FILENAME).write_text("{not json", encoding="utf-8")
+        assert read_meta(tmp_path) is None
+
+    def test_rename_meta(self, tmp_path, persons, families):
+        """Renaming updates the stored name."""
+        write_meta(tmp_path, "old", persons, families)
+        rename_meta(tmp_path, "new")
+        assert read_meta(tmp_path)["name"] == "new"
+
+
+class TestComputeStats:
+    """Tests for the statistics precomputed at import time."""
+
+    def test_compute_stats(self):
+        """Date range, surnames, generations and largest families."""
+        persons = [
+            Person(id=1, first_names=["A"], surname="Doe", birth_date="1801"),
+            Person(id=2, first_names=["B"], surname="Roe", death_date="ABT 1870"),
+            Person(id=3, first_names=["C"], surname="Doe", father_id=1, mother_id=2, birth_date="7/9/1830"),
+            Person(id=4, first_names=["D"], surname="Doe", father_id=3),
+        ]
+        families = [
+            Family(id=1, husband_id=1, wife_id=2, children_ids=[3]),
+            Family(id=2, husband_id=3, children_ids=[4, 5]),
+            Family(id=3, husband_id=4),
+        ]
+        stats = compute_stats(persons, families)
+        assert stats["date_range"] == {"min_year": 1801, "max_year": 1870}
+        assert stats["surnames"] == 2
+        assert stats["generations"] == 3
+        assert [f["id"] for f in stats["largest_families"]] == [2, 1]
+        assert stats["top_surnames"][0] == {"surname": "Doe", "count": 3}
+
+    def test_generations_survives_parent_cycles(self):
+        """A parent cycle (data error) does not loop forever."""
+        persons = [
+            Person(id=1, first_names=["A"], surname="X", father_id=2),
+            Person(id=2, first_names=["B"], surname="X", father_id=1),
+        ]
+        assert compute_stats(persons, [])["generations"] == 2
+
+    def test_compute_stats_empty(self):
+        """An empty base yields empty statistics."""
+        stats = compute_stats([], [])
+        assert stats["date_range"] == {"min_year": None, "max_year": None}
+        assert stats["generations"] == 0
+        assert stats["top_surnames"] == []
+
+
+class TestBaseCatalog:
+    """Tests for the in-memory /dbs catalog."""
+
+    def test_names_lists_json_and_gwb_bases(self, tmp_path):
+        """Both json_bases entries and classic .gwb folders are listed once."""
+        (tmp_path / "json_bases" / "alpha").mkdir(parents=True)
+        (tmp_path / "alpha.gwb").mkdir()
+        (tmp_path / "beta.gwb").mkdir()
+        assert BaseCatalog().names(tmp_path) == ["alpha", "beta"]
+
+    def test_names_does_not_parse_base_json(self, tmp_path):
+        """A huge or broken base.json is never read to list names."""
+        db_dir = tmp_path / "json_bases" / "alpha"
+        db_dir.mkdir(parents=True)
+        (db_dir / "base.json").write_text("{broken", encoding="utf-8")
+        assert BaseCatalog().names(tmp_path) == ["alpha"]
+
+    def test_directory_change_refreshes_listing(self, tmp_path):
+        """Adding a base changes the directory mtime and refreshes the listing."""
+        cat = BaseCatalog()
+        (tmp_path / "alpha.gwb").mkdir()
+        assert cat.names(tmp_path) == ["alpha"]
+        (tmp_path / "beta.gwb").mkdir()
+        # Force a distinct mtime even on coarse-grained filesystems
+        st = tmp_path.stat()
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert cat.names(tmp_path) == ["alpha", "beta"]
+
+    def test_listing_is_cached_until_invalidated(self, tmp_path):
+        """Without a directory change the cached listing is served."""
+        cat = BaseCatalog()
+        (tmp_path / "alpha.gwb").mkdir()
+        assert cat.names(tmp_path) == ["alpha"]
+        cat._dirs = {}
+        assert cat.names(tmp_path) == []
+        cat.invalidate()
+        assert cat.names(tmp_path) == ["alpha"]
+
+    def test_meta_reloaded_when_manifest_changes(self, tmp_path, persons, families):
+        """Re-importing rewrites meta.json and the catalog picks it up."""
+        db_dir = tmp_path / "json_bases" / "alpha"
+        db_dir.mkdir(parents=True)
+        cat = BaseCatalog()
+        assert cat.meta(tmp_path, "alpha") is None
+        first = write_meta(db_dir, "alpha", persons, families)
+        assert cat.meta(tmp_path, "alpha")["generation"] == first["generation"]
+        second = write_meta(db_dir, "alpha", persons[:1], families)
+        assert cat.meta(tmp_path, "alpha")["generation"] == second["generation"]
+        assert cat.meta(tmp_path, "alpha")["counts"]["persons"] == 1
+
+
+class TestDbsEndpoint:
+    """Tests for /dbs served from the catalog."""
+
+    def test_import_then_list_and_delete(self, temp_bases_dir, sample_ged_text):
+        """Imports write meta.json and /dbs reflects imports and deletions."""
+        client = TestClient(app)
+        response = client.post("/import_ged", json={"db_name": "fam", "ged_text": sample_ged_text})
+        assert response.status_code == 200
+        meta_path = temp_bases_dir / "json_bases" / "fam" / META_FILENAME
+        assert json.loads(meta_path.read_text(encoding="utf-8"))["counts"]["persons"] == 2
+        assert client.get("/dbs").json() == ["fam"]
+        client.delete("/db/fam")
+        assert client.get("/dbs").json() == []
+
+    def test_generations_endpoint(self, temp_bases_dir, sample_ged_text):
+        """/dbs/generations exposes the manifest generation of each base."""
+        client = TestClient(app)
+        client.post("/import_ged", json={"db_name": "fam", "ged_text": sample_ged_text})
+        first = client.get("/dbs/generations").json()["fam"]
+        client.post("/import_ged", json={"db_name": "fam", "ged_text": sample_ged_text})
+        assert client.get("/dbs/generations").json()["fam"] > first
+
+
+class TestStatsEndpoint:
+    """Tests for /db/{db_name}/stats served from meta.json."""
+
+    def test_stats_reads_manifest_only(self, temp_bases_dir, sample_ged_text):
+        """Counts come from meta.json even if base.json is unreadable."""
+        client = TestClient(app)
+        client.post("/import_ged", json={"db_name": "fam", "ged_text": sample_ged_text})
+        (temp_bases_dir / "json_bases" / "fam" / "base.json").write_text("{broken", encoding="utf-8")
+        response = client.get("/db/fam/stats")
+        assert response.status_code == 200
+        assert response.json() == {"persons": 2, "families": 1, "strings": 9}
+
+    def test_stats_extended(self, temp_bases_dir, sample_ged_text):
+        """Extended statistics are precomputed at import time."""
+        client = TestClient(app)
+        client.post("/import_ged", json={"db_name": "fam", "ged_text": sample_ged_text})
+        data = client.get("/db/fam/stats", params={"extended": True}).json()
+        extended = data["extended"]
+        assert extended["date_range"] == {"min_year": 1980, "max_year": 2005}
+        assert extended["surnames"] == 1
+        assert extended["sizes"]["files"]["base.json"] > 0
+        assert extended["import_seconds"] >= 0
+
+    def test_stats_legacy_base_without_manifest(self, temp_bases_dir):
+        """Bases imported before meta.json existed still fall back to base.json."""
+        db_dir = temp_bases_dir / "json_bases" / "old"
+        db_dir.mkdir(parents=True)
+        (db_dir / "base.json").write_text(json.dumps({"counts": {"persons": 4}}), encoding="utf-8")
+        assert TestClient(app).get("/db/old/stats").json() == {"persons": 4}
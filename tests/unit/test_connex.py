@@ -0,0 +1,76 @@
+import pytest
+
+from backend.connex import component_labels, main, summarize_components
+from backend.graph import PersonGraph
+from tests.conftest import parent_record as _p
+
+
+def _f(fid, husband=None, wife=None, children=()):
+    return {"id": fid, "husband_id": husband, "wife_id": wife, "children_ids": list(children)}
+
+
+@pytest.fixture
+def islands_graph():
+    """A 5-person family joined through a marriage, a parent/child pair, and a loner."""
+    persons = [_p(1), _p(2), _p(3), _p(4, 1), _p(5), _p(6), _p(7, 6), _p(8)]
+    families = [_f(10, 1, 2, [3]), _f(11, 4, 5)]
+    return PersonGraph(persons, families)
+
+
+class TestComponents:
+    """Tests for the union-find components pass."""
+
+    def test_labels(self, islands_graph):
+        labels = component_labels(islands_graph)
+        i = islands_graph.index_of
+        assert len({labels[i[p]] for p in (1, 2, 3, 4, 5)}) == 1
+        assert labels[i[6]] == labels[i[7]]
+        assert len(set(labels)) == 3
+
+    def test_summary(self, islands_graph):
+        summary = summarize_components(islands_graph, small_size=2)
+        assert summary["count"] == 3
+        assert summary["largest"] == 5
+        assert summary["sizes"] == [
+            {"size": 5, "components": 1},
+            {"size": 2, "components": 1},
+            {"size": 1, "components": 1},
+        ]
+        assert summary["small"] == [[8], [6, 7]]
+
+    def test_max_listed(self, islands_graph):
+        assert summarize_components(islands_graph, small_size=10, max_listed=1)["small"] == [[8]]
+
+    def test_long_chain(self):
+        """A 10000-person line is one component."""
+        persons = [_p(0)] + [_p(i, i - 1) for i in range(1, 10000)]
+        assert summarize_components(PersonGraph(persons))["count"] == 1
+
+
+class TestComponentsEndpointAndCli:
+    """Tests for /db/{db}/components and python -m backend.connex."""
+
+    @pytest.fixture
+    def islands_client(self, imported_client):
+        persons = [
+            {"id": 1, "first_names": ["Abe"], "surname": "Doe"},
+            {"id": 2, "first_names": ["Ann"], "surname": "Roe"},
+            {"id": 3, "first_names": ["Bob"], "surname": "Doe", "father_id": 1, "mother_id": 2},
+            {"id": 4, "first_names": ["Lone"], "surname": "Wolf"},
+        ]
+        return imported_client("islands", persons)
+
+    def test_endpoint(self, islands_client):
+        data = islands_client.get("/db/islands/components", params={"small": 1}).json()
+        assert data["ok"] is True
+        assert data["count"] == 2
+        assert [[p["first_names"] for p in c] for c in data["small"]] == [[["Lone"]]]
+
+    def test_cli(self, islands_client, temp_bases_dir, capsys):
+        assert main(["islands", "--bases-dir", str(temp_bases_dir), "--small", "1"]) == 0
+        out = capsys.readouterr().out
+        assert "islands: 4 persons, 2 connected components" in out
+        assert "4 Lone Wolf" in out
+
+    def test_cli_unknown_base(self, temp_bases_dir, capsys):
+        assert main(["nope", "--bases-dir", str(temp_bases_dir)]) == 1
@@ -0,0 +1,90 @@
+from fastapi.testclient import TestClient
+
+from backend.api import _compute_consang, app
+from backend.consang import inbreeding_coefficients, read_consang, topological_order, write_consang
+from backend.graph import PersonGraph
+from tests.conftest import parent_record as _p
+
+
+def _coefficients(persons):
+    graph = PersonGraph(persons)
+    F = inbreeding_coefficients(graph)
+    return {graph.ids[i]: round(f, 6) for i, f in enumerate(F)}
+
+
+class TestInbreedingCoefficients:
+    """Tests for the path-tracing consanguinity engine."""
+
+    def test_child_of_full_siblings(self):
+        F = _coefficients([_p(1), _p(2), _p(3, 1, 2), _p(4, 1, 2), _p(5, 3, 4)])
+        assert F[5] == 0.25
+        assert F[3] == F[4] == 0.0
+
+    def test_child_of_half_siblings_and_first_cousins(self):
+        half = _coefficients([_p(1), _p(2), _p(3), _p(4, 1, 2), _p(5, 1, 3), _p(6, 4, 5)])
+        assert half[6] == 0.125
+        cousins = _coefficients([
+            _p(1), _p(2), _p(3, 1, 2), _p(4, 1, 2), _p(8), _p(9),
+            _p(5, 3, 8), _p(6, 9, 4), _p(7, 5, 6),
+        ])
+        assert cousins[7] == 0.0625
+
+    def test_inbred_ancestors_raise_coefficient(self):
+        """Two generations of full-sibling mating: F = 0.375."""
+        F = _coefficients([
+            _p(1), _p(2), _p(3, 1, 2), _p(4, 1, 2),
+            _p(5, 3, 4), _p(6, 3, 4), _p(7, 5, 6),
+        ])
+        assert F[7] == 0.375
+
+    def test_children_listed_before_parents(self):
+        """Base order does not matter: persons are sorted topologically first."""
+        F = _coefficients([_p(5, 3, 4), _p(3, 1, 2), _p(4, 1, 2), _p(1), _p(2)])
+        assert F[5] == 0.25
+
+    def test_parent_cycle_is_cut(self):
+        graph = PersonGraph([_p(1, 2), _p(2, 1), _p(3, 1)])
+        assert sorted(topological_order(graph)) == [0, 1, 2]
+        assert list(inbreeding_coefficients(graph)) == [0.0, 0.0, 0.0]
+
+
+class TestConsangSidecar:
+    """Tests for the sidecar file and the post-import job."""
+
+    def test_write_and_read(self, tmp_path):
+        graph = PersonGraph([_p(1), _p(2), _p(3, 1, 2), _p(4, 1, 2), _p(5, 3, 4)])
+        write_consang(tmp_path, graph, generation=7)
+        sidecar = read_consang(tmp_path)
+        assert sidecar["generation"] == 7
+        assert sidecar["coefficients"] == {"5": 0.25}
+
+    def test_read_missing(self, tmp_path):
+        assert read_consang(tmp_path) is None
+
+    def test_computed_after_import(self, imported_client):
+        persons = [
+            {"id": 1, "first_names": ["Abe"], "surname": "Doe"},
+            {"id": 2, "first_names": ["Ann"], "surname": "Roe"},
+            {"id": 3, "first_names": ["Bob"], "surname": "Doe", "father_id": 1, "mother_id": 2},
+            {"id": 4, "first_names": ["Bea"], "surname": "Doe", "father_id": 1, "mother_id": 2},
+            {"id": 5, "first_names": ["Cid"], "surname": "Doe", "father_id": 3, "mother_id": 4},
+        ]
+        client = imported_client("inbred", persons)
+        data = client.get("/db/inbred/consang").json()
+        assert data["ok"] is True and data["status"] == "done"
+        assert data["stale"] is False
+        assert data["count"] == 1
+        assert data["coefficients"][0]["person"]["first_names"] == ["Cid"]
+        assert data["coefficients"][0]["consang"] == 0.25
+
+        rerun = client.post("/db/inbred/consang").json()
+        assert rerun["ok"] is True and rerun["count"] == 1
+
+    def test_background_failure_is_logged(self, tmp_path, caplog):
+        _compute_consang(tmp_path, [{"father_id": None}], [], 1)
+        assert "Consanguinity computation failed" in caplog.text
+        assert read_consang(tmp_path) is None
+
+    def test_unknown_base(self, temp_bases_dir):
+        data = TestClient(app).get("/db/nope/consang").json()
+        assert data == {"ok": False, "error": "Base not found"}
@@ -0,0 +1,82 @@
+import pytest
+
+from backend.cousins import CousinFinder
+from backend.graph import PersonGraph
+from tests.conftest import parent_record as _p
+
+
+@pytest.fixture
+def finder():
+    """Grandparents 1+2 -> children 3, 4 -> grandchildren 5, 6 (of 3) and 7 (of 4);
+    8 is a half-sibling of 3 through 1; 9 is the child of 8."""
+    return CousinFinder(PersonGraph([
+        _p(1), _p(2), _p(10),
+        _p(3, 1, 2), _p(4, 1, 2), _p(8, 1, 10),
+        _p(5, 3), _p(6, 3), _p(7, 4), _p(9, 8),
+    ]))
+
+
+class TestCousinFinder:
+    """Tests for cousin queries and the ancestor-set cache."""
+
+    def test_siblings(self, finder):
+        cousins, truncated = finder.cousins(3, level=1, limit=100)
+        assert cousins == [(4, [1, 2]), (8, [1])]
+        assert truncated is False
+
+    def test_first_cousins_exclude_siblings(self, finder):
+        cousins, _ = finder.cousins(5, level=2, limit=100)
+        assert cousins == [(7, [1, 2]), (9, [1])]
+
+    def test_limit(self, finder):
+        cousins, truncated = finder.cousins(5, level=2, limit=1)
+        assert cousins == [(7, [1, 2])]
+        assert truncated is True
+
+    def test_unknown_person_or_level(self, finder):
+        assert finder.cousins(42, level=2, limit=10) == ([], False)
+        assert finder.cousins(5, level=0, limit=10) == ([], False)
+
+    def test_ancestor_sets_are_shared(self, finder):
+        """Siblings reuse the set of their common parent."""
+        finder.ancestor_set(finder.graph.index_of[5], 2)
+        misses = finder.misses
+        finder.ancestor_set(finder.graph.index_of[6], 2)
+        assert finder.misses == misses + 1
+        assert finder.hits >= 1
+
+    def test_cache_is_bounded(self):
+        persons = [_p(0)] + [_p(i, i - 1) for i in range(1, 200)]
+        finder = CousinFinder(PersonGraph(persons), max_cached_items=50)
+        finder.ancestor_set(199, 30)
+        assert finder._cached_items <= 50
+
+
+class TestCousinsEndpoint:
+    """Tests for /db/{db}/person/{id}/cousins."""
+
+    @pytest.fixture
+    def cousins_client(self, imported_client):
+        persons = [
+            {"id": 1, "first_names": ["Abe"], "surname": "Doe"},
+            {"id": 2, "first_names": ["Bob"], "surname": "Doe", "father_id": 1},
+            {"id": 3, "first_names": ["Bea"], "surname": "Doe", "father_id": 1},
+            {"id": 4, "first_names": ["Cid"], "surname": "Doe", "father_id": 2},
+            {"id": 5, "first_names": ["Cora"], "surname": "Doe", "mother_id": 3},
+        ]
+        return imported_client("cousins", persons)
+
+    def test_first_cousins(self, cousins_client):
+        data = cousins_client.get("/db/cousins/person/4/cousins").json()
+        assert data["ok"] is True
+        assert data["level"] == 2
+        assert [(c["person"]["first_names"], c["common_ancestors"]) for c in data["cousins"]] == [(["Cora"], [1])]
+
+    def test_level_capped_by_gwf(self, cousins_client):
+        data = cousins_client.get("/db/cousins/person/4/cousins", params={"level": 50}).json()
+        assert data["level"] == 5
+        assert data["cousins"] == []
+
+    def test_unknown_person(self, cousins_client):
+        data = cousins_client.get("/db/cousins/person/42/cousins").json()
+        assert data == {"ok": False, "error": "Person not found"}
@@ -0,0 +1,73 @@
+import pytest
+
+from backend.dates import (
+    ABOUT,
+    AFTER,
+    BEFORE,
+    MAYBE,
+    NO_DATE,
+    OR_YEAR,
+    YEAR_INT,
+    Date,
+    code_year,
+    date_code,
+    encode_date,
+    parse_date,
+)
+
+
+class TestParseDate:
+    """Tests for the .gw and GEDCOM date syntaxes."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("7/9/1830", Date(1830, 9, 7)),
+        ("9/1830", Date(1830, 9)),
+        ("1830", Date(1830)),
+        ("~1820", Date(1820, precision=ABOUT)),
+        ("?1820", Date(1820, precision=MAYBE)),
+        ("<1849", Date(1849, precision=BEFORE)),
+        (">1/1849", Date(1849, 1, precision=AFTER)),
+        ("1830|1831", Date(1830, precision=OR_YEAR, year2=1831)),
+        ("1830..1840", Date(1830, precision=YEAR_INT, year2=1840)),
+        ("1/1/1700J", Date(1700, 1, 1)),
+    ])
+    def test_gw(self, text, expected):
+        assert parse_date(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("12 MAR 1901", Date(1901, 3, 12)),
+        ("MAR 1901", Date(1901, 3)),
+        ("abt 1820", Date(1820, precision=ABOUT)),
+        ("EST 1820", Date(1820, precision=ABOUT)),
+        ("BEF 1900", Date(1900, precision=BEFORE)),
+        ("AFT 1 JAN 1900", Date(1900, 1, 1, AFTER)),
+        ("BET 1800 AND 1810", Date(1800, precision=YEAR_INT, year2=1810)),
+        ("FROM 1800 TO 1810", Date(1800, precision=YEAR_INT, year2=1810)),
+        ("INT 1900 (about then)", Date(1900)),
+        ("1699/00", Date(1699)),
+        ("@#DJULIAN@ 1 JAN 1700", Date(1700, 1, 1)),
+    ])
+    def test_gedcom(self, text, expected):
+        assert parse_date(text) == expected
+
+    @pytest.mark.parametrize("text", [None, "", "  ", "0(in the war)", "(unknown)", "1/1/12F", "@#DFRENCH R@ 1 VEND 12", "32/1/1900", "1/13/1900", "FOO 1900"])
+    def test_unusable(self, text):
+        assert parse_date(text) is None
+        assert date_code(text) == NO_DATE
+
+
+class TestDateCode:
+    """Tests for the integer encoding."""
+
+    def test_encoding(self):
+        assert encode_date(Date(1830, 9, 7, ABOUT)) == 183009071
+        assert encode_date(None) == NO_DATE
+
+    def test_codes_sort_chronologically(self):
+        texts = ["1901", "7/9/1830", "ABT 1830", "9/1830", "1 JAN 1831"]
+        assert sorted(texts, key=date_code) == ["ABT 1830", "9/1830", "7/9/1830", "1 JAN 1831", "1901"]
+        assert date_code("12 MAR 1901") < 2 ** 31
+
+    def test_code_year(self):
+        assert code_year(date_code("<1849")) == 1849
+        assert code_year(NO_DATE) == 0
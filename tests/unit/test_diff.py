@@ -0,0 +1,109 @@
+from backend.diff import diff_bases, diff_stored_bases, main
+from backend.jsonio import write_json
+
+
+def _base(persons, families=()):
+    """Minimal string-table base.json: persons are (id, first, surname, birth, father)."""
+    strings = []
+
+    def sid(s):
+        if not s:
+            return None
+        if s not in strings:
+            strings.append(s)
+        return strings.index(s)
+
+    return {
+        "strings": strings,
+        "persons": [
+            {
+                "id": pid, "first_name_ids": [sid(first)], "surname_id": sid(surname),
+                "birth_date_id": sid(birth), "father_id": father,
+            }
+            for pid, first, surname, birth, father in persons
+        ],
+        "families": [
+            {"id": fid, "husband_id": h, "wife_id": w, "children_ids": list(children)}
+            for fid, h, w, children in families
+        ],
+    }
+
+
+OLD = _base(
+    [(1, "Abe", "Doe", "1900", None), (2, "Bob", "Doe", "1930", 1), (3, "Cid", "Roe", "1950", None)],
+    [(10, 1, None, [2])],
+)
+
+
+class TestDiffBases:
+    """Tests for the key/hash merge-join diff."""
+
+    def test_identical_bases_with_renumbered_ids(self):
+        renumbered = _base(
+            [(7, "Abe", "Doe", "1900", None), (8, "Bob", "Doe", "1930", 7), (9, "Cid", "Roe", "1950", None)],
+            [(20, 7, None, [8])],
+        )
+        assert list(diff_bases(OLD, renumbered)) == []
+
+    def test_added_removed_changed(self):
+        new = _base(
+            [(1, "Abe", "Doe", "1900", None), (2, "Bob", "Doe", "1930", None), (4, "Dan", "Poe", "", None)],
+            [(10, 1, None, [])],
+        )
+        entries = list(diff_bases(OLD, new))
+        people = [(e["change"], e["key"]) for e in entries if e["kind"] == "person"]
+        assert people == [("changed", "doe|bob|1930"), ("added", "poe|dan|"), ("removed", "roe|cid|1950")]
+        assert entries[0]["fields"] == {"father": ["doe|abe|1900", ""]}
+        families = [e for e in entries if e["kind"] == "family"]
+        assert [(e["change"], e["fields"]) for e in families] == [("changed", {"children": [["doe|bob|1930"], []]})]
+
+    def test_homonyms_are_matched_by_rank(self):
+        twins = _base([(1, "Ann", "Doe", "1900", None), (2, "Ann", "Doe", "1900", None)])
+        one = _base([(1, "Ann", "Doe", "1900", None)])
+        assert [e["change"] for e in diff_bases(twins, one)] == ["removed"]
+
+    def test_editing_one_homonym_keeps_pairs(self):
+        twins = _base([(1, "Ann", "Doe", "1900", None), (2, "Ann", "Doe", "1900", None)])
+        for person in twins["persons"]:
+            person["birth_place_id"] = len(twins["strings"])
+            twins["strings"].append(f"Place {person['id']}")
+        edited = {**twins, "strings": twins["strings"] + ["Rome"]}
+        edited["persons"] = [dict(twins["persons"][0], birth_place_id=len(twins["strings"])), twins["persons"][1]]
+        entries = list(diff_bases(twins, edited))
+        assert [(e["change"], e["old_id"], e["new_id"]) for e in entries] == [("changed", 1, 1)]
+        assert entries[0]["fields"] == {"birth_place": ["Place 1", "Rome"]}
+
+    def test_spilled_runs_give_the_same_result(self):
+        old = _base([(i, f"P{i}", "Doe", "", None) for i in range(50)])
+        new = _base([(i, f"P{i}", "Doe", "", None) for i in range(10, 60)])
+        small = list(diff_bases(old, new, chunk_records=7))
+        assert small == list(diff_bases(old, new))
+        assert sum(e["change"] == "added" for e in small) == 10
+        assert sum(e["change"] == "removed" for e in small) == 10
+
+
+    def test_stored_bases_are_streamed(self, tmp_path):
+        old = _base([(i, f"P{i}", "Doe", "", i - 1 if i else None) for i in range(30)], [(100, 1, 2, [3])])
+        new = _base([(i, f"P{i}", "Doe", "", None) for i in range(5, 35)], [(100, 1, 2, [])])
+        for name, base in (("old", old), ("new", new)):
+            (tmp_path / f"{name}.gwb").mkdir()
+            write_json(tmp_path / f"{name}.gwb" / "base.json", base, indent=True)
+        assert list(diff_stored_bases(tmp_path, "old", "new", chunk_records=4)) == list(diff_bases(old, new))
+
+
+class TestDiffCli:
+    """Tests for python -m backend.diff."""
+
+    def test_cli(self, imported_client, temp_bases_dir, capsys):
+        persons = [{"id": 1, "first_names": ["Abe"], "surname": "Doe", "birth_date": "1900"}]
+        imported_client("v1", persons)
+        persons[0]["birth_date"] = "1901"
+        imported_client("v2", persons)
+        assert main(["v1", "v2", "--bases-dir", str(temp_bases_dir)]) == 0
+        out = capsys.readouterr().out
+        assert "+ person doe|abe|1901" in out
+        assert "- person doe|abe|1900" in out
+        assert "persons: 1 added, 1 removed, 0 changed" in out
+
+    def test_cli_unknown_base(self, temp_bases_dir):
+        assert main(["v1", "nope", "--bases-dir", str(temp_bases_dir)]) == 1
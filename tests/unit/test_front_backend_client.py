@@ -0,0 +1,112 @@
+import pytest
+import requests
+import responses
+
+from front.backend_client import BackendClient, BackendUnavailable
+
+
+DEAD = "http://dead:8000"
+LIVE = "http://live:8000"
+
+
+@pytest.fixture
+def client():
+    return BackendClient(candidates=[DEAD, LIVE])
+
+
+class TestBackendClient:
+    """Tests for the pooled backend client shared by the Flask fronts."""
+
+    @responses.activate
+    def test_fails_over_to_healthy_candidate(self, client):
+        """Dead candidates are skipped after a failed health probe."""
+        responses.add(responses.GET, f"{DEAD}/health", body=requests.ConnectionError("refused"))
+        responses.add(responses.GET, f"{LIVE}/health", json={"ok": True})
+        responses.add(responses.GET, f"{LIVE}/dbs", json=["a"])
+        r = client.get("/dbs", name="dbs")
+        assert r.json() == ["a"]
+        assert client.candidates()[0] == LIVE
+
+    @responses.activate
+    def test_last_good_backend_costs_one_round_trip(self, client):
+        """Once a backend answered, later calls go straight to it."""
+        responses.add(responses.GET, f"{DEAD}/health", body=requests.ConnectionError("refused"))
+        responses.add(responses.GET, f"{LIVE}/health", json={"ok": True})
+        responses.add(responses.GET, f"{LIVE}/dbs", json=["a"])
+        client.get("/dbs")
+        calls_before = len(responses.calls)
+        client.get("/dbs")
+        assert len(responses.calls) == calls_before + 1
+
+    @responses.activate
+    def test_http_errors_are_returned_not_failed_over(self, client):
+        """A 404 from a live backend is an answer, not an outage."""
+        client._good = LIVE
+        responses.add(responses.GET, f"{LIVE}/db/x/stats", status=404)
+        assert client.get("/db/x/stats").status_code == 404
+
+    @responses.activate
+    def test_forgets_backend_that_went_down(self, client):
+        """A connection error drops the remembered backend and tries the others."""
+        client._good = LIVE
+        responses.add(responses.GET, f"{LIVE}/dbs", body=requests.ConnectionError("gone"))
+        responses.add(responses.GET, f"{DEAD}/health", body=requests.ConnectionError("refused"))
+        with pytest.raises(BackendUnavailable):
+            client.get("/dbs", name="dbs")
+        assert client._good is None
+        assert client.metrics_snapshot()["dbs"]["errors"] == 1
+
+    @responses.activate
+    def test_latency_metrics(self, client):
+        """Each call is timed under its logical name."""
+        client._good = LIVE
+        responses.add(responses.GET, f"{LIVE}/dbs", json=[])
+        client.get("/dbs", name="dbs")
+        client.get("/dbs", name="dbs")
+        m = client.metrics_snapshot()["dbs"]
+        assert m["calls"] == 2
+        assert m["errors"] == 0
+        assert m["avg_ms"] >= 0
+        assert m["max_ms"] >= m["last_ms"] >= 0
+
+    @responses.activate
+    def test_read_timeout_is_not_resent(self, client):
+        """A POST that may have reached the backend is never sent to another candidate."""
+        client._good = LIVE
+        responses.add(responses.POST, f"{LIVE}/import_ged", body=requests.ReadTimeout("slow"))
+        responses.add(responses.POST, f"{DEAD}/import_ged", json={"ok": True})
+        with pytest.raises(BackendUnavailable):
+            client.post("/import_ged", json={}, name="import_ged")
+        assert [c.request.url for c in responses.calls] == [f"{LIVE}/import_ged"]
+        assert client._good == LIVE
+
+    @responses.activate
+    def test_post_reset_is_not_resent(self, client):
+        """A dropped connection after sending a POST does not fail over."""
+        client._good = LIVE
+        responses.add(responses.POST, f"{LIVE}/import_gw", body=requests.ConnectionError("reset"))
+        with pytest.raises(BackendUnavailable):
+            client.post("/import_gw", json={})
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_post_fails_over_when_never_sent(self, client):
+        """A refused connection is safe to retry elsewhere, even for a POST."""
+        client._good = DEAD
+        responses.add(responses.POST, f"{DEAD}/import_gw", body=requests.ConnectTimeout("refused"))
+        responses.add(responses.GET, f"{LIVE}/health", json={"ok": True})
+        responses.add(responses.POST, f"{LIVE}/import_gw", json={"ok": True})
+        assert client.post("/import_gw", json={}).json() == {"ok": True}
+
+    def test_same_server_listed_once(self):
+        """localhost and 127.0.0.1 on the same port are one candidate."""
+        client = BackendClient(candidates=["http://127.0.0.1:8000", "http://localhost:8000/", LIVE])
+        assert client.candidates() == ["http://127.0.0.1:8000", LIVE]
+
+    def test_candidates_from_environment(self, monkeypatch):
+        """BACKEND_URL/BACKEND_BASE come first and duplicates are dropped."""
+        monkeypatch.setenv("BACKEND_URL", "http://custom:9000/")
+        monkeypatch.setenv("BACKEND_BASE", "http://127.0.0.1:8000")
+        roots = BackendClient().candidates()
+        assert roots[0] == "http://custom:9000"
+        assert roots.count("http://127.0.0.1:8000") == 1
@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import patch
+
+import front.geneweb.app as geneweb
+from front.render_cache import RenderCache
+
+
+class TestRenderCache:
+    """Tests for the LRU page cache."""
+
+    def test_lru_eviction(self):
+        """The least recently used page is evicted first."""
+        cache = RenderCache(lambda: {}, max_entries=2)
+        cache.put(("a",), "A")
+        cache.put(("b",), "B")
+        cache.get(("a",))
+        cache.put(("c",), "C")
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",))[0] == "A"
+        assert len(cache) == 2
+
+    def test_etag_is_stable_for_same_html(self):
+        """The ETag only depends on the rendered HTML."""
+        cache = RenderCache(lambda: {})
+        assert cache.put(("a",), "<p>x</p>") == cache.put(("b",), "<p>x</p>")
+
+    def test_generation_change_drops_pages_of_that_base(self):
+        """Pages of a re-imported base are purged, others are kept."""
+        generations = {"db": 1, "other": 7}
+        cache = RenderCache(lambda: dict(generations), generation_ttl=0)
+        assert cache.generation("db") == 1
+        cache.put(("db", 1, "en"), "old")
+        cache.put(("other", 7, "en"), "kept")
+        generations["db"] = 2
+        assert cache.generation("db") == 2
+        assert cache.get(("db", 1, "en")) is None
+        assert cache.get(("other", 7, "en")) is not None
+
+    def test_generations_fetched_once_per_ttl(self):
+        """Within the TTL the generation map is served from memory."""
+        calls = []
+        cache = RenderCache(lambda: calls.append(1) or {"db": 1}, generation_ttl=60)
+        cache.generation("db")
+        cache.generation("db")
+        assert len(calls) == 1
+
+    def test_unreachable_backend_disables_cache(self):
+        """Without generations nothing can be validated."""
+        cache = RenderCache(lambda: None)
+        assert cache.generation("db") is None
+
+
+class TestSearchPageCaching:
+    """Tests for cached rendering of the geneweb search page."""
+
+    @pytest.fixture
+    def client(self):
+        geneweb.render_cache.clear()
+        geneweb.app.config["TESTING"] = True
+        with geneweb.app.test_client() as client:
+            yield client
+        geneweb.render_cache.clear()
+
+    def test_second_hit_skips_backend_and_etag_revalidates(self, client):
+        """A cached page costs no backend call and honours If-None-Match."""
+        data = {"ok": True, "results": [], "view_mode": "list"}
+        with patch.object(geneweb.render_cache, "_fetch_generations", return_value={"db": 3}), \
+                patch("front.geneweb.app.call_backend_search", return_value=(data, None)) as search:
+            first = client.get("/db?m=S&n=Potter")
+            second = client.get("/db?m=S&n=Potter")
+            assert first.status_code == second.status_code == 200
+            assert search.call_count == 1
+            etag = first.headers["ETag"]
+            assert second.headers["ETag"] == etag
+            not_modified = client.get("/db?m=S&n=Potter", headers={"If-None-Match": etag})
+            assert not_modified.status_code == 304
+            assert search.call_count == 1
+
+    def test_bases_without_generation_are_not_cached(self, client):
+        """Unknown generation means every hit is rendered."""
+        data = {"ok": True, "results": [], "view_mode": "list"}
+        with patch.object(geneweb.render_cache, "_fetch_generations", return_value={}), \
+                patch("front.geneweb.app.call_backend_search", return_value=(data, None)) as search:
+            client.get("/db?m=S&n=Potter")
+            response = client.get("/db?m=S&n=Potter")
+            assert search.call_count == 2
+            assert "ETag" not in response.headers
+
+    def test_error_redirects_are_not_cached(self, client):
+        """Backend errors redirect and are retried next time."""
+        with patch.object(geneweb.render_cache, "_fetch_generations", return_value={"db": 3}), \
+                patch("front.geneweb.app.call_backend_search", return_value=(None, "boom")) as search:
+            assert client.get("/db?m=S&n=Potter").status_code == 302
+            assert client.get("/db?m=S&n=Potter").status_code == 302
+            assert search.call_count == 2
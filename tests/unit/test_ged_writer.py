@@ -0,0 +1,101 @@
+import gzip
+
+import pytest
+
+from backend.ged_parser import parse_ged_text
+from backend.ged_writer import gzip_chunks, iter_chunks, iter_ged_lines
+
+
+PERSONS = [
+    {"id": 1, "first_names": ["Abe"], "surname": "Doe", "sex": "M", "birth_date": "1900", "birth_place": "Paris"},
+    {"id": 2, "first_names": ["Ann"], "surname": "Roe", "sex": "F"},
+    {"id": 3, "first_names": ["Bob"], "surname": "Doe", "sex": "M", "father_id": 1, "mother_id": 2, "death_date": "1990"},
+    {"id": 4, "first_names": ["Eve"], "surname": "Poe", "sex": "F"},
+    {"id": 5, "first_names": ["Cid"], "surname": "Doe", "sex": "M", "father_id": 3, "mother_id": 4},
+]
+FAMILIES = [
+    {"id": 1, "husband_id": 1, "wife_id": 2, "children_ids": [3], "marriage_date": "1925"},
+    {"id": 2, "husband_id": 3, "wife_id": 4, "children_ids": [5]},
+]
+
+
+class TestGedWriter:
+    """Tests for the streaming GEDCOM generator."""
+
+    def test_round_trip_through_parser(self):
+        text = "\n".join(iter_ged_lines(PERSONS, FAMILIES))
+        parsed = parse_ged_text(text)
+        by_name = {p.first_names[0]: p for p in parsed["persons"]}
+        assert by_name["Abe"].birth_place == "Paris"
+        assert by_name["Bob"].death_date == "1990"
+        assert by_name["Cid"].father_id == by_name["Bob"].id
+        assert by_name["Cid"].mother_id == by_name["Eve"].id
+        assert parsed["families"][0].marriage_date == "1925"
+
+    def test_sex_round_trip(self):
+        persons = [
+            {"id": 1, "first_names": ["Sam"], "surname": "Doe", "sex": "U"},
+            {"id": 2, "first_names": ["Ada"], "surname": "Doe", "sex": "f"},
+            {"id": 3, "first_names": ["Lee"], "surname": "Doe"},
+        ]
+        parsed = parse_ged_text("\n".join(iter_ged_lines(persons, [])))
+        assert [p.sex for p in parsed["persons"]] == ["U", "F", None]
+
+    def test_subset_drops_outside_links(self):
+        lines = list(iter_ged_lines(PERSONS, FAMILIES, person_ids={3, 5}))
+        assert "0 @I1@ INDI" not in lines
+        assert "1 HUSB @I1@" not in lines
+        assert "1 FAMC @F1@" not in lines
+        assert "1 FAMC @F2@" in lines
+        assert lines[-1] == "0 TRLR"
+
+    def test_string_table_records(self):
+        strings = ["Doe", "Abe"]
+        lines = list(iter_ged_lines([{"id": 0, "surname_id": 0, "first_name_ids": [1]}], [], strings))
+        assert "1 NAME Abe /Doe/" in lines
+
+    def test_chunks_and_gzip(self):
+        lines = [f"line {i}" for i in range(1000)]
+        chunks = list(iter_chunks(lines, chunk_size=100))
+        assert len(chunks) > 1
+        assert b"".join(chunks).decode("utf-8") == "\n".join(lines) + "\n"
+        assert gzip.decompress(b"".join(gzip_chunks(chunks))) == b"".join(chunks)
+
+
+class TestExportGedEndpoint:
+    """Tests for /db/{db}/export.ged."""
+
+    @pytest.fixture
+    def export_client(self, imported_client):
+        return imported_client("exp", PERSONS, FAMILIES)
+
+    def test_full_export(self, export_client):
+        response = export_client.get("/db/exp/export.ged")
+        assert response.status_code == 200
+        assert 'filename="exp.ged"' in response.headers["content-disposition"]
+        assert len(parse_ged_text(response.text)["persons"]) == 5
+
+    def test_gzip_descendants_subset(self, export_client):
+        response = export_client.get("/db/exp/export.ged", params={"descendants_of": 3, "gzip": True})
+        assert response.headers["content-type"] == "application/gzip"
+        parsed = parse_ged_text(gzip.decompress(response.content).decode("utf-8"))
+        assert sorted(p.first_names[0] for p in parsed["persons"]) == ["Bob", "Cid", "Eve"]
+
+    def test_surname_subset(self, export_client):
+        text = export_client.get("/db/exp/export.ged", params={"surname": "doe"}).text
+        assert sorted(p.first_names[0] for p in parse_ged_text(text)["persons"]) == ["Abe", "Bob", "Cid"]
+
+    def test_unknown_base_or_person(self, export_client):
+        assert export_client.get("/db/nope/export.ged").status_code == 404
+        assert export_client.get("/db/exp/export.ged", params={"descendants_of": 42}).status_code == 404
+
+
+class TestExportGwEndpoint:
+    """Tests for /db/{db}/export.gw."""
+
+    def test_export_matches_written_gw(self, imported_client, temp_bases_dir):
+        client = imported_client("expgw", PERSONS, FAMILIES)
+        response = client.get("/db/expgw/export.gw")
+        assert response.status_code == 200
+        assert response.text == (temp_bases_dir / "expgw.gw").read_text(encoding="utf-8")
+        assert client.get("/db/nope/export.gw").status_code == 404
@@ -0,0 +1,233 @@
+import json
+
+import pytest
+
+from backend.graph import NO_PERSON, PersonGraph
+from backend.relationship import find_relationship, kinship_label
+from tests.conftest import parent_record as _p
+
+
+@pytest.fixture
+def implex_persons():
+    """Cousins 5 and 6 share grandparents 1 and 2; their child is 7."""
+    return [
+        _p(1), _p(2),
+        _p(3, 1, 2), _p(4, 1, 2),
+        _p(5, 3), _p(6, 4),
+        _p(7, 5, 6),
+    ]
+
+
+class TestPersonGraph:
+    """Tests for the compact parent arrays."""
+
+    def test_dense_renumbering(self):
+        """Ids map to dense indexes and unknown parents to NO_PERSON."""
+        g = PersonGraph([_p(10), _p(20, 10, 99)])
+        assert len(g) == 2
+        assert g.father[g.index_of[20]] == g.index_of[10]
+        assert g.mother[g.index_of[20]] == NO_PERSON
+
+    def test_ancestors_sosa_numbers(self):
+        """Father of n is 2n, mother 2n+1."""
+        g = PersonGraph([_p(1), _p(2), _p(3, 1, 2), _p(4), _p(5, 3, 4)])
+        ancestors, implex = g.ancestors(5, depth=8)
+        assert [(s, gen, pid) for s, gen, pid in ancestors] == [
+            (1, 0, 5), (2, 1, 3), (3, 1, 4), (4, 2, 1), (5, 2, 2),
+        ]
+        assert implex == {}
+
+    def test_ancestors_depth_limit(self):
+        """Generations beyond depth are not visited."""
+        g = PersonGraph([_p(1), _p(2, 1), _p(3, 2)])
+        ancestors, _ = g.ancestors(3, depth=1)
+        assert [pid for _, _, pid in ancestors] == [3, 2]
+
+    def test_ancestors_implex_listed_once(self, implex_persons):
+        """Shared ancestors keep their smallest Sosa number and report the others."""
+        g = PersonGraph(implex_persons)
+        ancestors, implex = g.ancestors(7, depth=8)
+        ids = [pid for _, _, pid in ancestors]
+        assert sorted(ids) == [1, 2, 3, 4, 5, 6, 7]
+        assert len(ids) == len(set(ids))
+        assert implex == {1: [8, 12], 2: [9, 13]}
+
+    def test_ancestors_deep_line_without_recursion(self):
+        """A 5000-generation line is walked iteratively."""
+        persons = [_p(0)] + [_p(i, i - 1) for i in range(1, 5000)]
+        ancestors, _ = PersonGraph(persons).ancestors(4999, depth=10000)
+        assert len(ancestors) == 5000
+
+    def test_ancestors_parent_cycle(self):
+        """Cyclic data does not loop."""
+        ancestors, implex = PersonGraph([_p(1, 2), _p(2, 1)]).ancestors(1, depth=10)
+        assert [pid for _, _, pid in ancestors] == [1, 2]
+        assert implex == {1: [1, 4]}
+
+    def test_ancestors_unknown_person(self):
+        assert PersonGraph([]).ancestors(1, depth=3) == ([], {})
+
+
+def _f(fid, husband=None, wife=None, children=()):
+    return {"id": fid, "husband_id": husband, "wife_id": wife, "children_ids": list(children)}
+
+
+class TestDescendants:
+    """Tests for the children CSR index and descendant walk."""
+
+    def test_csr_indexes(self):
+        """Children per family and unions per person are indexed in base order."""
+        g = PersonGraph([_p(1), _p(2), _p(3), _p(4), _p(5)], [_f(10, 1, 2, [4]), _f(11, 1, 3, [5, 99])])
+        i = g.index_of
+        assert list(g.person_unions(i[1])) == [0, 1]
+        assert list(g.person_unions(i[3])) == [1]
+        assert [g.ids[c] for c in g.family_children(1)] == [5]
+        assert g.ids[g.spouse(1, i[1])] == 3
+
+    def test_descendants_cover_all_unions(self):
+        """Children of second marriages are walked too."""
+        g = PersonGraph(
+            [_p(1), _p(2), _p(3), _p(4), _p(5), _p(6)],
+            [_f(10, 1, 2, [4]), _f(11, 1, 3, [5]), _f(12, 5, None, [6])],
+        )
+        generations = list(g.descendants(1, depth=5))
+        assert [[pid for pid, _ in rows] for rows in generations] == [[1], [4, 5], [6]]
+        assert generations[0][0][1] == [(10, 2, [4]), (11, 3, [5])]
+
+    def test_descendants_depth_limit(self):
+        """The last generation lists its unions but is not expanded."""
+        g = PersonGraph([_p(1), _p(2), _p(3)], [_f(10, 1, None, [2]), _f(11, 2, None, [3])])
+        generations = list(g.descendants(1, depth=1))
+        assert len(generations) == 2
+        assert generations[1][0] == (2, [(11, None, [3])])
+
+    def test_descendants_deep_line_without_recursion(self):
+        """A 5000-generation line does not hit the recursion limit."""
+        persons = [_p(i) for i in range(5000)]
+        families = [_f(i, i, None, [i + 1]) for i in range(4999)]
+        assert len(list(PersonGraph(persons, families).descendants(0, depth=10000))) == 5000
+
+    def test_descendants_unknown_person(self):
+        assert list(PersonGraph([]).descendants(1, depth=2)) == []
+
+
+class TestRelationship:
+    """Tests for the bidirectional relationship search."""
+
+    def test_first_cousins_share_both_grandparents(self, implex_persons):
+        result = find_relationship(PersonGraph(implex_persons), 5, 6)
+        assert result["distance"] == 4
+        assert result["label"] == "first cousin"
+        assert [a["id"] for a in result["common_ancestors"]] == [1, 2]
+        assert result["common_ancestors"][0]["path_a"] == [5, 3, 1]
+        assert result["common_ancestors"][0]["path_b"] == [6, 4, 1]
+
+    def test_direct_ancestor(self, implex_persons):
+        """An ancestor is its own closest common ancestor, at distance 0 on its side."""
+        result = find_relationship(PersonGraph(implex_persons), 7, 1)
+        assert result["label"] == "great-grandparent"
+        assert result["common_ancestors"][0]["generations"] == [3, 0]
+        assert result["common_ancestors"][0]["path_b"] == [1]
+
+    def test_unrelated_and_unknown(self, implex_persons):
+        graph = PersonGraph(implex_persons + [_p(8)])
+        result = find_relationship(graph, 7, 8)
+        assert result["common_ancestors"] == [] and result["label"] is None
+        assert find_relationship(graph, 7, 99) is None
+
+    def test_frontier_cap(self):
+        """A search exceeding max_visited stops and reports truncation."""
+        persons = [_p(0)] + [_p(i, i + 1) for i in range(1, 100)] + [_p(100)]
+        result = find_relationship(PersonGraph(persons), 0, 1, max_visited=10)
+        assert result["truncated"] is True
+        assert result["common_ancestors"] == []
+
+    def test_kinship_labels(self):
+        assert kinship_label(1, 1) == "sibling"
+        assert kinship_label(2, 1) == "uncle/aunt"
+        assert kinship_label(1, 3) == "grand-nephew/niece"
+        assert kinship_label(3, 2) == "first cousin once removed"
+        assert kinship_label(3, 3) == "second cousin"
+
+
+@pytest.fixture
+def tree_client(imported_client):
+    persons = [
+        {"id": 1, "first_names": ["Abe"], "surname": "Doe", "sex": "M"},
+        {"id": 2, "first_names": ["Ann"], "surname": "Roe", "sex": "F"},
+        {"id": 3, "first_names": ["Bob"], "surname": "Doe", "sex": "M", "father_id": 1, "mother_id": 2},
+        {"id": 4, "first_names": ["Cid"], "surname": "Doe", "sex": "M", "father_id": 3},
+    ]
+    families = [
+        {"id": 1, "husband_id": 1, "wife_id": 2, "children_ids": [3]},
+        {"id": 2, "husband_id": 3, "children_ids": [4]},
+    ]
+    return imported_client("tree", persons, families)
+
+
+class TestAncestorsEndpoint:
+    """Tests for /db/{db}/person/{id}/ancestors."""
+
+    def test_ancestors_endpoint(self, tree_client):
+        data = tree_client.get("/db/tree/person/4/ancestors", params={"depth": 2}).json()
+        assert data["ok"] is True
+        assert data["depth"] == 2
+        assert [(a["sosa"], a["person"]["first_names"][0]) for a in data["ancestors"]] == [
+            (1, "Cid"), (2, "Bob"), (4, "Abe"), (5, "Ann"),
+        ]
+
+    def test_depth_capped_by_gwf(self, tree_client, temp_bases_dir):
+        """max_anc_level from the .gwf bounds the requested depth."""
+        gwf = temp_bases_dir / "tree.gwf"
+        gwf.write_text(gwf.read_text(encoding="utf-8").replace("max_anc_level=8", "max_anc_level=1"), encoding="utf-8")
+        data = tree_client.get("/db/tree/person/4/ancestors", params={"depth": 5}).json()
+        assert data["depth"] == 1
+        assert len(data["ancestors"]) == 2
+
+    def test_unknown_person(self, tree_client):
+        data = tree_client.get("/db/tree/person/42/ancestors").json()
+        assert data == {"ok": False, "error": "Person not found"}
+
+
+class TestDescendantsEndpoint:
+    """Tests for /db/{db}/person/{id}/descendants."""
+
+    def test_descendants_endpoint(self, tree_client):
+        data = tree_client.get("/db/tree/person/1/descendants").json()
+        assert data["ok"] is True
+        assert data["depth"] == 12
+        names = [[row["person"]["first_names"][0] for row in g["persons"]] for g in data["generations"]]
+        assert names == [["Abe"], ["Bob"], ["Cid"]]
+        union = data["generations"][0]["persons"][0]["unions"][0]
+        assert union["spouse"]["first_names"] == ["Ann"]
+        assert union["children_ids"] == [3]
+
+    def test_tree_view_uses_max_desc_tree(self, tree_client):
+        """view=tree is capped by max_desc_tree (4 by default)."""
+        data = tree_client.get("/db/tree/person/1/descendants", params={"view": "tree", "depth": 50}).json()
+        assert data["depth"] == 4
+
+    def test_streaming_one_line_per_generation(self, tree_client):
+        response = tree_client.get("/db/tree/person/1/descendants", params={"stream": True, "depth": 1})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["generation"] for line in lines] == [0, 1]
+
+    def test_unknown_person(self, tree_client):
+        data = tree_client.get("/db/tree/person/42/descendants").json()
+        assert data == {"ok": False, "error": "Person not found"}
+
+
+class TestRelationshipEndpoint:
+    """Tests for /db/{db}/relationship."""
+
+    def test_relationship_endpoint(self, tree_client):
+        data = tree_client.get("/db/tree/relationship", params={"a": 4, "b": 1}).json()
+        assert data["ok"] is True
+        assert data["label"] == "grandparent"
+        assert data["common_ancestors"][0]["path_a"] == [4, 3, 1]
+        assert sorted(p["id"] for p in data["persons"]) == [1, 3, 4]
+
+    def test_unknown_person(self, tree_client):
+        data = tree_client.get("/db/tree/relationship", params={"a": 4, "b": 42}).json()
+        assert data == {"ok": False, "error": "Person not found"}
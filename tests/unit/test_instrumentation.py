@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import instrumentation
+from backend.api import app
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    instrumentation.metrics.reset()
+    yield instrumentation.metrics
+    instrumentation.metrics.reset()
+
+
+class TestInstrumentation:
+    """Tests for phase timers, counters and the Prometheus rendering."""
+
+    def test_disabled_is_noop(self, monkeypatch):
+        monkeypatch.setattr(instrumentation, "enabled", False)
+        instrumentation.metrics.reset()
+        with instrumentation.phase("search"):
+            instrumentation.count("records_scanned", 10)
+        assert instrumentation.metrics.phases == {}
+        assert not instrumentation.metrics.counters
+
+    def test_phase_and_counter(self, instrumented):
+        timings = instrumentation.start_request()
+        with instrumentation.phase("search"):
+            time.sleep(0.01)
+        with instrumentation.phase("search"):
+            pass
+        instrumentation.count("records_scanned", 7)
+        assert instrumented.phases["search"][0] == 2
+        assert instrumented.phases["search"][1] >= 0.01
+        assert timings["search"] >= 0.01
+        text = instrumented.render_prometheus()
+        assert 'geneweb_phase_calls_total{phase="search"} 2' in text
+        assert 'geneweb_records_total{counter="records_scanned"} 7' in text
+
+    def test_server_timing_header(self):
+        header = instrumentation.server_timing_header({"json_decode": 0.0015, "search": 0.002}, 0.005)
+        assert header == "json_decode;dur=1.50, search;dur=2.00, total;dur=5.00"
+
+    def test_sample_stacks_sees_other_threads(self):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                sum(range(1000))
+
+        worker = threading.Thread(target=busy_worker)
+        worker.start()
+        try:
+            profile = instrumentation.sample_stacks(0.1, 0.005)
+        finally:
+            stop.set()
+            worker.join()
+        assert profile["samples"] > 0
+        assert any(f["function"].endswith(":busy_worker") for f in profile["functions"])
+
+
+class TestInstrumentationEndpoints:
+    """Tests for the Server-Timing header, /metrics and /debug/profile."""
+
+    @pytest.fixture
+    def client(self, imported_client, sample_import_request):
+        return imported_client(**sample_import_request)
+
+    def test_no_header_when_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(instrumentation, "enabled", False)
+        response = client.get("/db/test_db/search", params={"n": "Doe"})
+        assert "server-timing" not in response.headers
+
+    def test_search_phases(self, client, instrumented):
+        response = client.get("/db/test_db/search", params={"n": "Doe", "p": "John"})
+        assert response.json()["ok"] is True
+        phases = [part.split(";")[0] for part in response.headers["server-timing"].split(", ")]
+        for name in ("context_build", "file_read", "json_decode", "crush", "search", "serialize", "total"):
+            assert name in phases
+        assert instrumented.counters["records_scanned"] == 3
+
+    def test_metrics_endpoint(self, client, instrumented):
+        client.get("/db/test_db/search", params={"n": "Doe"})
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'geneweb_requests_total{method="GET",route="/db/{db_name}/search",status="200"} 1' in response.text
+        assert 'geneweb_phase_seconds_total{phase="search"}' in response.text
+
+    def test_import_phases(self, temp_bases_dir, sample_gw_text, instrumented):
+        response = TestClient(app).post("/import_gw", json={"db_name": "timed", "gw_text": sample_gw_text})
+        assert "parse;dur=" in response.headers["server-timing"]
+        assert "write;dur=" in response.headers["server-timing"]
+        counts = response.json()["counts"]
+        assert instrumented.counters["records_parsed"] == counts["persons"] + counts["families"]
+
+    def test_profile_guarded(self, monkeypatch):
+        monkeypatch.setattr(instrumentation, "profiling_enabled", False)
+        assert TestClient(app).get("/debug/profile").status_code == 404
+
+    def test_profile(self, monkeypatch):
+        monkeypatch.setattr(instrumentation, "profiling_enabled", True)
+        client = TestClient(app)
+        assert client.get("/debug/profile", params={"seconds": 0}).status_code == 400
+        data = client.get("/debug/profile", params={"seconds": 0.05, "interval_ms": 5}).json()
+        assert data["ok"] is True
+        assert data["samples"] > 0
+        assert {"function", "self", "cumulative"} <= set(data["functions"][0])
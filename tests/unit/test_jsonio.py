@@ -0,0 +1,94 @@
+import json
+from dataclasses import asdict
+from types import SimpleNamespace
+
+import pytest
+
+from backend import jsonio
+from backend.api import PersonView
+from backend.models import Person
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the json fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    return jsonio
+
+
+class TestJsonio:
+    """Tests for the shared JSON encoder."""
+
+    def test_roundtrip(self, encoder):
+        doc = {"name": "Élise", "ids": [1, 2], "score": 0.125, "none": None, 7: "int key"}
+        data = encoder.dumps(doc)
+        assert isinstance(data, bytes)
+        assert "Élise".encode("utf-8") in data
+        assert encoder.loads(data) == {"name": "Élise", "ids": [1, 2], "score": 0.125, "none": None, "7": "int key"}
+
+    def test_indent_matches_json(self, encoder):
+        doc = {"counts": {"persons": 2}, "strings": ["Doe", "Zoë"], "empty": []}
+        assert encoder.dumps(doc, indent=True).decode("utf-8") == json.dumps(doc, ensure_ascii=False, indent=2)
+
+    def test_dataclass_nodes(self, encoder):
+        node = Person(id=1, first_names=["John"], surname="Doe")
+        decoded = encoder.loads(encoder.dumps({"results": [node]}))
+        assert decoded["results"][0] == asdict(node)
+
+    def test_big_integers(self, encoder):
+        assert encoder.loads(encoder.dumps({"sosa": 2 ** 70})) == {"sosa": 2 ** 70}
+
+    def test_unsupported_type(self, encoder):
+        with pytest.raises(TypeError):
+            encoder.dumps({"value": object()})
+
+    def test_files(self, encoder, tmp_path):
+        path = tmp_path / "doc.json"
+        encoder.write_json(path, {"a": [1, 2]}, indent=True)
+        assert encoder.read_json(path) == {"a": [1, 2]}
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+    def test_iter_json_array(self, encoder, tmp_path, chunk_size):
+        doc = {"counts": {"n": [1, "]"]}, "persons": [{"id": i, "name": "Zoë \"]" * i} for i in range(20)], "strings": [123456789, None]}
+        path = tmp_path / "base.json"
+        encoder.write_json(path, doc, indent=True)
+        assert list(encoder.iter_json_array(path, "persons", chunk_size)) == doc["persons"]
+        assert list(encoder.iter_json_array(path, "strings", chunk_size)) == [123456789, None]
+        assert list(encoder.iter_json_array(path, "counts", chunk_size)) == []
+        assert list(encoder.iter_json_array(path, "missing", chunk_size)) == []
+        assert encoder.read_json_key(path, "counts", chunk_size) == doc["counts"]
+        assert encoder.read_json_key(path, "missing", chunk_size) is None
+
+
+class TestPersonView:
+    """Tests for the lazy person view encoded at the response boundary."""
+
+    @pytest.fixture
+    def ctx(self):
+        return SimpleNamespace(
+            is_gedcom_format=True,
+            string_table={0: "Doe", 1: "John", 2: "1900"},
+            sosa_numbers={1: 3},
+        )
+
+    def test_fields_resolved_on_access(self, ctx):
+        view = PersonView(ctx, {"id": 1, "surname_id": 0, "first_name_ids": [1], "birth_date_id": 2, "sex": "M"})
+        ctx.string_table[0] = "Roe"
+        assert view.surname == "Roe"
+        assert view.first_names == ["John"]
+        assert view.birth_date == "1900"
+        assert view.death_date == ""
+        assert view.sosa == "3"
+
+    def test_encoding(self, ctx, encoder):
+        view = PersonView(ctx, {"id": 1, "surname_id": 0, "first_name_ids": [1]})
+        view.children = [PersonView(ctx, {"id": 2, "surname_id": 0, "first_name_ids": []})]
+        node = {
+            "id": 1, "surname": "Doe", "first_names": ["John"], "birth_date": "", "death_date": "",
+            "sex": None, "sosa": "3", "spouse": None, "children": [], "truncated": False,
+        }
+        child = {**node, "id": 2, "first_names": [], "sosa": None}
+        assert encoder.loads(encoder.dumps(view)) == {**node, "children": [child]}
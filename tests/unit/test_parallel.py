@@ -0,0 +1,53 @@
+from backend import parallel
+from backend.parallel import chunk_bounds, map_chunks, parse_workers, shared_pool, shutdown_pool, split_at_starts
+
+
+TEXT = "head\n0 A\n1 x\n0 B\n1 y\n1 z\n0 C\n"
+
+
+class TestSplitAtStarts:
+    """Tests for cutting a source at record starts."""
+
+    def test_chunks_start_on_records(self):
+        chunks = split_at_starts(TEXT, ("0 ",), 3)
+        assert "".join(chunks) == TEXT
+        assert len(chunks) > 1
+        assert all(chunk.startswith("0 ") for chunk in chunks[1:])
+
+    def test_more_parts_than_records(self):
+        chunks = split_at_starts(TEXT, ("0 ",), 50)
+        assert chunks == ["head\n", "0 A\n1 x\n", "0 B\n1 y\n1 z\n", "0 C\n"]
+
+    def test_no_start(self):
+        assert split_at_starts("a\nb\n", ("0 ",), 4) == ["a\nb\n"]
+        assert split_at_starts(TEXT, ("0 ",), 1) == [TEXT]
+
+    def test_bounds_on_bytes(self):
+        buf = TEXT.encode()
+        bounds = chunk_bounds(buf, (b"0 ",), 50)
+        assert [buf[a:b] for a, b in bounds] == [c.encode() for c in split_at_starts(TEXT, ("0 ",), 50)]
+
+
+class TestMapChunks:
+    """Tests for the process pool mapping."""
+
+    def test_results_in_chunk_order(self):
+        assert map_chunks(len, ["a", "bbb", "cc"], 2) == [1, 3, 2]
+        assert map_chunks(len, ["a", "bbb"], 1) == [1, 3]
+
+    def test_parse_workers(self, monkeypatch):
+        monkeypatch.setattr("backend.parallel.PARSE_WORKERS", 8)
+        monkeypatch.setattr("backend.parallel.PARALLEL_MIN_CHARS", 10)
+        assert parse_workers("short") == 1
+        assert parse_workers("long enough text") == 8
+        assert parse_workers("short", workers=3) == 3
+
+    def test_one_shared_pool(self):
+        map_chunks(len, ["a", "bb"], 2)
+        pool = shared_pool()
+        assert map_chunks(len, ["ccc", "d"], 4) == [3, 1]
+        assert shared_pool() is pool
+        assert pool._max_workers == parallel.PARSE_WORKERS
+        assert pool._mp_context.get_start_method() != "fork"
+        shutdown_pool()
+        assert shared_pool() is not pool
@@ -0,0 +1,102 @@
+import pytest
+
+from backend.search_index import (
+    SEARCH_INDEX_FILENAME,
+    SearchIndex,
+    place_tokens,
+    read_search_index,
+    write_search_index,
+)
+
+
+def _p(pid, first, surname, birth_date=None, birth_place=None, death_place=None):
+    return {
+        "id": pid,
+        "first_names": [first],
+        "surname": surname,
+        "birth_date": birth_date,
+        "birth_place": birth_place,
+        "death_place": death_place,
+    }
+
+
+@pytest.fixture
+def persons():
+    return [
+        _p(1, "Jean", "Martin", "12/3/1820", "Paris"),
+        _p(2, "Marie", "Martin", "ABT 1845", "Saint-Malo, Ille-et-Vilaine"),
+        _p(3, "Louis", "Durand", "1850", "Lyon", "Paris"),
+        _p(4, "Anne", "Durand", None, "Paris"),
+        _p(5, "Paul", "Martin", "1900", "Saint-Étienne"),
+    ]
+
+
+class TestSearchIndex:
+    """Tests for the place postings and the birth year index."""
+
+    def test_place_tokens(self):
+        assert place_tokens("Saint-Malo, Ille-et-Vilaine") == ["saint", "malo", "ille", "et", "vilaine"]
+        assert place_tokens(None) == []
+
+    def test_persons_at(self, persons):
+        index = SearchIndex.build(persons)
+        assert index.persons_at("Paris") == [1, 3, 4]
+        assert index.persons_at("saint") == [2, 5]
+        assert index.persons_at("Saint Étienne") == [5]
+        assert index.persons_at("Nowhere") == []
+
+    def test_born_between(self, persons):
+        index = SearchIndex.build(persons)
+        assert index.born_between(1845, 1850) == [2, 3]
+        assert index.born_between(after=1846) == [3, 5]
+        assert index.born_between(before=1820) == [1]
+        assert index.born_between(1901, 1800) == []
+
+    def test_query_intersects(self, persons):
+        index = SearchIndex.build(persons)
+        assert index.query(place="Paris", born_after=1830) == [3]
+        assert index.query() == []
+
+    def test_string_table_records(self):
+        strings = ["Martin", "Jean", "1820", "Paris"]
+        record = {"id": 1, "surname_id": 0, "first_name_ids": [1], "birth_date_id": 2, "birth_place_id": 3}
+        index = SearchIndex.build([record], strings)
+        assert index.query(place="paris", born_before=1820) == [1]
+
+    def test_sidecar_roundtrip(self, persons, tmp_path):
+        write_search_index(tmp_path, SearchIndex.build(persons), 3)
+        loaded = read_search_index(tmp_path)
+        assert loaded["generation"] == 3
+        assert loaded["index"].query(place="Paris", born_before=1900) == [1, 3]
+        (tmp_path / SEARCH_INDEX_FILENAME).write_text("[]", encoding="utf-8")
+        assert read_search_index(tmp_path) is None
+
+
+class TestIndexedSearchEndpoint:
+    """Tests for /db/{db}/search?place=&born_after=&born_before=."""
+
+    @pytest.fixture
+    def client(self, imported_client, persons):
+        return imported_client("places", persons)
+
+    def _ids(self, client, **params):
+        data = client.get("/db/places/search", params=params).json()
+        assert data["ok"] is True
+        assert data["view_mode"] == "list"
+        return [person["id"] for person in data["results"]]
+
+    def test_sidecar_written_at_import(self, client, temp_bases_dir):
+        assert next(temp_bases_dir.rglob(SEARCH_INDEX_FILENAME), None) is not None
+
+    def test_place(self, client):
+        assert self._ids(client, place="Paris") == [1, 3, 4]
+
+    def test_date_range(self, client):
+        assert self._ids(client, born_after=1840, born_before=1860) == [2, 3]
+
+    def test_combined_with_name(self, client):
+        assert self._ids(client, place="Paris", n="Durand") == [3, 4]
+        assert self._ids(client, place="saint", p="Paul") == [5]
+
+    def test_query_required(self, client):
+        assert client.get("/db/places/search").status_code == 400
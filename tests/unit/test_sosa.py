@@ -0,0 +1,112 @@
+import pytest
+
+import backend.api
+from backend.graph import PersonGraph
+from backend.metadata import bump_generation, read_meta
+from backend.search_index import read_search_index
+from backend.sosa import build_sosa, read_sosa, rebase_sosa, write_sosa
+from tests.conftest import parent_record as _p
+
+
+@pytest.fixture
+def graph():
+    """7 is the child of 5 and 6, who are cousins through grandparents 1 and 2."""
+    return PersonGraph([
+        _p(1), _p(2),
+        _p(3, 1, 2), _p(4, 1, 2),
+        _p(5, 3), _p(6, 4),
+        _p(7, 5, 6), _p(8, 7, 9), _p(9),
+    ])
+
+
+class TestSosaMap:
+    """Tests for building, rebasing and persisting Sosa maps."""
+
+    def test_build_keeps_smallest_number_on_implex(self, graph):
+        numbers = build_sosa(graph, 7)
+        assert numbers == {7: 1, 5: 2, 6: 3, 3: 4, 4: 6, 1: 8, 2: 9}
+
+    def test_big_numbers(self):
+        persons = [_p(0)] + [_p(i, i - 1) for i in range(1, 200)]
+        assert build_sosa(PersonGraph(persons), 199)[0] == 2 ** 199
+
+    def test_rebase_to_child_matches_full_rebuild(self, graph):
+        numbers = rebase_sosa(graph, 7, build_sosa(graph, 7), 8)
+        assert numbers == build_sosa(graph, 8)
+        assert numbers[1] == 16
+
+    def test_rebase_not_applicable(self, graph):
+        assert rebase_sosa(graph, 7, build_sosa(graph, 7), 5) is None
+        assert rebase_sosa(graph, None, None, 8) is None
+
+    def test_write_and_read(self, tmp_path, graph):
+        write_sosa(tmp_path, 7, 3, build_sosa(graph, 7))
+        sidecar = read_sosa(tmp_path)
+        assert sidecar["reference"] == 7 and sidecar["generation"] == 3
+        assert sidecar["numbers"] == build_sosa(graph, 7)
+        assert read_sosa(tmp_path / "missing") is None
+
+
+class TestSosaEndpoint:
+    """Tests for /db/{db}/sosa and Sosa numbers on person nodes."""
+
+    PERSONS = [
+        {"id": 1, "first_names": ["Abe"], "surname": "Doe"},
+        {"id": 2, "first_names": ["Bob"], "surname": "Doe", "father_id": 1},
+        {"id": 3, "first_names": ["Cid"], "surname": "Doe", "father_id": 2},
+    ]
+
+    @pytest.fixture
+    def sosa_client(self, imported_client):
+        return imported_client("sosa", self.PERSONS)
+
+    def test_set_reference_and_show_numbers(self, sosa_client):
+        assert sosa_client.get("/db/sosa/sosa").json() == {"ok": True, "reference": None, "count": 0}
+        data = sosa_client.post("/db/sosa/sosa", json={"person_id": 2}).json()
+        assert data["ok"] is True and data["count"] == 2 and data["incremental"] is False
+
+        data = sosa_client.post("/db/sosa/sosa", json={"person_id": 3}).json()
+        assert data["count"] == 3 and data["incremental"] is True
+
+        details = sosa_client.get("/db/sosa/person", params={"n": "Doe", "p": "Cid"}).json()["details"]
+        assert details["person"]["sosa"] == "1"
+        assert details["father"]["sosa"] == "2"
+        assert details["paternal_father"]["sosa"] == "4"
+
+    def test_map_survives_context_reload_and_reimport(self, sosa_client, temp_bases_dir):
+        sosa_client.post("/db/sosa/sosa", json={"person_id": 3})
+        backend.api._context_cache.clear()
+        assert sosa_client.get("/db/sosa/sosa").json()["reference"]["first_names"] == ["Cid"]
+
+        persons = self.PERSONS + [{"id": 4, "first_names": ["Dan"], "surname": "Doe", "father_id": 1}]
+        sosa_client.post("/import", json={"db_name": "sosa", "persons": persons, "families": []})
+        backend.api._context_cache.clear()
+        sidecar = read_sosa(temp_bases_dir / "sosa.gwb")
+        assert sidecar["numbers"] == {3: 1, 2: 2, 1: 4}
+
+    def test_unknown_person(self, sosa_client):
+        data = sosa_client.post("/db/sosa/sosa", json={"person_id": 42}).json()
+        assert data == {"ok": False, "error": "Person not found"}
+
+    def test_new_reference_bumps_generation(self, sosa_client, temp_bases_dir):
+        before = sosa_client.get("/dbs/generations").json()["sosa"]
+        sosa_client.post("/db/sosa/sosa", json={"person_id": 3})
+        assert sosa_client.get("/dbs/generations").json()["sosa"] > before
+        # Les fichiers dérivés des données restent valides
+        ctx = backend.api.get_search_context("sosa")
+        assert ctx._current_sidecar(read_search_index) is not None
+        assert ctx._current_sidecar(read_sosa)["reference"] == 3
+
+    def test_reference_set_by_another_process(self, sosa_client, temp_bases_dir):
+        assert sosa_client.get("/db/sosa/sosa").json()["count"] == 0
+        db_dir = temp_bases_dir / "sosa.gwb"
+        meta = read_meta(db_dir)
+        write_sosa(db_dir, 3, meta["generation"], {3: 1, 2: 2, 1: 4})
+        bump_generation(db_dir)
+        assert sosa_client.get("/db/sosa/sosa").json()["count"] == 3
+
+    def test_map_older_than_base_is_ignored(self, sosa_client, temp_bases_dir):
+        # Ancienne table pas encore renumérotée après un import : ids périmés
+        write_sosa(temp_bases_dir / "sosa.gwb", 3, 1, {3: 1, 2: 2, 1: 4})
+        backend.api._context_cache.clear()
+        assert sosa_client.get("/db/sosa/sosa").json() == {"ok": True, "reference": None, "count": 0}
@@ -4,7 +4,8 @@ import json
 from pathlib import Path
 from backend.storage import (
     StringsMap, write_gwb, write_gw, write_gwf, 
-    write_gwb_classic, write_json_base, _encode_persons, _encode_families
+    write_gwb_classic, write_json_base, _encode_persons, _encode_families,
+    read_gwf, gwf_int, iter_gw_lines, decode_person, decode_family
 )
 from backend.models import Person, Family
 
@@ -96,6 +97,8 @@ class TestEncodeFunctions:
         assert encoded["surname_id"] == 1  # "Doe" gets id 1
         assert encoded["birth_date_id"] == 2  # "1980" gets id 2
         assert encoded["birth_place_id"] == 3  # "New York" gets id 3
+        assert encoded["birth_date_code"] == 198000000
+        assert encoded["death_date_code"] == 0
     
     def test_encode_families_empty_list(self):
         """Test encoding empty families list."""
@@ -124,6 +127,7 @@ class TestEncodeFunctions:
         assert encoded["children_ids"] == [4, 5]
         assert encoded["marriage_date_id"] == 0  # "2000" gets id 0
         assert encoded["marriage_place_id"] == 1  # "Paris" gets id 1
+        assert encoded["marriage_date_code"] == 200000000
 
 
 class TestWriteFunctions:
@@ -357,4 +361,50 @@ class TestWriteFunctions:
         with open(json_path / "base.json", 'r', encoding='utf-8') as f:
             data = json.load(f)
         assert data["persons"] == []
-        assert data["families"] == []
\ No newline at end of file
+        assert data["families"] == []
+
+
+class TestReadGwf:
+    """Test reading .gwf options back."""
+
+    def test_read_gwf_roundtrip(self, tmp_path):
+        """Options written by write_gwf are read back as strings."""
+        write_gwf(tmp_path, "db")
+        options = read_gwf(tmp_path, "db")
+        assert options["max_anc_level"] == "8"
+        assert options["p_mod"] == ""
+        assert gwf_int(options, "max_desc_level", 0) == 12
+
+    def test_read_gwf_missing_file(self, tmp_path):
+        """A base without .gwf has no options."""
+        assert read_gwf(tmp_path, "nope") == {}
+        assert gwf_int({}, "max_anc_level", 8) == 8
+
+    def test_gwf_int_invalid_value(self):
+        """Non-numeric values fall back to the default."""
+        assert gwf_int({"max_anc_level": "lots"}, "max_anc_level", 8) == 8
+
+
+class TestStreamingGw:
+    """Test the line generator behind write_gw and /export.gw."""
+
+    def test_write_gw_matches_joined_lines(self, tmp_path):
+        persons = [Person(id=10, first_names=["Ann"], surname="Doe"), Person(id=11, first_names=["Bob"], surname="Doe")]
+        families = [Family(id=0, husband_id=11, wife_id=10, children_ids=[])]
+        by_id = {p.id: p for p in persons}
+        lines = list(iter_gw_lines(persons, families, by_id.get))
+        assert lines[-1] == "end pevt"
+        assert write_gw(tmp_path, "db", persons, families).read_text(encoding="utf-8") == "\n".join(lines) + "\n"
+
+    def test_empty_base(self):
+        assert list(iter_gw_lines([], [], {}.get)) == ["encoding: utf-8", "gwplus"]
+
+    def test_decode_string_table_records(self):
+        strings = ["Doe", "John", "1980", "Paris"]
+        person = decode_person(
+            {"id": 3, "surname_id": 0, "first_name_ids": [1], "birth_date_id": 2, "birth_place_id": 3, "father_id": 1},
+            strings,
+        )
+        assert (person.surname, person.first_names, person.birth_place, person.father_id) == ("Doe", ["John"], "Paris", 1)
+        family = decode_family({"id": 1, "husband_id": 3, "children_ids": [4], "marriage_date_id": 2}, strings)
+        assert (family.marriage_date, family.children_ids, family.marriage_place) == ("1980", [4], None)
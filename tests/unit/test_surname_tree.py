@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+import backend.api
+from backend.surname_tree import (
+    SURNAME_TREE_FILENAME,
+    build_surname_forest,
+    read_surname_tree,
+    write_surname_tree,
+)
+
+
+def _p(pid, first, surname, father=None, mother=None):
+    return {"id": pid, "first_names": [first], "surname": surname, "father_id": father, "mother_id": mother}
+
+
+def _f(fid, husband, wife, children=()):
+    return {"id": fid, "husband_id": husband, "wife_id": wife, "children_ids": list(children)}
+
+
+@pytest.fixture
+def lineage():
+    """Doe branches: Abe > Bob > Carl (three generations), then Ada and Mr. alone."""
+    persons = [
+        _p(1, "Abe", "Doe"),
+        _p(2, "Ann", "Roe"),
+        _p(3, "Bob", "Doe", 1, 2),
+        _p(4, "Cleo", "Roe", 1, 2),
+        _p(5, "Bea", "Poe"),
+        _p(6, "Carl", "Doé", 3, 5),
+        _p(7, "Mr.", "Doe"),
+        _p(8, "Ada", "Doe"),
+    ]
+    families = [_f(10, 1, 2, [3, 4]), _f(11, 3, 5, [6])]
+    return persons, families
+
+
+class TestSurnameForest:
+    """Tests for the surname lineage forest."""
+
+    def test_roots_and_children(self, lineage):
+        forest = build_surname_forest(*lineage)
+        # Mr. en dernier, les autres racines par prénom
+        assert forest["roots"]["doe"] == [1, 8, 7]
+        assert forest["children"] == {1: [3], 3: [6], 2: [4]}
+        assert forest["spouse"] == {1: 2, 3: 5, 2: 1, 5: 3}
+        # Cleo Roe descend de sa mère Ann Roe : pas une racine
+        assert forest["roots"]["roe"] == [2]
+
+    def test_string_table_records(self, lineage):
+        strings = ["Doe", "Roe", "Abe", "Ann", "Bob"]
+        persons = [
+            {"id": 1, "surname_id": 0, "first_name_ids": [2]},
+            {"id": 2, "surname_id": 1, "first_name_ids": [3]},
+            {"id": 3, "surname_id": 0, "first_name_ids": [4], "father_id": 1, "mother_id": 2},
+        ]
+        forest = build_surname_forest(persons, [_f(10, 1, 2, [3])], strings)
+        assert forest["roots"] == {"doe": [1], "roe": [2]}
+        assert forest["children"] == {1: [3]}
+
+    def test_shared_child_listed_once(self):
+        """Both parents bear the surname: the child shows up under the first branch only."""
+        persons = [_p(1, "Abe", "Doe"), _p(2, "Ann", "Doe"), _p(3, "Bob", "Doe", 1, 2)]
+        families = [_f(10, 1, 2, [3]), _f(11, 2, None, [3])]
+        forest = build_surname_forest(persons, families)
+        assert forest["roots"]["doe"] == [1, 2]
+        assert forest["children"] == {1: [3]}
+
+    def test_deep_lineage(self):
+        """A 5000-generation line is walked without recursion."""
+        persons = [_p(0, "A", "Doe")] + [_p(i, "A", "Doe", i - 1) for i in range(1, 5000)]
+        families = [_f(i, i, None, [i + 1]) for i in range(4999)]
+        forest = build_surname_forest(persons, families)
+        assert forest["roots"]["doe"] == [0]
+        assert len(forest["children"]) == 4999
+
+    def test_sidecar_roundtrip(self, lineage, tmp_path):
+        forest = build_surname_forest(*lineage)
+        write_surname_tree(tmp_path, forest, 7)
+        loaded = read_surname_tree(tmp_path)
+        assert loaded["generation"] == 7
+        assert loaded["children"] == forest["children"]
+        assert loaded["spouse"] == forest["spouse"]
+        (tmp_path / SURNAME_TREE_FILENAME).write_text("{", encoding="utf-8")
+        assert read_surname_tree(tmp_path) is None
+
+
+class TestSurnameTreeEndpoints:
+    """Tests for /search tree view and /person/{id}/branch."""
+
+    @pytest.fixture
+    def doe_client(self, imported_client, lineage):
+        persons, families = lineage
+        return imported_client("does", persons, families)
+
+    def test_sidecar_written_at_import(self, doe_client, temp_bases_dir):
+        sidecar = next(temp_bases_dir.rglob(SURNAME_TREE_FILENAME))
+        meta = json.loads((sidecar.parent / "meta.json").read_text(encoding="utf-8"))
+        assert read_surname_tree(sidecar.parent)["generation"] == meta["generation"]
+
+    def test_tree_search(self, doe_client):
+        data = doe_client.get("/db/does/search", params={"n": "Doe"}).json()
+        assert data["view_mode"] == "tree"
+        abe = data["results"][0]
+        assert abe["first_names"] == ["Abe"]
+        assert abe["spouse"]["first_names"] == ["Ann"]
+        assert abe["children"][0]["children"][0]["first_names"] == ["Carl"]
+        assert abe["truncated"] is False
+
+    def test_depth_truncates(self, doe_client):
+        data = doe_client.get("/db/does/search", params={"n": "Doe", "depth": 1}).json()
+        bob = data["results"][0]["children"][0]
+        assert bob["children"] == []
+        assert bob["truncated"] is True
+
+        branch = doe_client.get(f"/db/does/person/{bob['id']}/branch").json()
+        assert branch["ok"] is True
+        assert branch["branch"]["children"][0]["first_names"] == ["Carl"]
+
+    def test_branch_unknown_person(self, doe_client):
+        assert doe_client.get("/db/does/person/999/branch").json() == {"ok": False, "error": "Person not found"}
+
+    def test_stale_sidecar_ignored(self, doe_client, temp_bases_dir):
+        sidecar_dir = next(temp_bases_dir.rglob(SURNAME_TREE_FILENAME)).parent
+        write_surname_tree(sidecar_dir, {"roots": {}, "children": {}, "spouse": {}}, generation=1)
+        backend.api._context_cache.clear()
+        data = doe_client.get("/db/does/search", params={"n": "Doe"}).json()
+        assert data["view_mode"] == "tree"
@@ -1,5 +1,7 @@
 import json
 from pathlib import Path
+from fastapi import BackgroundTasks
+
 from backend.api import GwImportGEDRequest, import_ged
 
 # Read GEDCOM text
@@ -12,7 +14,8 @@ req = GwImportGEDRequest(
     ged_text=ged_text,
     notes_origin_file=str(ged_path),
 )
-resp = import_ged(req)
+# Background tasks (consanguinity) do not run outside the server
+resp = import_ged(req, BackgroundTasks())
 print('resp ok:', resp.get('ok'))
 print('db_dir:', resp.get('db_dir'))
 print('gw_path:', resp.get('gw_path'))